@@ -0,0 +1,49 @@
+import sys
+import time
+import pandas as pd
+from sqlalchemy import text
+import cargar_csv
+
+# Cantidades de procesos (y conexiones) a medir
+TRABAJADORES_BENCHMARK = [1, 2, 4, 8]
+
+def medir_carga_paralela(ruta_csv, repeticiones=1):
+    """Mide el rendimiento de la carga paralela de ventas de 1 a 8 procesos"""
+    print("⏱️ BENCHMARK DE CARGA PARALELA DE VENTAS")
+    print("=" * 60)
+    df = pd.read_csv(ruta_csv)
+    df.columns = df.columns.str.strip().str.lower()
+    if not cargar_csv.validar_columnas_completas(df):
+        return
+    df, _ = cargar_csv.separar_ventas_sin_fecha(cargar_csv.preparar_archivo_completo(df))
+
+    # Las dimensiones se resuelven una sola vez; solo se mide la tabla de hechos
+    cache = cargar_csv.obtener_cache_claves()
+    with cargar_csv.engine.begin() as conn:
+        cargar_csv.resolver_dimensiones(conn, df, cache)
+    ventas = pd.concat([df[cargar_csv.COLUMNAS_VENTAS]] * repeticiones, ignore_index=True)
+    print(f"📊 Ventas por corrida: {len(ventas):,}")
+    print("-" * 60)
+    print(f"{'Procesos':<12} {'Segundos':>10} {'Filas/s':>14} {'Aceleración':>12}")
+    print("-" * 60)
+
+    base = None
+    for trabajadores in TRABAJADORES_BENCHMARK:
+        with cargar_csv.engine.connect() as conn:
+            maximo = conn.execute(text("SELECT COALESCE(MAX(id_venta), 0) FROM ventas")).scalar()
+        inicio = time.perf_counter()
+        cargar_csv.copiar_ventas_en_paralelo(ventas, trabajadores)
+        segundos = time.perf_counter() - inicio
+        # Se borran las filas de la corrida para que todas partan de la misma tabla
+        with cargar_csv.engine.begin() as conn:
+            conn.execute(text("DELETE FROM ventas WHERE id_venta > :maximo"), {'maximo': maximo})
+        filas_por_segundo = len(ventas) / max(segundos, 1e-9)
+        base = base or filas_por_segundo
+        print(f"{trabajadores:<12} {segundos:>10.2f} {filas_por_segundo:>14,.0f} {filas_por_segundo / base:>11.2f}x")
+    print("-" * 60)
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python benchmark_carga.py archivos/<archivo_completo>.csv [repeticiones]")
+        sys.exit(1)
+    medir_carga_paralela(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 1)
@@ -0,0 +1,96 @@
+import sys
+import time
+import threading
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+import http_cliente
+
+# Peticiones por escenario y cantidad de hilos del escenario concurrente
+PETICIONES_BENCHMARK = 500
+HILOS_BENCHMARK = 4
+# Página de prueba de tamaño parecido a un listado pequeño
+PAGINA_PRUEBA = ("<html><body>" + "<div class='producto'>Producto $19.990</div>" * 200 + "</body></html>").encode()
+
+# Conexiones TCP aceptadas por el servidor de prueba (cada una es un handshake nuevo)
+conexiones_abiertas = 0
+candado_conexiones = threading.Lock()
+
+class ManejadorPrueba(BaseHTTPRequestHandler):
+    """Responde siempre la misma página con HTTP/1.1 keep-alive"""
+    protocol_version = 'HTTP/1.1'
+    # Encabezados y cuerpo van en dos escrituras: sin esto Nagle + ACK retardado agregan ~40 ms por respuesta
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        global conexiones_abiertas
+        super().setup()
+        with candado_conexiones:
+            conexiones_abiertas += 1
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(PAGINA_PRUEBA)))
+        self.end_headers()
+        self.wfile.write(PAGINA_PRUEBA)
+
+    def log_message(self, formato, *args):
+        pass
+
+def iniciar_servidor():
+    """Levanta el servidor de prueba en un puerto libre de localhost y devuelve (servidor, url)"""
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), ManejadorPrueba)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://127.0.0.1:{servidor.server_address[1]}/"
+
+def medir(descripcion, funcion_get, url, peticiones, hilos):
+    """Hace `peticiones` GET con `hilos` hilos e imprime latencias y conexiones abiertas"""
+    global conexiones_abiertas
+    conexiones_abiertas = 0
+
+    def una_peticion(_):
+        inicio = time.perf_counter()
+        respuesta = funcion_get(url)
+        respuesta.raise_for_status()
+        return time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+        latencias = sorted(ejecutor.map(una_peticion, range(peticiones)))
+    segundos = time.perf_counter() - inicio
+    p95 = latencias[int(len(latencias) * 0.95) - 1]
+    print(f"{descripcion:<34} {hilos:>5} {statistics.mean(latencias) * 1000:>10.2f} "
+          f"{statistics.median(latencias) * 1000:>10.2f} {p95 * 1000:>10.2f} {peticiones / segundos:>10,.0f} {conexiones_abiertas:>11,}")
+    return statistics.mean(latencias)
+
+def medir_cliente_http(peticiones=PETICIONES_BENCHMARK, hilos=HILOS_BENCHMARK):
+    """Compara requests.get (una conexión por petición) con la sesión compartida de http_cliente"""
+    print("⏱️ BENCHMARK DEL CLIENTE HTTP (servidor local)")
+    print("=" * 90)
+    servidor, url = iniciar_servidor()
+    # El servidor local usa el mismo tamaño de pool que una tienda conocida
+    http_cliente.configurar_pool_host(url, hilos)
+    print(f"🌐 {url} - {peticiones:,} peticiones por escenario")
+    print("-" * 90)
+    print(f"{'Escenario':<34} {'Hilos':>5} {'Media ms':>10} {'p50 ms':>10} {'p95 ms':>10} {'Pet/s':>10} {'Conexiones':>11}")
+    print("-" * 90)
+    try:
+        for cantidad_hilos in (1, hilos):
+            sin_sesion = medir("requests.get (sin keep-alive)", lambda u: requests.get(u, timeout=10), url, peticiones, cantidad_hilos)
+            # Sin limitador: se mide solo la reutilización de conexiones
+            con_sesion = medir("http_cliente.obtener (pool)", lambda u: http_cliente.obtener(u, limitar=False), url,
+                               peticiones, cantidad_hilos)
+            print(f"{'':<34} {'':>5} {'↓ ' + format(1 - con_sesion / sin_sesion, '.0%'):>10}")
+    finally:
+        http_cliente.cerrar_sesion()
+        servidor.shutdown()
+    print("-" * 90)
+
+if __name__ == "__main__":
+    medir_cliente_http(
+        int(sys.argv[1]) if len(sys.argv) > 1 else PETICIONES_BENCHMARK,
+        int(sys.argv[2]) if len(sys.argv) > 2 else HILOS_BENCHMARK,
+    )
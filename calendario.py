@@ -0,0 +1,151 @@
+from datetime import date, datetime, timedelta
+import pandas as pd
+from sqlalchemy import text
+
+# ========== CONFIGURACIÓN ==========
+# Rango por defecto del calendario pre-construido (años inclusive)
+ANIO_INICIO_CALENDARIO = 2000
+ANIO_FIN_CALENDARIO = 2040
+
+# Clave inteligente de la dimensión tiempo: AAAAMMDD (2024-09-18 -> 20240918)
+SQL_ID_TIEMPO = "to_char({fecha}, 'YYYYMMDD')::integer"
+
+# Solsticio de invierno de referencia (UTC) y año trópico medio, para el Día de los Pueblos Indígenas
+SOLSTICIO_REFERENCIA = datetime(2000, 6, 21, 1, 48)
+ANIO_TROPICO_DIAS = 365.24219
+# Chile continental en invierno (UTC-4): el feriado es el día del solsticio en hora local
+DESFASE_HORA_CHILE = timedelta(hours=-4)
+
+COLUMNAS_TIEMPO = ['id_tiempo', 'fecha', 'dia', 'mes', 'año', 'trimestre', 'festivo']
+
+def id_tiempo_de_fecha(fecha):
+    """Devuelve la clave AAAAMMDD de una fecha"""
+    return fecha.year * 10000 + fecha.month * 100 + fecha.day
+
+def ids_tiempo_de_fechas(fechas):
+    """Calcula las claves AAAAMMDD de una serie de fechas sin consultar la base (NA si la fecha es nula)"""
+    dias = pd.to_datetime(pd.Series(fechas), errors='coerce')
+    return (dias.dt.year * 10000 + dias.dt.month * 100 + dias.dt.day).astype('Int64')
+
+def domingo_de_pascua(anio):
+    """Calcula el Domingo de Pascua gregoriano (algoritmo de Meeus/Jones/Butcher)"""
+    a = anio % 19
+    b, c = divmod(anio, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mes, dia = divmod(h + l - 7 * m + 114, 31)
+    return date(anio, mes, dia + 1)
+
+def trasladar_al_lunes(fecha):
+    """Ley 19.668: de martes a jueves pasa al lunes anterior y el viernes al lunes siguiente"""
+    if 1 <= fecha.weekday() <= 3:
+        return fecha - timedelta(days=fecha.weekday())
+    if fecha.weekday() == 4:
+        return fecha + timedelta(days=3)
+    return fecha
+
+def solsticio_de_invierno(anio):
+    """Estima la fecha local del solsticio de junio (error de minutos: basta para saber el día)"""
+    instante = SOLSTICIO_REFERENCIA + timedelta(days=(anio - SOLSTICIO_REFERENCIA.year) * ANIO_TROPICO_DIAS)
+    return (instante + DESFASE_HORA_CHILE).date()
+
+def festivos_chile(anio):
+    """Feriados nacionales permanentes de Chile en un año: {fecha: nombre}.
+
+    Incluye los móviles (Semana Santa, traslados al lunes, 17 y 20 de septiembre, Iglesias Evangélicas)
+    según el año en que empezó a regir cada ley. No incluye feriados regionales, de elecciones ni
+    los decretados por única vez.
+    """
+    pascua = domingo_de_pascua(anio)
+    festivos = {
+        date(anio, 1, 1): 'Año Nuevo',
+        pascua - timedelta(days=2): 'Viernes Santo',
+        pascua - timedelta(days=1): 'Sábado Santo',
+        date(anio, 5, 1): 'Día Nacional del Trabajo',
+        date(anio, 5, 21): 'Día de las Glorias Navales',
+        trasladar_al_lunes(date(anio, 6, 29)): 'San Pedro y San Pablo',
+        date(anio, 8, 15): 'Asunción de la Virgen',
+        date(anio, 9, 18): 'Independencia Nacional',
+        date(anio, 9, 19): 'Día de las Glorias del Ejército',
+        trasladar_al_lunes(date(anio, 10, 12)): 'Encuentro de Dos Mundos',
+        date(anio, 11, 1): 'Día de Todos los Santos',
+        date(anio, 12, 8): 'Inmaculada Concepción',
+        date(anio, 12, 25): 'Navidad',
+    }
+    if anio >= 2021:
+        # Ley 21.357: el primer año se fijó el 21 de junio; después, el día del solsticio
+        festivos[date(2021, 6, 21) if anio == 2021 else solsticio_de_invierno(anio)] = 'Día de los Pueblos Indígenas'
+    if anio >= 2007:
+        festivos[date(anio, 7, 16)] = 'Virgen del Carmen'
+        # Ley 20.215: si el 18 cae martes, el lunes 17 también es feriado
+        if date(anio, 9, 17).weekday() == 0:
+            festivos[date(anio, 9, 17)] = 'Fiestas Patrias'
+    if anio >= 2017 and date(anio, 9, 20).weekday() == 4:
+        # Ley 20.983: si el 19 cae jueves, el viernes 20 también es feriado
+        festivos[date(anio, 9, 20)] = 'Fiestas Patrias'
+    if anio >= 2008:
+        # Ley 20.299: martes pasa al viernes anterior y miércoles al viernes siguiente
+        reforma = date(anio, 10, 31)
+        if reforma.weekday() == 1:
+            reforma -= timedelta(days=4)
+        elif reforma.weekday() == 2:
+            reforma += timedelta(days=2)
+        festivos[reforma] = 'Día de las Iglesias Evangélicas y Protestantes'
+    return festivos
+
+def filas_calendario(fechas):
+    """Arma las filas de la dimensión tiempo (con clave AAAAMMDD y feriados) para una lista de fechas"""
+    dias = pd.to_datetime(pd.Series(sorted(set(fechas)), dtype=object))
+    festivos = set()
+    for anio in dias.dt.year.unique():
+        festivos.update(festivos_chile(int(anio)))
+    calendario = pd.DataFrame({
+        'id_tiempo': (dias.dt.year * 10000 + dias.dt.month * 100 + dias.dt.day).astype('int64'),
+        'fecha': dias.dt.date,
+        'dia': dias.dt.day,
+        'mes': dias.dt.month,
+        'año': dias.dt.year,
+        'trimestre': dias.dt.quarter,
+    }, columns=COLUMNAS_TIEMPO)
+    calendario['festivo'] = calendario['fecha'].isin(festivos)
+    return calendario
+
+def generar_calendario(anio_inicio=ANIO_INICIO_CALENDARIO, anio_fin=ANIO_FIN_CALENDARIO):
+    """Genera la dimensión tiempo completa, un registro por día entre el 1 de enero y el 31 de diciembre del rango"""
+    dias = pd.date_range(date(anio_inicio, 1, 1), date(anio_fin, 12, 31), freq='D')
+    return filas_calendario(dias.date)
+
+def rango_instalado(conn):
+    """Devuelve (desde, hasta) del tramo continuo más largo del calendario si todas las claves son AAAAMMDD; None si no"""
+    claves_ok = conn.execute(text(
+        f"SELECT count(*) > 0 AND bool_and(id_tiempo = {SQL_ID_TIEMPO.format(fecha='fecha')}) FROM tiempo"
+    )).scalar()
+    if not claves_ok:
+        return None
+    # Fechas consecutivas comparten fecha - número de fila: cada grupo es un tramo sin huecos
+    fila = conn.execute(text("""
+        SELECT min(fecha), max(fecha)
+        FROM (SELECT fecha, fecha - row_number() OVER (ORDER BY fecha)::integer AS tramo FROM tiempo) t
+        GROUP BY tramo
+        ORDER BY count(*) DESC
+        LIMIT 1
+    """)).first()
+    return (fila[0], fila[1])
+
+def asegurar_fechas(conn, fechas, rango):
+    """Agrega al calendario instalado las fechas que quedan fuera de su rango; devuelve cuántas se insertaron"""
+    desde, hasta = rango
+    fuera = {fecha for fecha in fechas if fecha is not None and not pd.isna(fecha) and not desde <= fecha <= hasta}
+    if not fuera:
+        return 0
+    filas = filas_calendario(fuera).rename(columns={'año': 'anio'}).to_dict('records')
+    return conn.execute(text("""
+        INSERT INTO tiempo (id_tiempo, fecha, dia, mes, "año", trimestre, festivo)
+        VALUES (:id_tiempo, :fecha, :dia, :mes, :anio, :trimestre, :festivo)
+        ON CONFLICT DO NOTHING
+    """), filas).rowcount
@@ -1,8 +1,18 @@
 import os
+import io
+import math
+import csv
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, select, text, update, func
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker
 import models
+from intervalos_promocion import construir_indice_promociones, esta_vigente
+from calendario import SQL_ID_TIEMPO, id_tiempo_de_fecha, ids_tiempo_de_fechas, rango_instalado, asegurar_fechas
+from salidas import leer_tabla, leer_columnas, leer_por_bloques
 from dotenv import load_dotenv
 import sys
 from decimal import Decimal
@@ -18,15 +28,246 @@ DB_HOST = os.getenv('DB_HOST', 'localhost')
 DB_PORT = os.getenv('DB_PORT', '5432')
 DB_NAME = os.getenv('DB_NAME', 'alquimia')
 
+# Procesos en paralelo para cargar ventas (cada uno usa su propia conexión)
+MAX_TRABAJADORES_CARGA = 8
+
 DATABASE_URL = f'postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
 engine = create_engine(DATABASE_URL)
 Session = sessionmaker(bind=engine)
 session = Session()
 
+# Columnas requeridas en un archivo completo (sin IDs)
+COLUMNAS_ARCHIVO_COMPLETO = [
+    'nombre_usuario', 'apellido_usuario', 'email_usuario', 'edad_usuario', 'sexo_usuario',
+    'nombre_tienda', 'direccion_tienda', 'url_tienda',
+    'nombre_producto', 'marca_producto', 'precio_producto', 'url_producto',
+    'tipo_promocion', 'fecha_inicio_promocion', 'fecha_fin_promocion',
+    'fecha_venta', 'dia_venta', 'mes_venta', 'año_venta', 'trimestre_venta', 'festivo_venta',
+    'cantidad_vendida', 'precio_unitario', 'descuento_unitario', 'precio_final_unitario', 'total_bruto', 'total_descuento', 'total_neto'
+]
+
+# Columnas de la tabla de hechos ventas (IDs ya resueltos + métricas)
+COLUMNAS_VENTAS = [
+    'id_usuario', 'id_producto', 'id_tienda', 'id_tiempo', 'id_promocion',
+    'cantidad_vendida', 'precio_unitario', 'descuento_unitario', 'precio_final_unitario',
+    'total_bruto', 'total_descuento', 'total_neto'
+]
+
+# Dimensiones: tabla -> (modelo, columnas de la clave natural, columna ID)
+DIMENSIONES = {
+    'usuarios': (models.Usuario, ['email'], 'id_usuario'),
+    'direccion': (models.Direccion, ['calle'], 'id_direccion'),
+    'tienda': (models.Tienda, ['nombre'], 'id_tienda'),
+    'promocion': (models.Promocion, ['tipo_promocion', 'fecha_inicio', 'fecha_fin'], 'id_promocion'),
+    'productos': (models.Producto, ['nombre', 'id_tienda'], 'id_producto'),
+    'tiempo': (models.Tiempo, ['fecha'], 'id_tiempo')
+}
+
+# Cache clave natural -> ID por dimensión (se carga una vez por ejecución)
+cache_claves = None
+
+# Rango (desde, hasta) del calendario instalado con claves AAAAMMDD: () si no está instalado, None si no se ha consultado
+rango_calendario = None
+
+# Esquema estrella: carpeta <nombre>_estrella con un archivo por tabla, en orden de carga (dimensiones primero)
+SUFIJO_CARPETA_ESTRELLA = '_estrella'
+TABLAS_ESTRELLA = ['usuarios', 'tienda', 'promocion', 'productos', 'tiempo', 'ventas']
+
+# Filas por bloque enviado con COPY (acota la memoria del buffer CSV)
+TAMANO_BLOQUE_COPY = 50000
+
+# Filas leídas del archivo por bloque en el modo por bloques (la memoria es proporcional a este valor)
+TAMANO_BLOQUE_LECTURA = 100000
+
+# Tope de filas de ventas por partición en el modo paralelo (bajo el tope, una partición por proceso).
+# El tamaño elegido queda registrado en el manifiesto para que una carga interrumpida se retome con
+# las mismas particiones aunque cambie la cantidad de procesos
+TAMANO_PARTICION_VENTAS = 100000
+
+# Filas por transacción confirmada en el modo por bloques (un lote con errores se divide para aislarlos)
+TAMANO_LOTE_COMMIT = 5000
+
+# Bytes leídos por vez al calcular el hash de un archivo
+TAMANO_LECTURA_HASH = 1024 * 1024
+
+# Etiquetas para informar filas nuevas por tabla
+ETIQUETAS_TABLAS = {
+    'usuarios': '👥 Usuarios nuevos',
+    'direccion': '📍 Direcciones nuevas',
+    'tienda': '🏪 Tiendas nuevas',
+    'promocion': '🎯 Promociones nuevas',
+    'productos': '🛍️ Productos nuevos',
+    'tiempo': '⏰ Registros de tiempo nuevos',
+    'ventas': '💰 Ventas copiadas'
+}
+
+# Tabla staging (UNLOGGED) para el modo de carga dentro de PostgreSQL
+TABLA_STAGING = 'staging_archivo_completo'
+
+# Motivo de rechazo de las ventas sin fecha (todos los modos las omiten y las cuentan como rechazadas)
+MENSAJE_FECHA_INVALIDA = 'fecha_venta vacía o inválida'
+# Fechas que el modo staging acepta como fecha_venta (AAAA-MM-DD, con o sin hora)
+PATRON_FECHA_STAGING = r'^\s*\d{4}-\d{1,2}-\d{1,2}([ T].*)?\s*$'
+
+# Sentencias del modo staging, en orden: cada dimensión y al final los hechos.
+# DISTINCT ON + ORDER BY fila toma la primera aparición de cada clave (igual que los otros modos)
+# y NOT EXISTS evita repetir claves ya cargadas en tablas sin restricción única.
+SENTENCIAS_STAGING = [
+    ("👥 Usuarios nuevos", """
+        INSERT INTO usuarios (nombre, apellido, email, edad, sexo)
+        SELECT nombre_usuario, apellido_usuario, email_usuario, edad_usuario, sexo_usuario
+        FROM (
+            SELECT DISTINCT ON (s.email_usuario) s.*
+            FROM {staging} s
+            WHERE s.email_usuario IS NOT NULL
+              AND NOT EXISTS (SELECT 1 FROM usuarios u WHERE u.email = s.email_usuario)
+            ORDER BY s.email_usuario, s.fila
+        ) d
+        ORDER BY d.fila
+        ON CONFLICT DO NOTHING
+    """),
+    ("📍 Direcciones nuevas", """
+        INSERT INTO direccion (calle, numero, comuna, ciudad, region)
+        SELECT calle, 'N/A', 'N/A', left(calle, 50), 'N/A'
+        FROM (
+            SELECT DISTINCT ON (left(s.direccion_tienda, 100)) left(s.direccion_tienda, 100) AS calle, s.fila
+            FROM {staging} s
+            WHERE s.direccion_tienda IS NOT NULL
+              AND NOT EXISTS (SELECT 1 FROM direccion d WHERE d.calle = left(s.direccion_tienda, 100))
+            ORDER BY left(s.direccion_tienda, 100), s.fila
+        ) d
+        ORDER BY d.fila
+        ON CONFLICT DO NOTHING
+    """),
+    ("🏪 Tiendas nuevas", """
+        INSERT INTO tienda (nombre, direccion, url, id_direccion)
+        SELECT nombre_tienda, direccion_tienda, url_tienda, id_direccion
+        FROM (
+            SELECT DISTINCT ON (s.nombre_tienda) s.fila, s.nombre_tienda, s.direccion_tienda, s.url_tienda,
+                   (SELECT min(d.id_direccion) FROM direccion d WHERE d.calle = left(s.direccion_tienda, 100)) AS id_direccion
+            FROM {staging} s
+            WHERE s.nombre_tienda IS NOT NULL
+              AND NOT EXISTS (SELECT 1 FROM tienda t WHERE t.nombre = s.nombre_tienda)
+            ORDER BY s.nombre_tienda, s.fila
+        ) d
+        ORDER BY d.fila
+        ON CONFLICT DO NOTHING
+    """),
+    ("🎯 Promociones nuevas", """
+        INSERT INTO promocion (tipo_promocion, fecha_inicio, fecha_fin)
+        SELECT tipo_promocion, fecha_inicio, fecha_fin
+        FROM (
+            SELECT DISTINCT ON (s.tipo_promocion, s.fecha_inicio_promocion::date, s.fecha_fin_promocion::date)
+                   s.fila, s.tipo_promocion,
+                   s.fecha_inicio_promocion::date AS fecha_inicio, s.fecha_fin_promocion::date AS fecha_fin
+            FROM {staging} s
+            WHERE NULLIF(s.tipo_promocion, '') IS NOT NULL
+              AND NOT EXISTS (
+                  SELECT 1 FROM promocion p
+                  WHERE p.tipo_promocion = s.tipo_promocion
+                    AND p.fecha_inicio = s.fecha_inicio_promocion::date
+                    AND p.fecha_fin = s.fecha_fin_promocion::date
+              )
+            ORDER BY s.tipo_promocion, s.fecha_inicio_promocion::date, s.fecha_fin_promocion::date, s.fila
+        ) d
+        ORDER BY d.fila
+        ON CONFLICT DO NOTHING
+    """),
+    ("🛍️ Productos nuevos", """
+        INSERT INTO productos (nombre, marca, precio, url_producto, promocion, preciofinal, id_tienda)
+        SELECT nombre_producto, marca_producto, precio, url_producto, id_promocion, precio, id_tienda
+        FROM (
+            SELECT DISTINCT ON (s.nombre_producto, t.id_tienda)
+                   s.fila, s.nombre_producto, NULLIF(s.marca_producto, '') AS marca_producto,
+                   NULLIF(s.precio_producto, '')::numeric AS precio,
+                   NULLIF(NULLIF(s.url_producto, ''), 'NaN') AS url_producto,
+                   p.id_promocion, t.id_tienda
+            FROM {staging} s
+            JOIN tienda t ON t.nombre = s.nombre_tienda
+            LEFT JOIN promocion p
+                   ON NULLIF(s.tipo_promocion, '') IS NOT NULL
+                  AND p.tipo_promocion = s.tipo_promocion
+                  AND p.fecha_inicio = s.fecha_inicio_promocion::date
+                  AND p.fecha_fin = s.fecha_fin_promocion::date
+            WHERE s.nombre_producto IS NOT NULL
+              AND NOT EXISTS (
+                  SELECT 1 FROM productos pr WHERE pr.nombre = s.nombre_producto AND pr.id_tienda = t.id_tienda
+              )
+            ORDER BY s.nombre_producto, t.id_tienda, s.fila
+        ) d
+        ORDER BY d.fila
+        ON CONFLICT DO NOTHING
+    """),
+    ("⏰ Registros de tiempo nuevos", """
+        INSERT INTO tiempo (fecha, dia, mes, "año", trimestre, festivo)
+        SELECT fecha, dia, mes, anio, trimestre, festivo
+        FROM (
+            SELECT DISTINCT ON (s.fecha_venta::date)
+                   s.fila, s.fecha_venta::date AS fecha, s.dia_venta::numeric::integer AS dia,
+                   s.mes_venta::numeric::integer AS mes, s."año_venta"::numeric::integer AS anio,
+                   s.trimestre_venta::numeric::integer AS trimestre, s.festivo_venta::boolean AS festivo
+            FROM {staging} s
+            WHERE s.fecha_venta IS NOT NULL
+              AND NOT EXISTS (SELECT 1 FROM tiempo ti WHERE ti.fecha = s.fecha_venta::date)
+            ORDER BY s.fecha_venta::date, s.fila
+        ) d
+        ORDER BY d.fila
+        ON CONFLICT DO NOTHING
+    """),
+    ("💰 Ventas insertadas", """
+        INSERT INTO ventas (
+            id_usuario, id_producto, id_tienda, id_tiempo, id_promocion,
+            cantidad_vendida, precio_unitario, descuento_unitario, precio_final_unitario,
+            total_bruto, total_descuento, total_neto
+        )
+        SELECT DISTINCT ON (s.fila)
+               u.id_usuario, pr.id_producto, t.id_tienda, {id_tiempo}, p.id_promocion,
+               s.cantidad_vendida::numeric::integer, s.precio_unitario::numeric, s.descuento_unitario::numeric,
+               s.precio_final_unitario::numeric, s.total_bruto::numeric, s.total_descuento::numeric,
+               s.total_neto::numeric
+        FROM {staging} s
+        JOIN usuarios u ON u.email = s.email_usuario
+        JOIN tienda t ON t.nombre = s.nombre_tienda
+        JOIN productos pr ON pr.nombre = s.nombre_producto AND pr.id_tienda = t.id_tienda
+        {join_tiempo}
+        LEFT JOIN promocion p
+               ON NULLIF(s.tipo_promocion, '') IS NOT NULL
+              AND p.tipo_promocion = s.tipo_promocion
+              AND p.fecha_inicio = s.fecha_inicio_promocion::date
+              AND p.fecha_fin = s.fecha_fin_promocion::date
+        {filtro_tiempo}
+        ORDER BY s.fila
+    """)
+]
+
+# Cómo obtiene la venta su id_tiempo en el modo staging: buscando la fecha en tiempo o, con el
+# calendario instalado (True), calculando la clave AAAAMMDD sin JOIN
+SQL_TIEMPO_VENTAS = {
+    False: {
+        'id_tiempo': 'ti.id_tiempo',
+        'join_tiempo': 'JOIN tiempo ti ON ti.fecha = s.fecha_venta::date',
+        'filtro_tiempo': '',
+    },
+    True: {
+        'id_tiempo': SQL_ID_TIEMPO.format(fecha='s.fecha_venta::date'),
+        'join_tiempo': '',
+        'filtro_tiempo': 'WHERE s.fecha_venta IS NOT NULL',
+    },
+}
+
+# Modos de carga para archivos completos
+MODOS_CARGA = {
+    '1': 'Fila a fila (consulta y commit por registro)',
+    '2': 'Masiva (dimensiones deduplicadas y COPY por bloques)',
+    '3': 'Staging en PostgreSQL (COPY + INSERT ... SELECT)',
+    '4': 'Por bloques (streaming, commit por lote y cuarentena de filas con error)',
+    '5': 'Paralela (dimensiones con un escritor, ventas en varios procesos)'
+}
+
 def mostrar_menu_archivos(archivos_csv):
     """Muestra el menú de archivos disponibles"""
     print("\n" + "="*50)
-    print("    📁 ARCHIVOS CSV DISPONIBLES")
+    print("    📁 ARCHIVOS CSV / PARQUET DISPONIBLES")
     print("="*50)
     for i, archivo in enumerate(archivos_csv, 1):
         ruta_completa = os.path.join('archivos', archivo)
@@ -46,20 +287,40 @@ def mostrar_menu_tablas(tablas_disponibles):
     print("0. 🔙 Volver atrás")
     print("="*50)
 
-def procesar_archivo_completo(df, archivo_elegido):
-    """Procesa un archivo completo con todas las tablas, sin usar IDs del archivo"""
-    print(f"\n🚀 PROCESANDO ARCHIVO COMPLETO: {archivo_elegido}")
-    print("="*60)
-    # Columnas requeridas (sin IDs)
-    columnas_requeridas = [
-        'nombre_usuario', 'apellido_usuario', 'email_usuario', 'edad_usuario', 'sexo_usuario',
-        'nombre_tienda', 'direccion_tienda', 'url_tienda',
-        'nombre_producto', 'marca_producto', 'precio_producto', 'url_producto',
-        'tipo_promocion', 'fecha_inicio_promocion', 'fecha_fin_promocion',
-        'fecha_venta', 'dia_venta', 'mes_venta', 'año_venta', 'trimestre_venta', 'festivo_venta',
-        'cantidad_vendida', 'precio_unitario', 'descuento_unitario', 'precio_final_unitario', 'total_bruto', 'total_descuento', 'total_neto'
-    ]
-    faltantes = [col for col in columnas_requeridas if col not in df.columns]
+def seleccionar_modo_carga():
+    """Muestra los modos de carga y devuelve la opción elegida (None para volver)"""
+    print("\n" + "="*50)
+    print("    ⚙️ MODO DE CARGA")
+    print("="*50)
+    for key, descripcion in MODOS_CARGA.items():
+        print(f"{key}. {descripcion}")
+    print("0. 🔙 Volver atrás")
+    print("="*50)
+    while True:
+        opcion = input("Selecciona el modo de carga (Enter = 2): ").strip() or '2'
+        if opcion == '0':
+            return None
+        if opcion in MODOS_CARGA:
+            return opcion
+        print("❌ [ERROR] Opción inválida.")
+
+def pedir_tamano_bloque():
+    """Pide el tamaño de bloque para la lectura en streaming"""
+    valor = input(f"Filas por bloque (Enter = {TAMANO_BLOQUE_LECTURA:,}): ").strip().replace('.', '').replace(',', '')
+    if valor.isdigit() and int(valor) > 0:
+        return int(valor)
+    return TAMANO_BLOQUE_LECTURA
+
+def pedir_trabajadores():
+    """Pide la cantidad de procesos en paralelo para cargar ventas"""
+    valor = input(f"Procesos en paralelo (1-{MAX_TRABAJADORES_CARGA}, Enter = 4): ").strip()
+    if valor.isdigit() and 1 <= int(valor) <= MAX_TRABAJADORES_CARGA:
+        return int(valor)
+    return min(4, MAX_TRABAJADORES_CARGA)
+
+def validar_columnas_completas(df):
+    """Verifica que el DataFrame tenga todas las columnas de un archivo completo"""
+    faltantes = [col for col in COLUMNAS_ARCHIVO_COMPLETO if col not in df.columns]
     if faltantes:
         print(f"❌ [ERROR] El archivo no es un archivo completo. Faltan columnas:")
         for col in faltantes[:10]:
@@ -68,12 +329,30 @@ def procesar_archivo_completo(df, archivo_elegido):
             print(f"   ... y {len(faltantes) - 10} más")
         print("\n💡 Este archivo debe ser generado por el Scraper Integrado (Opción 3)")
         return False
+    return True
+
+def procesar_archivo_completo(df, archivo_elegido, carga=None):
+    """Procesa un archivo completo con todas las tablas, sin usar IDs del archivo"""
+    print(f"\n🚀 PROCESANDO ARCHIVO COMPLETO: {archivo_elegido}")
+    print("="*60)
+    if not validar_columnas_completas(df):
+        return False
     print("✅ Archivo completo detectado. Procesando todas las tablas...")
     try:
-        for idx, row in df.iterrows():
+        df = preparar_archivo_completo(df)
+        cache = obtener_cache_claves()
+        filas_rechazadas = 0
+        for fila, (idx, row) in enumerate(df.iterrows(), start=1):
+            # Sin fecha de venta no hay tiempo que asignar: la fila se cuenta como error y se sigue
+            if pd.isna(row['fecha_venta']):
+                filas_rechazadas += 1
+                print(f"⚠️ Fila {fila}: {MENSAJE_FECHA_INVALIDA}, se omite")
+                registrar_avance(session, carga, fila, filas_rechazadas)
+                session.commit()
+                continue
             # 1. Usuario
-            usuario = session.query(models.Usuario).filter_by(email=row['email_usuario']).first()
-            if not usuario:
+            id_usuario = cache['usuarios'].get(row['email_usuario'])
+            if id_usuario is None:
                 usuario = models.Usuario(
                     nombre=row['nombre_usuario'],
                     apellido=row['apellido_usuario'],
@@ -83,11 +362,11 @@ def procesar_archivo_completo(df, archivo_elegido):
                 )
                 session.add(usuario)
                 session.commit()
-            id_usuario = usuario.id_usuario
+                id_usuario = cache['usuarios'][row['email_usuario']] = usuario.id_usuario
             # 2. Dirección
-            direccion_calle = str(row['direccion_tienda'])[:100]
-            direccion = session.query(models.Direccion).filter_by(calle=direccion_calle).first()
-            if not direccion:
+            direccion_calle = row['direccion_calle']
+            id_direccion = cache['direccion'].get(direccion_calle)
+            if id_direccion is None:
                 direccion = models.Direccion(
                     calle=direccion_calle,
                     numero='N/A',
@@ -97,10 +376,10 @@ def procesar_archivo_completo(df, archivo_elegido):
                 )
                 session.add(direccion)
                 session.commit()
-            id_direccion = direccion.id_direccion
+                id_direccion = cache['direccion'][direccion_calle] = direccion.id_direccion
             # 3. Tienda
-            tienda = session.query(models.Tienda).filter_by(nombre=row['nombre_tienda']).first()
-            if not tienda:
+            id_tienda = cache['tienda'].get(row['nombre_tienda'])
+            if id_tienda is None:
                 tienda = models.Tienda(
                     nombre=row['nombre_tienda'],
                     direccion=row['direccion_tienda'],
@@ -109,16 +388,13 @@ def procesar_archivo_completo(df, archivo_elegido):
                 )
                 session.add(tienda)
                 session.commit()
-            id_tienda = tienda.id_tienda
+                id_tienda = cache['tienda'][row['nombre_tienda']] = tienda.id_tienda
             # 4. Promoción (si existe)
             id_promocion = None
-            if pd.notna(row['tipo_promocion']) and row['tipo_promocion']:
-                promocion = session.query(models.Promocion).filter_by(
-                    tipo_promocion=row['tipo_promocion'],
-                    fecha_inicio=row['fecha_inicio_promocion'],
-                    fecha_fin=row['fecha_fin_promocion']
-                ).first()
-                if not promocion:
+            if row['tiene_promocion']:
+                clave_promocion = (row['tipo_promocion'], row['fecha_inicio_promocion'], row['fecha_fin_promocion'])
+                id_promocion = cache['promocion'].get(clave_promocion)
+                if id_promocion is None:
                     promocion = models.Promocion(
                         tipo_promocion=row['tipo_promocion'],
                         fecha_inicio=row['fecha_inicio_promocion'],
@@ -126,35 +402,32 @@ def procesar_archivo_completo(df, archivo_elegido):
                     )
                     session.add(promocion)
                     session.commit()
-                id_promocion = promocion.id_promocion
-            # 5. Producto
-            # Manejar valores NaN en url_producto
-            url_producto = row['url_producto']
-            if pd.isna(url_producto) or url_producto == 'NaN' or url_producto == '':
-                url_producto = None
-            
-            # Buscar producto existente
-            producto = session.query(models.Producto).filter_by(
-                nombre=row['nombre_producto'],
-                id_tienda=id_tienda
-            ).first()
-            
-            if not producto:
+                    id_promocion = cache['promocion'][clave_promocion] = promocion.id_promocion
+            # 5. Producto (url_producto ya viene con None en lugar de NaN)
+            clave_producto = (row['nombre_producto'], id_tienda)
+            id_producto = cache['productos'].get(clave_producto)
+            if id_producto is None:
                 producto = models.Producto(
                     nombre=row['nombre_producto'],
                     marca=row['marca_producto'] if not pd.isna(row['marca_producto']) else None,
                     precio=row['precio_producto'] if not pd.isna(row['precio_producto']) else None,
-                    url_producto=url_producto,
+                    url_producto=row['url_producto'],
                     promocion=id_promocion,
                     preciofinal=row['precio_producto'] if not pd.isna(row['precio_producto']) else None,
                     id_tienda=id_tienda
                 )
                 session.add(producto)
                 session.commit()
-            id_producto = producto.id_producto
-            # 6. Tiempo
-            tiempo = session.query(models.Tiempo).filter_by(fecha=row['fecha_venta']).first()
-            if not tiempo:
+                id_producto = cache['productos'][clave_producto] = producto.id_producto
+            # 6. Tiempo (con el calendario instalado la clave sale de la fecha)
+            rango = obtener_rango_calendario()
+            if rango:
+                if asegurar_fechas(session.connection(), [row['fecha_venta']], rango):
+                    session.commit()
+                id_tiempo = id_tiempo_de_fecha(row['fecha_venta'])
+            else:
+                id_tiempo = cache['tiempo'].get(row['fecha_venta'])
+            if id_tiempo is None:
                 tiempo = models.Tiempo(
                     fecha=row['fecha_venta'],
                     dia=row['dia_venta'],
@@ -165,7 +438,7 @@ def procesar_archivo_completo(df, archivo_elegido):
                 )
                 session.add(tiempo)
                 session.commit()
-            id_tiempo = tiempo.id_tiempo
+                id_tiempo = cache['tiempo'][row['fecha_venta']] = tiempo.id_tiempo
             # 7. Venta
             venta = models.Venta(
                 id_usuario=id_usuario,
@@ -182,15 +455,793 @@ def procesar_archivo_completo(df, archivo_elegido):
                 total_neto=row['total_neto']
             )
             session.add(venta)
+            # El avance del manifiesto se confirma junto con cada venta
+            registrar_avance(session, carga, fila, filas_rechazadas)
             session.commit()
+        marcar_carga_completada(carga, len(df), filas_rechazadas)
+        print(f"\n🎉 ¡ARCHIVO COMPLETO PROCESADO EXITOSAMENTE!")
+        print(f"📊 Registros procesados: {len(df) - filas_rechazadas}")
+        if filas_rechazadas:
+            print(f"⚠️ Filas rechazadas ({MENSAJE_FECHA_INVALIDA}): {filas_rechazadas}")
+        return True
+    except Exception as e:
+        session.rollback()
+        print(f"❌ [ERROR] Error al procesar archivo completo: {e}")
+        print(f"📋 Columnas disponibles en el archivo: {list(df.columns)}")
+        return False
+
+def preparar_archivo_completo(df):
+    """Normaliza tipos y claves naturales del archivo completo para la carga masiva"""
+    df = df.copy()
+    # Textos que se usan como clave natural (igual que los guarda PostgreSQL)
+    for col in ['email_usuario', 'edad_usuario', 'nombre_tienda', 'nombre_producto', 'tipo_promocion']:
+        df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    df['direccion_calle'] = df['direccion_tienda'].astype(str).str[:100]
+    df['tiene_promocion'] = df['tipo_promocion'].notna() & (df['tipo_promocion'] != '')
+    for col in ['fecha_inicio_promocion', 'fecha_fin_promocion', 'fecha_venta']:
+        fechas = pd.to_datetime(df[col], errors='coerce')
+        df[col] = fechas.dt.date.where(fechas.notna(), None)
+    # Mismo criterio que la carga fila a fila para URLs vacías
+    df['url_producto'] = df['url_producto'].where(
+        df['url_producto'].notna() & ~df['url_producto'].isin(['NaN', '']), None
+    )
+    return df
+
+def separar_ventas_sin_fecha(df):
+    """Separa las filas preparadas sin fecha_venta: devuelve las válidas y los índices de las rechazadas"""
+    sin_fecha = df['fecha_venta'].isna()
+    return df[~sin_fecha], list(df.index[sin_fecha])
+
+def copiar_dataframe(conn, modelo, df, tamano_bloque=TAMANO_BLOQUE_COPY):
+    """Copia un DataFrame a la tabla del modelo con COPY, en bloques desde un buffer CSV en memoria"""
+    columnas = ', '.join(f'"{col}"' for col in df.columns)
+    sentencia = f'COPY "{modelo.__tablename__}" ({columnas}) FROM STDIN WITH (FORMAT csv)'
+    # El cursor psycopg2 de la misma conexión, así el COPY queda dentro de la transacción
+    cursor = conn.connection.cursor()
+    try:
+        for inicio in range(0, len(df), tamano_bloque):
+            buffer = io.StringIO()
+            df.iloc[inicio:inicio + tamano_bloque].to_csv(buffer, header=False, index=False)
+            buffer.seek(0)
+            cursor.copy_expert(sentencia, buffer)
+    finally:
+        cursor.close()
+    return len(df)
+
+def reservar_ids(conn, modelo, columna_id, cantidad):
+    """Reserva IDs de la secuencia de la tabla para insertar filas con su clave ya conocida"""
+    resultado = conn.execute(
+        text("SELECT nextval(pg_get_serial_sequence(:tabla, :columna)) FROM generate_series(1, :cantidad)"),
+        {'tabla': modelo.__tablename__, 'columna': columna_id, 'cantidad': cantidad}
+    )
+    return [fila[0] for fila in resultado]
+
+def obtener_claves_existentes(conn, modelo, columnas_clave, columna_id):
+    """Obtiene un diccionario clave natural -> ID con una sola consulta por tabla"""
+    columnas = [getattr(modelo, col) for col in columnas_clave]
+    resultado = conn.execute(select(getattr(modelo, columna_id), *columnas))
+    if len(columnas_clave) == 1:
+        return {fila[1]: fila[0] for fila in resultado}
+    return {tuple(fila[1:]): fila[0] for fila in resultado}
+
+def obtener_cache_claves():
+    """Devuelve el cache de claves de dimensiones, cargándolo una sola vez por ejecución"""
+    global cache_claves
+    if cache_claves is None:
+        print("🗂️ Cargando cache de claves de dimensiones...")
+        with engine.connect() as conn:
+            cache_claves = {
+                tabla: obtener_claves_existentes(conn, modelo, columnas_clave, columna_id)
+                for tabla, (modelo, columnas_clave, columna_id) in DIMENSIONES.items()
+            }
+        for tabla, claves in cache_claves.items():
+            print(f"   {tabla}: {len(claves):,} claves")
+    return cache_claves
+
+def invalidar_cache_claves():
+    """Descarta el cache (por ejemplo tras un rollback con claves que ya no existen)"""
+    global cache_claves, rango_calendario
+    cache_claves = None
+    rango_calendario = None
+
+def obtener_rango_calendario():
+    """Devuelve el rango del calendario instalado (None si no lo está), consultándolo una sola vez por ejecución"""
+    global rango_calendario
+    if rango_calendario is None:
+        with engine.connect() as conn:
+            rango_calendario = rango_instalado(conn) or ()
+        if rango_calendario:
+            desde, hasta = rango_calendario
+            print(f"📅 Calendario instalado ({desde} a {hasta}): id_tiempo se calcula como AAAAMMDD")
+    return rango_calendario or None
+
+def insertar_dimension(conn, modelo, df_nuevos, columnas_clave, columna_id, claves):
+    """Inserta con COPY las filas nuevas (sin conflictos) de una dimensión y agrega sus IDs a las claves"""
+    if df_nuevos.empty:
+        return 0
+    df_nuevos = df_nuevos.copy()
+    df_nuevos.insert(0, columna_id, reservar_ids(conn, modelo, columna_id, len(df_nuevos)))
+    copiar_dataframe(conn, modelo, df_nuevos)
+    if len(columnas_clave) == 1:
+        claves.update(zip(df_nuevos[columnas_clave[0]], df_nuevos[columna_id]))
+    else:
+        claves.update(zip(zip(*(df_nuevos[col] for col in columnas_clave)), df_nuevos[columna_id]))
+    return len(df_nuevos)
+
+def filas_nuevas(df, columnas_clave, claves):
+    """Deduplica el DataFrame por clave natural y deja solo las claves que no existen"""
+    unicos = df.drop_duplicates(subset=columnas_clave, keep='first')
+    if len(columnas_clave) == 1:
+        existe = unicos[columnas_clave[0]].isin(claves.keys())
+    else:
+        existe = pd.Series(
+            [clave in claves for clave in zip(*(unicos[col] for col in columnas_clave))],
+            index=unicos.index, dtype=bool
+        )
+    return unicos[~existe]
+
+def asignar_ids(df, columnas_clave, claves, columna_id):
+    """Agrega al DataFrame la columna de IDs resueltos desde las claves naturales"""
+    if len(columnas_clave) == 1:
+        ids = df[columnas_clave[0]].map(claves)
+    else:
+        ids = pd.Series([claves.get(clave) for clave in zip(*(df[col] for col in columnas_clave))], index=df.index)
+    df[columna_id] = ids.astype('Int64')
+
+def resolver_dimensiones(conn, df, cache):
+    """Inserta las dimensiones nuevas de un bloque preparado y agrega sus IDs al DataFrame"""
+    nuevas = {}
+    # 1. Usuarios
+    claves_usuarios = cache['usuarios']
+    nuevos = filas_nuevas(df, ['email_usuario'], claves_usuarios)
+    nuevas['usuarios'] = insertar_dimension(conn, models.Usuario, pd.DataFrame({
+        'nombre': nuevos['nombre_usuario'],
+        'apellido': nuevos['apellido_usuario'],
+        'email': nuevos['email_usuario'],
+        'edad': nuevos['edad_usuario'],
+        'sexo': nuevos['sexo_usuario']
+    }), ['email'], 'id_usuario', claves_usuarios)
+    asignar_ids(df, ['email_usuario'], claves_usuarios, 'id_usuario')
+
+    # 2. Dirección
+    claves_direcciones = cache['direccion']
+    nuevos = filas_nuevas(df, ['direccion_calle'], claves_direcciones)
+    nuevas['direccion'] = insertar_dimension(conn, models.Direccion, pd.DataFrame({
+        'calle': nuevos['direccion_calle'],
+        'numero': 'N/A',
+        'comuna': 'N/A',
+        'ciudad': nuevos['direccion_calle'].str[:50],
+        'region': 'N/A'
+    }), ['calle'], 'id_direccion', claves_direcciones)
+    asignar_ids(df, ['direccion_calle'], claves_direcciones, 'id_direccion')
+
+    # 3. Tienda
+    claves_tiendas = cache['tienda']
+    nuevos = filas_nuevas(df, ['nombre_tienda'], claves_tiendas)
+    nuevas['tienda'] = insertar_dimension(conn, models.Tienda, pd.DataFrame({
+        'nombre': nuevos['nombre_tienda'],
+        'direccion': nuevos['direccion_tienda'],
+        'url': nuevos['url_tienda'],
+        'id_direccion': nuevos['id_direccion']
+    }), ['nombre'], 'id_tienda', claves_tiendas)
+    asignar_ids(df, ['nombre_tienda'], claves_tiendas, 'id_tienda')
+
+    # 4. Promoción (solo filas con promoción)
+    columnas_promocion = ['tipo_promocion', 'fecha_inicio_promocion', 'fecha_fin_promocion']
+    claves_promociones = cache['promocion']
+    nuevos = filas_nuevas(df[df['tiene_promocion']], columnas_promocion, claves_promociones)
+    nuevas['promocion'] = insertar_dimension(conn, models.Promocion, pd.DataFrame({
+        'tipo_promocion': nuevos['tipo_promocion'],
+        'fecha_inicio': nuevos['fecha_inicio_promocion'],
+        'fecha_fin': nuevos['fecha_fin_promocion']
+    }), ['tipo_promocion', 'fecha_inicio', 'fecha_fin'], 'id_promocion', claves_promociones)
+    asignar_ids(df, columnas_promocion, claves_promociones, 'id_promocion')
+    df.loc[~df['tiene_promocion'], 'id_promocion'] = None
+
+    # 5. Producto (la promoción es la de la primera venta del producto)
+    claves_productos = cache['productos']
+    nuevos = filas_nuevas(df, ['nombre_producto', 'id_tienda'], claves_productos)
+    nuevas['productos'] = insertar_dimension(conn, models.Producto, pd.DataFrame({
+        'nombre': nuevos['nombre_producto'],
+        'marca': nuevos['marca_producto'],
+        'precio': nuevos['precio_producto'],
+        'url_producto': nuevos['url_producto'],
+        'promocion': nuevos['id_promocion'],
+        'preciofinal': nuevos['precio_producto'],
+        'id_tienda': nuevos['id_tienda']
+    }), ['nombre', 'id_tienda'], 'id_producto', claves_productos)
+    asignar_ids(df, ['nombre_producto', 'id_tienda'], claves_productos, 'id_producto')
+
+    # 6. Tiempo (con el calendario instalado la clave sale de la fecha, sin buscarla)
+    rango = obtener_rango_calendario()
+    if rango:
+        nuevas['tiempo'] = asegurar_fechas(conn, df['fecha_venta'].dropna().unique(), rango)
+        df['id_tiempo'] = ids_tiempo_de_fechas(df['fecha_venta'])
+    else:
+        claves_tiempo = cache['tiempo']
+        nuevos = filas_nuevas(df[df['fecha_venta'].notna()], ['fecha_venta'], claves_tiempo)
+        nuevas['tiempo'] = insertar_dimension(conn, models.Tiempo, pd.DataFrame({
+            'fecha': nuevos['fecha_venta'],
+            'dia': nuevos['dia_venta'],
+            'mes': nuevos['mes_venta'],
+            'año': nuevos['año_venta'],
+            'trimestre': nuevos['trimestre_venta'],
+            'festivo': nuevos['festivo_venta']
+        }), ['fecha'], 'id_tiempo', claves_tiempo)
+        asignar_ids(df, ['fecha_venta'], claves_tiempo, 'id_tiempo')
+
+    return nuevas
+
+def cargar_bloque_completo(conn, df, cache):
+    """Resuelve dimensiones y copia las ventas de un bloque ya preparado; devuelve las filas nuevas por tabla"""
+    nuevas = resolver_dimensiones(conn, df, cache)
+    nuevas['ventas'] = copiar_dataframe(conn, models.Venta, df[COLUMNAS_VENTAS])
+    return nuevas
+
+def iniciar_proceso_carga():
+    """Inicializa un proceso de carga: descarta las conexiones heredadas del proceso padre"""
+    engine.dispose(close=False)
+
+def copiar_particion_ventas(particion):
+    """Copia una partición (id_carga, fila_inicio, ventas) en su propia conexión y la registra en la misma transacción"""
+    id_carga, fila_inicio, df_ventas = particion
+    with engine.begin() as conn:
+        copiadas = copiar_dataframe(conn, models.Venta, df_ventas)
+        if id_carga is not None:
+            conn.execute(models.CargaParticion.__table__.insert().values(
+                id_carga=id_carga, fila_inicio=fila_inicio, filas=len(df_ventas),
+            ))
+        return copiadas
+
+def particiones_pendientes(total_filas, confirmadas, tamano=TAMANO_PARTICION_VENTAS):
+    """Devuelve (fila_inicio, fila_fin) de las particiones que faltan, saltando los tramos ya confirmados"""
+    pendientes = []
+    desde = 0
+    for inicio, filas in sorted(confirmadas) + [(total_filas, 0)]:
+        for fila in range(desde, min(inicio, total_filas), tamano):
+            pendientes.append((fila, min(fila + tamano, inicio, total_filas)))
+        desde = max(desde, inicio + filas)
+    return pendientes
+
+def tamano_particion(total_filas, trabajadores):
+    """Reparte las filas en partes iguales entre los procesos, sin pasar del tope por partición"""
+    return max(1, min(TAMANO_PARTICION_VENTAS, math.ceil(total_filas / max(1, trabajadores))))
+
+def tamano_particion_carga(carga, total_filas, trabajadores):
+    """Devuelve el tamaño de partición de la carga: el registrado, o uno nuevo que queda registrado antes de copiar"""
+    if carga is None:
+        return tamano_particion(total_filas, trabajadores)
+    tamano = carga.get('tamano_particion')
+    confirmadas = carga['particiones']
+    if tamano is None and confirmadas:
+        # Carga interrumpida antes de registrar el tamaño: se deduce de sus particiones
+        tamano = max(filas for _, filas in confirmadas)
+    if tamano is None:
+        tamano = tamano_particion(total_filas, trabajadores)
+    if carga.get('tamano_particion') != tamano:
+        manifiesto = models.CargaArchivo
+        with engine.begin() as conn:
+            conn.execute(update(manifiesto).where(manifiesto.id_carga == carga['id_carga']).values(tamano_particion=tamano))
+        carga['tamano_particion'] = tamano
+    desalineadas = [inicio for inicio, filas in confirmadas
+                    if inicio % tamano or filas != min(tamano, total_filas - inicio)]
+    if desalineadas:
+        # Los tramos que faltan se recalculan entre los confirmados: nada se copia dos veces
+        print(f"⚠️ {len(desalineadas)} particiones confirmadas no calzan con el tamaño registrado ({tamano:,} filas); se cargan solo los tramos que faltan")
+    return tamano
+
+def copiar_ventas_en_paralelo(df_ventas, trabajadores, carga=None):
+    """Copia en paralelo las particiones de ventas que faltan, un proceso y una conexión por partición"""
+    id_carga = carga['id_carga'] if carga else None
+    confirmadas = carga['particiones'] if carga else []
+    tamano = tamano_particion_carga(carga, len(df_ventas), trabajadores)
+    particiones = [
+        (id_carga, inicio, df_ventas.iloc[inicio:fin])
+        for inicio, fin in particiones_pendientes(len(df_ventas), confirmadas, tamano)
+    ]
+    if confirmadas:
+        print(f"⏩ Se omiten {sum(filas for _, filas in confirmadas):,} ventas de particiones ya confirmadas")
+    # Sin pool solo con un proceso o cuando queda una sola partición por retomar
+    if len(particiones) <= 1 or trabajadores <= 1:
+        return sum(copiar_particion_ventas(particion) for particion in particiones)
+    # Procesos y no hilos: armar el CSV de cada partición ocupa CPU y en hilos quedaría atado al GIL
+    with ProcessPoolExecutor(max_workers=min(trabajadores, len(particiones)), initializer=iniciar_proceso_carga) as ejecutor:
+        return sum(ejecutor.map(copiar_particion_ventas, particiones))
+
+def procesar_archivo_completo_masivo(df, archivo_elegido, carga=None):
+    """Procesa un archivo completo por conjuntos: deduplica dimensiones y copia por lotes"""
+    print(f"\n🚀 PROCESANDO ARCHIVO COMPLETO (MODO MASIVO): {archivo_elegido}")
+    print("="*60)
+    if not validar_columnas_completas(df):
+        return False
+    print("✅ Archivo completo detectado. Procesando todas las tablas por lotes...")
+    try:
+        inicio = time.perf_counter()
+        total_filas = len(df)
+        df, sin_fecha = separar_ventas_sin_fecha(preparar_archivo_completo(df))
+        cache = obtener_cache_claves()
+        # Una sola transacción: si algo falla no queda la base a medio cargar
+        with engine.begin() as conn:
+            nuevas = cargar_bloque_completo(conn, df, cache)
+            registrar_avance(conn, carga, total_filas, len(sin_fecha), 'completado')
+        segundos = time.perf_counter() - inicio
+        for tabla, total in nuevas.items():
+            print(f"   {ETIQUETAS_TABLAS[tabla]}: {total:,}")
         print(f"\n🎉 ¡ARCHIVO COMPLETO PROCESADO EXITOSAMENTE!")
         print(f"📊 Registros procesados: {len(df)}")
+        if sin_fecha:
+            print(f"⚠️ Filas rechazadas ({MENSAJE_FECHA_INVALIDA}): {len(sin_fecha)}")
+        print(f"⚡ Rendimiento: {total_filas / max(segundos, 1e-9):,.0f} filas/s ({segundos:.2f} s)")
         return True
     except Exception as e:
+        # El rollback deja en el cache claves que ya no existen
+        invalidar_cache_claves()
         print(f"❌ [ERROR] Error al procesar archivo completo: {e}")
         print(f"📋 Columnas disponibles en el archivo: {list(df.columns)}")
         return False
 
+def procesar_archivo_paralelo(df, archivo_elegido, trabajadores, carga=None):
+    """Procesa un archivo completo: dimensiones en una transacción y ventas copiadas en paralelo"""
+    print(f"\n🚀 PROCESANDO ARCHIVO COMPLETO (MODO PARALELO, {trabajadores} procesos): {archivo_elegido}")
+    print("="*60)
+    if not validar_columnas_completas(df):
+        return False
+    print("✅ Archivo completo detectado. Resolviendo dimensiones...")
+    try:
+        inicio = time.perf_counter()
+        total_filas = len(df)
+        # Las filas que se omiten son siempre las mismas: las particiones de una carga retomada no cambian
+        df, sin_fecha = separar_ventas_sin_fecha(preparar_archivo_completo(df))
+        cache = obtener_cache_claves()
+        # Un solo escritor para las dimensiones: evita carreras por claves duplicadas
+        with engine.begin() as conn:
+            nuevas = resolver_dimensiones(conn, df, cache)
+    except Exception as e:
+        invalidar_cache_claves()
+        print(f"❌ [ERROR] Error al resolver dimensiones: {e}")
+        return False
+    for tabla, total in nuevas.items():
+        print(f"   {ETIQUETAS_TABLAS[tabla]}: {total:,}")
+    try:
+        inicio_ventas = time.perf_counter()
+        total = copiar_ventas_en_paralelo(df[COLUMNAS_VENTAS], trabajadores, carga)
+        segundos_ventas = time.perf_counter() - inicio_ventas
+    except Exception as e:
+        # Cada partición es su propia transacción: las que terminaron quedan cargadas y registradas
+        print(f"❌ [ERROR] Error al copiar ventas en paralelo: {e}")
+        print("💡 Al volver a cargar el archivo se retoma en modo paralelo, sin repetir las particiones confirmadas.")
+        return False
+    marcar_carga_completada(carga, total_filas, len(sin_fecha))
+    segundos = time.perf_counter() - inicio
+    print(f"   {ETIQUETAS_TABLAS['ventas']}: {total:,} ({total / max(segundos_ventas, 1e-9):,.0f} filas/s)")
+    print(f"\n🎉 ¡ARCHIVO COMPLETO PROCESADO EXITOSAMENTE!")
+    print(f"📊 Registros procesados: {len(df)}")
+    if sin_fecha:
+        print(f"⚠️ Filas rechazadas ({MENSAJE_FECHA_INVALIDA}): {len(sin_fecha)}")
+    print(f"⚡ Rendimiento: {total_filas / max(segundos, 1e-9):,.0f} filas/s ({segundos:.2f} s)")
+    return True
+
+def calcular_hash_archivo(ruta_csv):
+    """Calcula el SHA-256 del contenido de un archivo leyéndolo por partes"""
+    h = hashlib.sha256()
+    with open(ruta_csv, 'rb') as f:
+        for parte in iter(lambda: f.read(TAMANO_LECTURA_HASH), b''):
+            h.update(parte)
+    return h.hexdigest()
+
+def preparar_manifiesto(ruta_csv, archivo_elegido):
+    """Busca o registra el archivo en el manifiesto de cargas; devuelve None si ya se cargó completo"""
+    manifiesto = models.CargaArchivo
+    info = os.stat(ruta_csv)
+    with engine.begin() as conn:
+        # Atajo sin releer el archivo: mismo nombre, tamaño y fecha de modificación que una carga terminada
+        terminado = conn.execute(select(manifiesto.id_carga).where(
+            manifiesto.nombre_archivo == archivo_elegido,
+            manifiesto.tamano == info.st_size,
+            manifiesto.fecha_modificacion == info.st_mtime,
+            manifiesto.estado == 'completado',
+        )).first()
+        if terminado:
+            return None
+        hash_contenido = calcular_hash_archivo(ruta_csv)
+        registro = conn.execute(
+            select(manifiesto.id_carga, manifiesto.filas_procesadas, manifiesto.filas_rechazadas,
+                   manifiesto.tamano_particion, manifiesto.estado)
+            .where(manifiesto.hash_contenido == hash_contenido)
+        ).first()
+        if registro is None:
+            id_carga = conn.execute(models.CargaArchivo.__table__.insert().values(
+                nombre_archivo=archivo_elegido, hash_contenido=hash_contenido,
+                tamano=info.st_size, fecha_modificacion=info.st_mtime,
+                filas_procesadas=0, filas_rechazadas=0, estado='en_progreso',
+            ).returning(manifiesto.id_carga)).scalar()
+            return {'id_carga': id_carga, 'filas_procesadas': 0, 'filas_rechazadas': 0,
+                    'tamano_particion': None, 'particiones': []}
+        # Mismo contenido (quizás copiado o renombrado): se actualizan los datos para el atajo
+        conn.execute(update(manifiesto).where(manifiesto.id_carga == registro.id_carga).values(
+            nombre_archivo=archivo_elegido, tamano=info.st_size, fecha_modificacion=info.st_mtime,
+        ))
+        if registro.estado == 'completado':
+            return None
+        particion = models.CargaParticion
+        particiones = conn.execute(
+            select(particion.fila_inicio, particion.filas).where(particion.id_carga == registro.id_carga)
+        ).all()
+        return {
+            'id_carga': registro.id_carga,
+            'filas_procesadas': registro.filas_procesadas,
+            'filas_rechazadas': registro.filas_rechazadas,
+            'tamano_particion': registro.tamano_particion,
+            'particiones': [tuple(fila) for fila in particiones],
+        }
+
+def registrar_avance(conn, carga, filas_procesadas, filas_rechazadas=0, estado='en_progreso'):
+    """Actualiza el manifiesto dentro de la transacción de los datos, para que avancen juntos"""
+    if carga is None:
+        return
+    manifiesto = models.CargaArchivo
+    conn.execute(update(manifiesto).where(manifiesto.id_carga == carga['id_carga']).values(
+        filas_procesadas=filas_procesadas, filas_rechazadas=filas_rechazadas,
+        estado=estado, fecha_actualizacion=func.now(),
+    ))
+
+def marcar_carga_completada(carga, filas_procesadas, filas_rechazadas=0):
+    """Marca el archivo como cargado en su propia transacción (modos sin lotes)"""
+    if carga is None:
+        return
+    with engine.begin() as conn:
+        registrar_avance(conn, carga, filas_procesadas, filas_rechazadas, 'completado')
+        # Con el archivo completo ya no hacen falta las particiones de una carga paralela
+        particion = models.CargaParticion
+        conn.execute(particion.__table__.delete().where(particion.id_carga == carga['id_carga']))
+
+def marcar_cache(cache):
+    """Guarda cuántas claves tiene cada dimensión del cache (para revertir tras un rollback)"""
+    return {tabla: len(claves) for tabla, claves in cache.items()}
+
+def revertir_cache(cache, marca):
+    """Quita del cache las claves agregadas después de la marca (las nuevas siempre quedan al final)"""
+    for tabla, cantidad in marca.items():
+        claves = cache[tabla]
+        while len(claves) > cantidad:
+            claves.popitem()
+
+def mensaje_error(e):
+    """Resume el error de la base de datos en una línea"""
+    return str(getattr(e, 'orig', e)).strip().splitlines()[0]
+
+def cargar_lote_tolerante(conn, df, cache, rechazos):
+    """Carga un lote preparado en un savepoint; si falla lo divide en mitades hasta aislar las filas con error"""
+    marca = marcar_cache(cache)
+    savepoint = conn.begin_nested()
+    try:
+        cargar_bloque_completo(conn, df.copy(), cache)
+        savepoint.commit()
+        return len(df)
+    except OperationalError:
+        # Caída de conexión u otro error que no depende de los datos: no se puede aislar
+        raise
+    except Exception as e:
+        savepoint.rollback()
+        revertir_cache(cache, marca)
+        if len(df) == 1:
+            rechazos.append((df.index[0], mensaje_error(e)))
+            return 0
+        mitad = len(df) // 2
+        return (cargar_lote_tolerante(conn, df.iloc[:mitad], cache, rechazos) +
+                cargar_lote_tolerante(conn, df.iloc[mitad:], cache, rechazos))
+
+def ruta_archivo_rechazados(archivo_elegido):
+    """Devuelve la ruta del archivo de cuarentena de un archivo cargado"""
+    return os.path.join('archivos', f"rechazados_{os.path.splitext(archivo_elegido)[0]}.csv")
+
+def guardar_rechazados(df_crudo, rechazos, ruta, agregar):
+    """Escribe en la cuarentena las filas originales rechazadas con su mensaje de error"""
+    indices = [indice for indice, _ in rechazos]
+    filas = df_crudo.loc[indices].copy()
+    filas['error'] = [mensaje for _, mensaje in rechazos]
+    filas.to_csv(ruta, mode='a' if agregar else 'w', header=not agregar, index=False, encoding='utf-8-sig')
+
+def procesar_archivo_por_bloques(ruta_csv, archivo_elegido, tamano_bloque=TAMANO_BLOQUE_LECTURA, tamano_lote=TAMANO_LOTE_COMMIT, carga=None):
+    """Procesa un archivo completo leyéndolo por bloques: cada bloque se valida, resuelve y carga antes de leer el siguiente.
+
+    Cada lote de `tamano_lote` filas se confirma por separado; si un lote falla se aíslan las filas
+    con error, que van a archivos/rechazados_<archivo>.csv, y la carga sigue con el resto.
+    Con `carga` (registro del manifiesto) el avance se guarda en la transacción de cada lote y
+    la carga retoma desde la última fila confirmada.
+    """
+    print(f"\n🚀 PROCESANDO ARCHIVO COMPLETO (MODO POR BLOQUES): {archivo_elegido}")
+    print("="*60)
+    if not validar_columnas_completas(pd.DataFrame(columns=leer_encabezado_csv(ruta_csv))):
+        return False
+    print(f"✅ Archivo completo detectado. Leyendo bloques de {tamano_bloque:,} filas (commit cada {tamano_lote:,})...")
+    ruta_rechazados = ruta_archivo_rechazados(archivo_elegido)
+    desplazamiento = carga['filas_procesadas'] if carga else 0
+    rechazadas_previas = carga['filas_rechazadas'] if carga else 0
+    if desplazamiento:
+        print(f"⏩ Retomando desde la fila {desplazamiento + 1:,} (las anteriores ya están confirmadas)")
+    inicio = time.perf_counter()
+    procesadas = 0
+    cargadas = 0
+    rechazadas = 0
+    numero_bloque = 0
+    try:
+        cache = obtener_cache_claves()
+        # Las filas ya confirmadas se saltan sin cargarlas
+        lector = leer_por_bloques(ruta_csv, tamano_bloque, desplazamiento)
+        for crudo in lector:
+            numero_bloque += 1
+            inicio_bloque = time.perf_counter()
+            crudo.columns = crudo.columns.str.strip().str.lower()
+            bloque = preparar_archivo_completo(crudo)
+            rechazadas_bloque = 0
+            for inicio_lote in range(0, len(bloque), tamano_lote):
+                lote, sin_fecha = separar_ventas_sin_fecha(bloque.iloc[inicio_lote:inicio_lote + tamano_lote])
+                # Las ventas sin fecha van a la cuarentena sin intentar cargarlas
+                rechazos = [(indice, MENSAJE_FECHA_INVALIDA) for indice in sin_fecha]
+                with engine.begin() as conn:
+                    cargadas_lote = cargar_lote_tolerante(conn, lote, cache, rechazos) if len(lote) else 0
+                    registrar_avance(conn, carga, desplazamiento + procesadas + inicio_lote + len(lote) + len(sin_fecha),
+                                     rechazadas_previas + rechazadas + len(rechazos))
+                cargadas += cargadas_lote
+                if rechazos:
+                    agregar = rechazadas + rechazadas_previas > 0 and os.path.exists(ruta_rechazados)
+                    guardar_rechazados(crudo, rechazos, ruta_rechazados, agregar)
+                    rechazadas += len(rechazos)
+                    rechazadas_bloque += len(rechazos)
+            procesadas += len(bloque)
+            segundos_bloque = time.perf_counter() - inicio_bloque
+            segundos = time.perf_counter() - inicio
+            print(f"   📦 Bloque {numero_bloque}: {len(bloque) - rechazadas_bloque:,} ventas, {rechazadas_bloque:,} rechazadas "
+                  f"| {len(bloque) / max(segundos_bloque, 1e-9):,.0f} filas/s "
+                  f"| acumulado {procesadas:,} ({procesadas / max(segundos, 1e-9):,.0f} filas/s)")
+        marcar_carga_completada(carga, desplazamiento + procesadas, rechazadas_previas + rechazadas)
+    except Exception as e:
+        invalidar_cache_claves()
+        print(f"❌ [ERROR] Error en el bloque {numero_bloque}: {e}")
+        print(f"📊 Registros cargados antes del error: {cargadas:,}")
+        if carga:
+            print("💡 Vuelve a cargar el mismo archivo para retomar desde el último lote confirmado.")
+        return False
+    segundos = time.perf_counter() - inicio
+    print(f"\n🎉 ¡ARCHIVO COMPLETO PROCESADO!")
+    print(f"📊 Registros cargados: {cargadas:,} de {procesadas:,} en {numero_bloque} bloques")
+    if rechazadas:
+        print(f"⚠️ Filas rechazadas: {rechazadas:,} (ver {ruta_rechazados})")
+    print(f"⚡ Rendimiento: {procesadas / max(segundos, 1e-9):,.0f} filas/s ({segundos:.2f} s)")
+    return True
+
+def buscar_archivo_estrella(carpeta, tabla):
+    """Devuelve la ruta del archivo de una tabla del esquema estrella (CSV o Parquet), o None"""
+    for extension in ('.parquet', '.csv'):
+        ruta = os.path.join(carpeta, tabla + extension)
+        if os.path.exists(ruta):
+            return ruta
+    return None
+
+def leer_esquema_estrella(carpeta):
+    """Lee los archivos del esquema estrella con los tipos que usa la base para las claves naturales"""
+    tablas = {}
+    for tabla in TABLAS_ESTRELLA:
+        ruta = buscar_archivo_estrella(carpeta, tabla)
+        if ruta is None:
+            print(f"❌ [ERROR] Falta el archivo de la tabla '{tabla}' en {carpeta}")
+            return None
+        tablas[tabla] = leer_tabla(ruta)
+    for tabla, columnas in [('usuarios', ['email', 'edad']), ('tienda', ['nombre']),
+                            ('promocion', ['tipo_promocion']), ('productos', ['nombre'])]:
+        for col in columnas:
+            df = tablas[tabla]
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    for tabla, columnas in [('promocion', ['fecha_inicio', 'fecha_fin']), ('tiempo', ['fecha'])]:
+        for col in columnas:
+            fechas = pd.to_datetime(tablas[tabla][col], errors='coerce')
+            tablas[tabla][col] = fechas.dt.date.where(fechas.notna(), None)
+    productos = tablas['productos']
+    productos['url_producto'] = productos['url_producto'].where(
+        productos['url_producto'].notna() & ~productos['url_producto'].isin(['NaN', '']), None
+    )
+    return tablas
+
+def remapear_dimension(conn, tabla, df, cache):
+    """Inserta las filas nuevas de un archivo de dimensión y devuelve (mapa id del archivo -> id en la base, insertadas)"""
+    modelo, columnas_clave, columna_id = DIMENSIONES[tabla]
+    claves = cache[tabla]
+    columnas = [col.name for col in modelo.__table__.columns if col.name != columna_id and col.name in df.columns]
+    insertadas = insertar_dimension(
+        conn, modelo, filas_nuevas(df, columnas_clave, claves)[columnas], columnas_clave, columna_id, claves
+    )
+    destino = df[columnas_clave].copy()
+    asignar_ids(destino, columnas_clave, claves, 'id_base')
+    return pd.Series(destino['id_base'].to_numpy(), index=df[columna_id].to_numpy()), insertadas
+
+def cargar_esquema_estrella(conn, tablas, cache):
+    """Carga las dimensiones del esquema estrella, traduce los IDs del archivo y copia las ventas"""
+    nuevas = {}
+    # Tienda (y su dirección, con el mismo criterio que el archivo completo)
+    tiendas = tablas['tienda'].copy()
+    tiendas['calle'] = tiendas['direccion'].astype(str).str[:100]
+    claves_direcciones = cache['direccion']
+    nuevos = filas_nuevas(tiendas, ['calle'], claves_direcciones)
+    nuevas['direccion'] = insertar_dimension(conn, models.Direccion, pd.DataFrame({
+        'calle': nuevos['calle'],
+        'numero': 'N/A',
+        'comuna': 'N/A',
+        'ciudad': nuevos['calle'].str[:50],
+        'region': 'N/A'
+    }), ['calle'], 'id_direccion', claves_direcciones)
+    asignar_ids(tiendas, ['calle'], claves_direcciones, 'id_direccion')
+    mapas = {}
+    mapas['tienda'], nuevas['tienda'] = remapear_dimension(conn, 'tienda', tiendas, cache)
+    for tabla in ['usuarios', 'promocion']:
+        mapas[tabla], nuevas[tabla] = remapear_dimension(conn, tabla, tablas[tabla], cache)
+    rango = obtener_rango_calendario()
+    if rango:
+        # Calendario instalado: la clave en la base es AAAAMMDD de la fecha
+        tiempo = tablas['tiempo']
+        nuevas['tiempo'] = asegurar_fechas(conn, tiempo['fecha'], rango)
+        mapas['tiempo'] = pd.Series(ids_tiempo_de_fechas(tiempo['fecha']).to_numpy(), index=tiempo['id_tiempo'].to_numpy())
+    else:
+        mapas['tiempo'], nuevas['tiempo'] = remapear_dimension(conn, 'tiempo', tablas['tiempo'], cache)
+    # Productos: su clave natural usa el ID de la tienda en la base
+    productos = tablas['productos'].copy()
+    productos['id_tienda'] = productos['id_tienda'].map(mapas['tienda']).astype('Int64')
+    productos['promocion'] = productos['promocion'].map(mapas['promocion']).astype('Int64')
+    mapas['productos'], nuevas['productos'] = remapear_dimension(conn, 'productos', productos, cache)
+    # Ventas: solo enteros y montos, con los IDs traducidos
+    ventas = tablas['ventas']
+    for columna, tabla in [('id_usuario', 'usuarios'), ('id_producto', 'productos'), ('id_tienda', 'tienda'),
+                           ('id_tiempo', 'tiempo'), ('id_promocion', 'promocion')]:
+        ventas[columna] = ventas[columna].map(mapas[tabla]).astype('Int64')
+    nuevas['ventas'] = copiar_dataframe(conn, models.Venta, ventas[COLUMNAS_VENTAS])
+    return nuevas
+
+def procesar_esquema_estrella(carpeta, nombre):
+    """Carga un esquema estrella: dimensiones primero y luego el archivo de ventas, en una sola transacción"""
+    print(f"\n🚀 PROCESANDO ESQUEMA ESTRELLA: {nombre}")
+    print("="*60)
+    tablas = leer_esquema_estrella(carpeta)
+    if tablas is None:
+        return False
+    ruta_ventas = buscar_archivo_estrella(carpeta, 'ventas')
+    carga = preparar_manifiesto(ruta_ventas, f"{nombre}/{os.path.basename(ruta_ventas)}")
+    if carga is None:
+        print(f"⏭️ Las ventas de '{nombre}' ya fueron cargadas (según el manifiesto). Se omite.")
+        return True
+    for tabla, df in tablas.items():
+        print(f"   📄 {tabla}: {len(df):,} filas")
+    try:
+        inicio = time.perf_counter()
+        cache = obtener_cache_claves()
+        with engine.begin() as conn:
+            nuevas = cargar_esquema_estrella(conn, tablas, cache)
+            registrar_avance(conn, carga, len(tablas['ventas']), estado='completado')
+        segundos = time.perf_counter() - inicio
+    except Exception as e:
+        invalidar_cache_claves()
+        print(f"❌ [ERROR] Error al cargar el esquema estrella: {e}")
+        return False
+    for tabla in ['usuarios', 'direccion', 'tienda', 'promocion', 'productos', 'tiempo', 'ventas']:
+        print(f"   {ETIQUETAS_TABLAS[tabla]}: {nuevas[tabla]:,}")
+    print(f"\n🎉 ¡ESQUEMA ESTRELLA CARGADO EXITOSAMENTE!")
+    print(f"⚡ Rendimiento: {len(tablas['ventas']) / max(segundos, 1e-9):,.0f} ventas/s ({segundos:.2f} s)")
+    return True
+
+def leer_encabezado_csv(ruta_csv):
+    """Lee y normaliza los nombres de columna de un CSV (primera línea) o de un Parquet (esquema)"""
+    if ruta_csv.endswith('.parquet'):
+        return [col.strip().lower() for col in leer_columnas(ruta_csv)]
+    with open(ruta_csv, encoding='utf-8-sig', newline='') as f:
+        encabezado = next(csv.reader(f), [])
+    return [col.strip().lower() for col in encabezado]
+
+def abrir_para_copy(ruta_csv):
+    """Abre el archivo como texto CSV sin encabezado, listo para COPY (un Parquet se convierte en memoria)"""
+    if ruta_csv.endswith('.parquet'):
+        return io.StringIO(leer_tabla(ruta_csv).to_csv(index=False, header=False))
+    f = open(ruta_csv, encoding='utf-8-sig', newline='')
+    f.readline()
+    return f
+
+def procesar_archivo_staging(ruta_csv, archivo_elegido, carga=None):
+    """Procesa un archivo completo dentro de PostgreSQL: COPY a una tabla staging y INSERT ... SELECT"""
+    print(f"\n🚀 PROCESANDO ARCHIVO COMPLETO (MODO STAGING): {archivo_elegido}")
+    print("="*60)
+    columnas = leer_encabezado_csv(ruta_csv)
+    if not validar_columnas_completas(pd.DataFrame(columns=columnas)):
+        return False
+    print("✅ Archivo completo detectado. Cargando a la tabla staging...")
+    definicion = ', '.join(f'"{col}" text' for col in columnas)
+    lista_columnas = ', '.join(f'"{col}"' for col in columnas)
+    try:
+        inicio = time.perf_counter()
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {TABLA_STAGING}"))
+            conn.execute(text(f"CREATE UNLOGGED TABLE {TABLA_STAGING} (fila bigserial, {definicion})"))
+            # El archivo se envía tal cual; la fila se numera para conservar el orden de aparición
+            cursor = conn.connection.cursor()
+            try:
+                with abrir_para_copy(ruta_csv) as f:
+                    cursor.copy_expert(
+                        f"COPY {TABLA_STAGING} ({lista_columnas}) FROM STDIN WITH (FORMAT csv)", f
+                    )
+                filas = cursor.rowcount
+            finally:
+                cursor.close()
+            print(f"   📥 Filas en staging: {filas:,}")
+            # Igual que en los demás modos, las ventas sin fecha se rechazan antes de tocar las dimensiones
+            sin_fecha = conn.execute(text(
+                f"DELETE FROM {TABLA_STAGING} WHERE fecha_venta IS NULL OR fecha_venta !~ :patron"
+            ), {'patron': PATRON_FECHA_STAGING}).rowcount
+            if sin_fecha:
+                print(f"   ⚠️ Filas rechazadas ({MENSAJE_FECHA_INVALIDA}): {sin_fecha:,}")
+            conn.execute(text(f"ANALYZE {TABLA_STAGING}"))
+            rango = obtener_rango_calendario()
+            for descripcion, sentencia in SENTENCIAS_STAGING:
+                if rango and descripcion == ETIQUETAS_TABLAS['tiempo']:
+                    # Calendario instalado: solo faltan las fechas fuera de su rango, con clave AAAAMMDD y feriados
+                    fechas = conn.execute(text(
+                        f"SELECT DISTINCT fecha_venta::date FROM {TABLA_STAGING} WHERE fecha_venta IS NOT NULL"
+                    )).scalars()
+                    print(f"   {descripcion}: {asegurar_fechas(conn, list(fechas), rango):,}")
+                    continue
+                resultado = conn.execute(text(sentencia.format(staging=TABLA_STAGING, **SQL_TIEMPO_VENTAS[bool(rango)])))
+                print(f"   {descripcion}: {resultado.rowcount:,}")
+            conn.execute(text(f"DROP TABLE {TABLA_STAGING}"))
+            registrar_avance(conn, carga, filas, sin_fecha, 'completado')
+        segundos = time.perf_counter() - inicio
+        print(f"\n🎉 ¡ARCHIVO COMPLETO PROCESADO EXITOSAMENTE!")
+        print(f"📊 Registros procesados: {filas - sin_fecha}")
+        print(f"⚡ Rendimiento: {filas / max(segundos, 1e-9):,.0f} filas/s ({segundos:.2f} s)")
+        return True
+    except Exception as e:
+        print(f"❌ [ERROR] Error al procesar archivo completo: {e}")
+        print(f"📋 Columnas disponibles en el archivo: {columnas}")
+        return False
+    finally:
+        # Las dimensiones se llenaron en el servidor: el cache ya no está completo
+        invalidar_cache_claves()
+
+def leer_archivo_completo(ruta_csv, archivo_elegido):
+    """Lee un archivo completo en un DataFrame y muestra su resumen (None si falla)"""
+    try:
+        df = leer_tabla(ruta_csv)
+        df.columns = df.columns.str.strip().str.lower()
+    except Exception as e:
+        print(f"❌ [ERROR] No se pudo leer el archivo: {e}")
+        return None
+    
+    print(f"\n📄 [ARCHIVO] Archivo: {archivo_elegido}")
+    print(f"📊 [INFO] Filas: {len(df)}")
+    print(f"📋 [INFO] Columnas: {list(df.columns)}")
+    fuera = contar_promociones_fuera_de_vigencia(df)
+    if fuera:
+        print(f"⚠️ [INFO] Ventas con promoción fuera de su vigencia: {fuera}")
+    return df
+
+def contar_promociones_fuera_de_vigencia(df):
+    """Cuenta las ventas cuya fecha cae fuera del rango de su promoción (índice de intervalos por día).
+
+    Es solo un aviso: las filas sin fecha de venta o sin rango de promoción válido no se cuentan.
+    """
+    if not {'fecha_venta', 'fecha_inicio_promocion', 'fecha_fin_promocion'} <= set(df.columns):
+        return 0
+    pares = pd.DataFrame({
+        'fecha_inicio': pd.to_datetime(df['fecha_inicio_promocion'], errors='coerce'),
+        'fecha_fin': pd.to_datetime(df['fecha_fin_promocion'], errors='coerce'),
+        'fecha_venta': pd.to_datetime(df['fecha_venta'], errors='coerce'),
+    }).dropna(subset=['fecha_inicio', 'fecha_fin', 'fecha_venta'])
+    if pares.empty:
+        return 0
+    # Cada rango distinto de fechas es una promoción del índice
+    codigos, _ = pd.factorize(pares['fecha_inicio'].astype(str) + '|' + pares['fecha_fin'].astype(str))
+    rangos = pares.groupby(codigos)[['fecha_inicio', 'fecha_fin']].first()
+    indice = construir_indice_promociones(
+        {'id_promocion': codigo, 'fecha_inicio': fila.fecha_inicio, 'fecha_fin': fila.fecha_fin}
+        for codigo, fila in rangos.iterrows()
+    )
+    return int((~esta_vigente(indice, codigos, pares['fecha_venta'].to_numpy())).sum())
+
 def obtener_o_crear_tienda(nombre_tienda):
     """Obtiene una tienda existente o crea una nueva"""
     # Buscar tienda existente
@@ -454,10 +1505,13 @@ def main():
         return
     
     # Listar archivos CSV
-    archivos_csv = [f for f in os.listdir(carpeta) if f.endswith('.csv')]
+    archivos_csv = [
+        f for f in os.listdir(carpeta)
+        if f.endswith(('.csv', '.parquet')) or (f.endswith(SUFIJO_CARPETA_ESTRELLA) and os.path.isdir(os.path.join(carpeta, f)))
+    ]
     
     if not archivos_csv:
-        print(f"❌ [ERROR] No hay archivos CSV en la carpeta '{carpeta}'.")
+        print(f"❌ [ERROR] No hay archivos CSV ni Parquet en la carpeta '{carpeta}'.")
         print("💡 Ejecuta primero el Scraper Integrado (Opción 3) para generar archivos.")
         return
     
@@ -477,21 +1531,47 @@ def main():
         archivo_elegido = archivos_csv[int(op_archivo) - 1]
         ruta_csv = os.path.join(carpeta, archivo_elegido)
         
-        # Leer CSV
-        try:
-            df = pd.read_csv(ruta_csv)
-            df.columns = df.columns.str.strip().str.lower()
-        except Exception as e:
-            print(f"❌ [ERROR] No se pudo leer el archivo: {e}")
-            continue
-        
-        print(f"\n📄 [ARCHIVO] Archivo: {archivo_elegido}")
-        print(f"📊 [INFO] Filas: {len(df)}")
-        print(f"📋 [INFO] Columnas: {list(df.columns)}")
+        if os.path.isdir(ruta_csv):
+            # Carpeta de esquema estrella: dimensiones y luego ventas, con su propio manifiesto
+            modo = None
+            exito = procesar_esquema_estrella(ruta_csv, archivo_elegido)
+        else:
+            carga = preparar_manifiesto(ruta_csv, archivo_elegido)
+            if carga is None:
+                print(f"\n⏭️ '{archivo_elegido}' ya fue cargado completo (según el manifiesto). Se omite.")
+                exito = True
+                modo = None
+            else:
+                modo = seleccionar_modo_carga()
+                if modo is None:
+                    continue
+                if carga['particiones'] and modo != '5':
+                    # Solo el modo paralelo sabe saltar las particiones ya confirmadas
+                    print(f"⏩ Carga paralela anterior interrumpida ({len(carga['particiones'])} particiones confirmadas): se retoma en modo paralelo.")
+                    modo = '5'
+                elif carga['filas_procesadas'] and modo != '4':
+                    # Solo el modo por bloques sabe saltar las filas ya confirmadas
+                    print(f"⏩ Carga anterior interrumpida en la fila {carga['filas_procesadas']:,}: se retoma en modo por bloques.")
+                    modo = '4'
         
         # Procesar automáticamente como archivo completo
-        print("\n🚀 PROCESANDO ARCHIVO COMO COMPLETO...")
-        if procesar_archivo_completo(df, archivo_elegido):
+        if modo is not None:
+            print("\n🚀 PROCESANDO ARCHIVO COMO COMPLETO...")
+        if modo == '3':
+            exito = procesar_archivo_staging(ruta_csv, archivo_elegido, carga)
+        elif modo == '4':
+            exito = procesar_archivo_por_bloques(ruta_csv, archivo_elegido, pedir_tamano_bloque(), carga=carga)
+        elif modo is not None:
+            df = leer_archivo_completo(ruta_csv, archivo_elegido)
+            if df is None:
+                continue
+            if modo == '2':
+                exito = procesar_archivo_completo_masivo(df, archivo_elegido, carga)
+            elif modo == '5':
+                exito = procesar_archivo_paralelo(df, archivo_elegido, pedir_trabajadores(), carga)
+            else:
+                exito = procesar_archivo_completo(df, archivo_elegido, carga)
+        if exito:
             print(f"\n✅ [OK] '{archivo_elegido}' fue procesado completamente.")
         else:
             print(f"\n❌ [ERROR] Error al procesar '{archivo_elegido}' como archivo completo.")
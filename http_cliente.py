@@ -0,0 +1,193 @@
+import os
+import time
+import threading
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+
+# ========== CONFIGURACIÓN ==========
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+# Segundos para conectar y para esperar la respuesta, cuando el llamador no indica otro timeout
+TIMEOUT_POR_DEFECTO = (5, 15)
+# Conexiones keep-alive que se guardan por host (las tiendas conocidas tienen su propio pool)
+POOL_POR_HOST = {
+    'www.yapo.cl': 4,
+    'listado.mercadolibre.cl': 8,
+    'www.mercadolibre.cl': 4,
+    'www.paris.cl': 4,
+    'www.falabella.com': 4,
+    'randomuser.me': 4,
+}
+# Pool para cualquier otro host y cantidad de hosts distintos que se mantienen abiertos a la vez
+POOL_POR_DEFECTO = 4
+HOSTS_EN_CACHE = 20
+
+# ========== LIMITADOR POR HOST ==========
+# Balde de permisos por host cuya tasa (1 / demora) se ajusta como AutoThrottle:
+# demora objetivo = latencia / concurrencia objetivo, promediada con la demora anterior.
+# Segundos entre peticiones a un mismo host: al empezar, mínimo y máximo
+DEMORA_INICIAL = 0.25
+DEMORA_MINIMA = 0.05
+DEMORA_MAXIMA = 30.0
+# Peticiones en vuelo que se busca mantener por host: parte en 2 y sube de a 1 hasta su pool
+CONCURRENCIA_OBJETIVO_INICIAL = 2.0
+CONCURRENCIA_OBJETIVO_MINIMA = 1.0
+# Respuestas exitosas seguidas para subir en 1 la concurrencia objetivo
+EXITOS_PARA_SUBIR = 10
+# Tras un freno la demora no vuelve a bajar de la que fue frenada más un margen; ese piso se
+# relaja un poco con cada éxito para volver a probar, de a poco, un ritmo más alto
+MARGEN_TRAS_FRENO = 1.2
+RELAJACION_PISO = 0.005
+# Respuestas con las que el host pide bajar el ritmo: se reintentan tras la pausa
+ESTADOS_FRENO = (429, 503)
+REINTENTOS_POR_FRENO = 2
+# Tope para la pausa que pide el encabezado Retry-After (segundos)
+PAUSA_MAXIMA = 120.0
+
+# Sesión compartida por el proceso (se recrea si el proceso se bifurca: los sockets no se comparten)
+sesion = None
+pid_sesion = None
+# Estado del limitador por host (compartido por los hilos y por el motor asíncrono del proceso)
+limitador = {}
+candado_limitador = threading.Lock()
+
+def crear_sesion():
+    """Crea una sesión con pools de conexiones keep-alive por host y el User-Agent por defecto"""
+    nueva = requests.Session()
+    nueva.headers['User-Agent'] = USER_AGENT
+    por_defecto = HTTPAdapter(pool_connections=HOSTS_EN_CACHE, pool_maxsize=POOL_POR_DEFECTO)
+    nueva.mount('https://', por_defecto)
+    nueva.mount('http://', por_defecto)
+    for host, tamano in POOL_POR_HOST.items():
+        adaptador = HTTPAdapter(pool_connections=1, pool_maxsize=tamano)
+        nueva.mount(f'https://{host}', adaptador)
+        nueva.mount(f'http://{host}', adaptador)
+    return nueva
+
+def obtener_sesion():
+    """Devuelve la sesión HTTP compartida, creándola la primera vez en cada proceso"""
+    global sesion, pid_sesion
+    if sesion is None or pid_sesion != os.getpid():
+        sesion = crear_sesion()
+        pid_sesion = os.getpid()
+    return sesion
+
+def configurar_pool_host(url, tamano):
+    """Ajusta el pool de conexiones del host de una URL (por ejemplo para un servidor de pruebas)"""
+    partes = urlparse(url)
+    obtener_sesion().mount(f'{partes.scheme}://{partes.netloc}', HTTPAdapter(pool_connections=1, pool_maxsize=tamano))
+
+def limite_host(host):
+    """Conexiones simultáneas permitidas para un host (su pool de keep-alive)"""
+    return POOL_POR_HOST.get(host, POOL_POR_DEFECTO)
+
+def estado_host(host):
+    """Devuelve el estado del limitador de un host, creándolo la primera vez (llamar con el candado tomado)"""
+    if host not in limitador:
+        objetivo = min(CONCURRENCIA_OBJETIVO_INICIAL, limite_host(host))
+        limitador[host] = {
+            'demora': DEMORA_INICIAL,
+            'piso': DEMORA_MINIMA,
+            'objetivo': objetivo,
+            'permisos': objetivo,
+            'ultimo': time.monotonic(),
+            'exitos': 0,
+            'en_vuelo': 0,
+        }
+    return limitador[host]
+
+def tomar_cupo(host):
+    """Ocupa un cupo del host si sus peticiones en vuelo no llegan a la concurrencia objetivo; devuelve si lo tomó"""
+    with candado_limitador:
+        estado = estado_host(host)
+        if estado['en_vuelo'] >= max(1, int(estado['objetivo'])):
+            return False
+        estado['en_vuelo'] += 1
+        return True
+
+def liberar_cupo(host):
+    """Devuelve el cupo tomado con tomar_cupo"""
+    with candado_limitador:
+        estado = estado_host(host)
+        estado['en_vuelo'] = max(0, estado['en_vuelo'] - 1)
+
+def reservar_turno(host):
+    """Toma un permiso del balde del host y devuelve los segundos que hay que esperar antes de pedir"""
+    with candado_limitador:
+        estado = estado_host(host)
+        ahora = time.monotonic()
+        tasa = 1 / estado['demora']
+        # El balde guarda a lo más la concurrencia objetivo: es la ráfaga que se permite
+        if ahora > estado['ultimo']:
+            estado['permisos'] = min(max(1.0, estado['objetivo']), estado['permisos'] + (ahora - estado['ultimo']) * tasa)
+            estado['ultimo'] = ahora
+        estado['permisos'] -= 1
+        # Con el balde vacío el permiso queda reservado a futuro; 'ultimo' puede estar en el futuro tras una pausa
+        deuda = -estado['permisos'] / tasa if estado['permisos'] < 0 else 0.0
+        return max(0.0, estado['ultimo'] - ahora) + deuda
+
+def registrar_respuesta(host, codigo, latencia, pausa=None):
+    """Ajusta la demora y la concurrencia objetivo del host según la latencia y el código de la respuesta (None = falló)"""
+    with candado_limitador:
+        estado = estado_host(host)
+        if codigo in ESTADOS_FRENO:
+            # Las respuestas de peticiones que ya estaban en vuelo durante la pausa no vuelven a frenar
+            if time.monotonic() < estado['ultimo']:
+                return
+            # El host nos frena: se baja a la mitad la concurrencia, se dobla la demora y se vacía el balde
+            estado['piso'] = min(DEMORA_MAXIMA, max(estado['piso'], estado['demora']) * MARGEN_TRAS_FRENO)
+            estado['objetivo'] = max(CONCURRENCIA_OBJETIVO_MINIMA, estado['objetivo'] / 2)
+            estado['demora'] = min(DEMORA_MAXIMA, max(estado['demora'] * 2, latencia / estado['objetivo']))
+            estado['exitos'] = 0
+            estado['permisos'] = 0.0
+            pausa = min(PAUSA_MAXIMA, pausa) if pausa is not None else estado['demora']
+            estado['ultimo'] = max(estado['ultimo'], time.monotonic() + pausa)
+            return
+        nueva = min(DEMORA_MAXIMA, max(estado['piso'], (estado['demora'] + latencia / estado['objetivo']) / 2))
+        if codigo is None or codigo >= 400:
+            # Los errores nunca aceleran: solo pueden alargar la demora
+            estado['demora'] = max(estado['demora'], nueva)
+            estado['exitos'] = 0
+            return
+        estado['demora'] = nueva
+        estado['piso'] = max(DEMORA_MINIMA, estado['piso'] * (1 - RELAJACION_PISO))
+        estado['exitos'] += 1
+        if estado['exitos'] >= EXITOS_PARA_SUBIR:
+            estado['objetivo'] = min(float(limite_host(host)), estado['objetivo'] + 1)
+            estado['exitos'] = 0
+
+def segundos_retry_after(encabezados):
+    """Lee el encabezado Retry-After en segundos (None si no viene o trae una fecha)"""
+    valor = encabezados.get('Retry-After')
+    try:
+        return max(0.0, float(valor)) if valor is not None else None
+    except ValueError:
+        return None
+
+def obtener(url, timeout=None, limitar=True, **kwargs):
+    """GET con la sesión compartida: reutiliza la conexión al host, siempre aplica un timeout y respeta el limitador del host"""
+    if not limitar:
+        return obtener_sesion().get(url, timeout=timeout or TIMEOUT_POR_DEFECTO, **kwargs)
+    host = urlparse(url).netloc
+    for _ in range(REINTENTOS_POR_FRENO + 1):
+        espera = reservar_turno(host)
+        if espera > 0:
+            time.sleep(espera)
+        inicio = time.perf_counter()
+        try:
+            respuesta = obtener_sesion().get(url, timeout=timeout or TIMEOUT_POR_DEFECTO, **kwargs)
+        except requests.RequestException:
+            registrar_respuesta(host, None, time.perf_counter() - inicio)
+            raise
+        registrar_respuesta(host, respuesta.status_code, respuesta.elapsed.total_seconds(),
+                            segundos_retry_after(respuesta.headers))
+        if respuesta.status_code not in ESTADOS_FRENO:
+            break
+    return respuesta
+
+def cerrar_sesion():
+    """Cierra las conexiones abiertas de la sesión compartida"""
+    global sesion
+    if sesion is not None:
+        sesion.close()
+        sesion = None
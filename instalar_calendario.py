@@ -0,0 +1,81 @@
+import io
+import time
+from datetime import date
+import pandas as pd
+from sqlalchemy import text
+import models
+from calendario import (ANIO_INICIO_CALENDARIO, ANIO_FIN_CALENDARIO, SQL_ID_TIEMPO, COLUMNAS_TIEMPO,
+                        generar_calendario, filas_calendario)
+
+engine = models.engine
+
+def copiar_calendario(conn, calendario, tabla):
+    """Copia el calendario a una tabla con COPY dentro de la transacción de la conexión"""
+    buffer = io.StringIO()
+    calendario.to_csv(buffer, header=False, index=False)
+    buffer.seek(0)
+    columnas = ', '.join(f'"{col}"' for col in COLUMNAS_TIEMPO)
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(f'COPY {tabla} ({columnas}) FROM STDIN WITH (FORMAT csv)', buffer)
+    finally:
+        cursor.close()
+
+def instalar_calendario(anio_inicio=ANIO_INICIO_CALENDARIO, anio_fin=ANIO_FIN_CALENDARIO):
+    """Instala la dimensión tiempo pre-construida con claves AAAAMMDD y reapunta las ventas existentes"""
+    print(f"📅 INSTALACIÓN DEL CALENDARIO {anio_inicio}-{anio_fin}")
+    print("=" * 60)
+    inicio = time.perf_counter()
+    calendario = generar_calendario(anio_inicio, anio_fin)
+    clave = SQL_ID_TIEMPO.format(fecha='t.fecha')
+    indice_fecha = next(i for i in models.Tiempo.__table__.indexes if i.name == 'ux_tiempo_fecha')
+    # Una sola transacción: si algo falla la tabla tiempo queda como estaba
+    with engine.begin() as conn:
+        # Las fechas ya cargadas fuera del rango también pasan a clave AAAAMMDD
+        existentes = [fila[0] for fila in conn.execute(text("SELECT fecha FROM tiempo"))]
+        fuera = [f for f in existentes if not date(anio_inicio, 1, 1) <= f <= date(anio_fin, 12, 31)]
+        if fuera:
+            calendario = pd.concat([calendario, filas_calendario(fuera)], ignore_index=True)
+        conn.execute(text("CREATE TEMP TABLE calendario_nuevo (LIKE tiempo) ON COMMIT DROP"))
+        copiar_calendario(conn, calendario, 'calendario_nuevo')
+        # Mientras conviven la fila vieja y la nueva de una misma fecha no puede regir el índice único
+        conn.execute(text("DROP INDEX IF EXISTS ux_tiempo_fecha"))
+        nuevas = conn.execute(text("""
+            INSERT INTO tiempo (id_tiempo, fecha, dia, mes, "año", trimestre, festivo)
+            SELECT c.id_tiempo, c.fecha, c.dia, c.mes, c."año", c.trimestre, c.festivo
+            FROM calendario_nuevo c
+            WHERE NOT EXISTS (SELECT 1 FROM tiempo t WHERE t.id_tiempo = c.id_tiempo)
+        """)).rowcount
+        # Una reinstalación corrige los feriados de las fechas que ya tenían su clave
+        corregidas = conn.execute(text("""
+            UPDATE tiempo t SET festivo = c.festivo
+            FROM calendario_nuevo c
+            WHERE t.id_tiempo = c.id_tiempo AND t.festivo IS DISTINCT FROM c.festivo
+        """)).rowcount
+        reapuntadas = conn.execute(text(f"""
+            UPDATE ventas v SET id_tiempo = {clave}
+            FROM tiempo t
+            WHERE v.id_tiempo = t.id_tiempo AND t.id_tiempo <> {clave}
+        """)).rowcount
+        reemplazadas = conn.execute(text(f"DELETE FROM tiempo t WHERE t.id_tiempo <> {clave}")).rowcount
+        indice_fecha.create(conn)
+        conn.execute(text("ANALYZE tiempo"))
+    print(f"   ⏰ Días nuevos en el calendario: {nuevas:,}")
+    print(f"   🎉 Feriados corregidos: {corregidas:,}")
+    print(f"   🔁 Ventas reapuntadas a la clave AAAAMMDD: {reapuntadas:,}")
+    print(f"   🗑️ Registros de tiempo con clave antigua reemplazados: {reemplazadas:,}")
+    print(f"   📆 Feriados en el rango: {int(calendario['festivo'].sum()):,} de {len(calendario):,} días")
+    print(f"\n🎉 Calendario instalado en {time.perf_counter() - inicio:.2f} s")
+
+def pedir_anio(mensaje, por_defecto):
+    """Pide un año (Enter = valor por defecto)"""
+    respuesta = input(f"{mensaje} (Enter = {por_defecto}): ").strip()
+    return int(respuesta) if respuesta.isdigit() else por_defecto
+
+if __name__ == "__main__":
+    anio_inicio = pedir_anio("📅 Año inicial del calendario", ANIO_INICIO_CALENDARIO)
+    anio_fin = pedir_anio("📅 Año final del calendario", ANIO_FIN_CALENDARIO)
+    if anio_fin < anio_inicio:
+        print("❌ El año final debe ser mayor o igual al inicial")
+    else:
+        instalar_calendario(anio_inicio, anio_fin)
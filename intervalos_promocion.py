@@ -0,0 +1,73 @@
+import numpy as np
+
+# Índice de vigencia de promociones: un bitmap día × promoción sobre el calendario cubierto
+# por las promociones, más la lista de promociones activas de cada día en formato CSR.
+# Responder "¿qué promociones están activas el día D?" es O(1) (un tramo del arreglo).
+
+def a_dias(fechas):
+    """Convierte fechas (date, texto ISO o datetime64) a un arreglo datetime64[D]; NaT si no se puede"""
+    return np.asarray(fechas, dtype='datetime64[D]')
+
+def construir_indice_promociones(promociones):
+    """Arma el índice de vigencia a partir de dicts con id_promocion, fecha_inicio y fecha_fin"""
+    promociones = list(promociones)
+    ids = np.array([p['id_promocion'] for p in promociones], dtype=np.int64)
+    inicio = a_dias([p['fecha_inicio'] for p in promociones])
+    fin = a_dias([p['fecha_fin'] for p in promociones])
+    # Una promoción sin fecha de inicio o de fin queda en el índice, pero nunca está activa
+    validas = ~(np.isnat(inicio) | np.isnat(fin))
+    if not validas.any():
+        dia_base = np.datetime64('1970-01-01', 'D')
+        bitmap = np.zeros((0, len(promociones)), dtype=bool)
+    else:
+        dia_base = inicio[validas].min()
+        dias = int((fin[validas].max() - dia_base).astype(np.int64)) + 1
+        calendario = dia_base + np.arange(max(dias, 0))
+        bitmap = (inicio[None, :] <= calendario[:, None]) & (calendario[:, None] <= fin[None, :]) & validas[None, :]
+    conteo = bitmap.sum(axis=1)
+    return {
+        'dia_base': dia_base,
+        'ids': ids,
+        'columna': {id_promocion: i for i, id_promocion in enumerate(ids.tolist())},
+        'bitmap': bitmap,
+        'conteo': conteo,
+        'desde': np.concatenate(([0], np.cumsum(conteo)[:-1])).astype(np.int64),
+        'activas': ids[np.nonzero(bitmap)[1]],
+    }
+
+def posiciones_dias(indice, fechas):
+    """Devuelve la fila del bitmap de cada fecha (-1 si la fecha queda fuera del calendario o es nula)"""
+    dias = a_dias(fechas)
+    posiciones = (dias - indice['dia_base']).astype(np.int64)
+    fuera = np.isnat(dias) | (posiciones < 0) | (posiciones >= len(indice['bitmap']))
+    return np.where(fuera, -1, posiciones)
+
+def promociones_activas(indice, fecha):
+    """Lista los ids de las promociones activas en una fecha"""
+    posicion = int(posiciones_dias(indice, [fecha])[0])
+    if posicion < 0:
+        return []
+    desde = indice['desde'][posicion]
+    return indice['activas'][desde:desde + indice['conteo'][posicion]].tolist()
+
+def elegir_activas(indice, fechas, aleatorios):
+    """Elige al azar una promoción activa por fecha usando aleatorios en [0, 1); -1 si no hay ninguna"""
+    posiciones = posiciones_dias(indice, fechas)
+    if not len(indice['conteo']):
+        return np.full(len(posiciones), -1, dtype=np.int64)
+    validas = np.maximum(posiciones, 0)
+    conteo = np.where(posiciones >= 0, indice['conteo'][validas], 0)
+    elegidas = np.full(len(posiciones), -1, dtype=np.int64)
+    hay = conteo > 0
+    salto = (np.asarray(aleatorios)[hay] * conteo[hay]).astype(np.int64)
+    elegidas[hay] = indice['activas'][indice['desde'][validas[hay]] + salto]
+    return elegidas
+
+def esta_vigente(indice, ids_promocion, fechas):
+    """Indica, por par (promoción, fecha), si la promoción estaba activa en esa fecha"""
+    columnas = np.array([indice['columna'].get(i, -1) for i in ids_promocion], dtype=np.int64)
+    posiciones = posiciones_dias(indice, fechas)
+    vigente = np.zeros(len(columnas), dtype=bool)
+    hay = (columnas >= 0) & (posiciones >= 0)
+    vigente[hay] = indice['bitmap'][posiciones[hay], columnas[hay]]
+    return vigente
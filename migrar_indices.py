@@ -0,0 +1,74 @@
+import time
+from sqlalchemy import text
+import models
+
+engine = models.engine
+
+# Dimensiones con clave natural única: (tabla, columna_id, columnas_clave)
+CLAVES_NATURALES = [
+    ('direccion', 'id_direccion', ['calle']),
+    ('promocion', 'id_promocion', ['tipo_promocion', 'fecha_inicio', 'fecha_fin']),
+    ('productos', 'id_producto', ['nombre', 'id_tienda']),
+    ('tiempo', 'id_tiempo', ['fecha']),
+]
+
+def referencias_a(tabla):
+    """Devuelve las columnas (tabla, columna) que apuntan con llave foránea a una tabla"""
+    return [
+        (fk.parent.table.name, fk.parent.name)
+        for tabla_ref in models.Base.metadata.sorted_tables
+        for fk in tabla_ref.foreign_keys
+        if fk.column.table.name == tabla
+    ]
+
+def fusionar_duplicados(conn, tabla, columna_id, columnas_clave):
+    """Deja una sola fila por clave natural (la de menor id) y redirige las referencias a ella"""
+    columnas = ', '.join(f'"{col}"' for col in columnas_clave)
+    no_nulas = ' AND '.join(f'"{col}" IS NOT NULL' for col in columnas_clave)
+    conn.execute(text("DROP TABLE IF EXISTS mapa_duplicados"))
+    conn.execute(text(f"""
+        CREATE TEMP TABLE mapa_duplicados AS
+        SELECT id_viejo, id_conservado FROM (
+            SELECT {columna_id} AS id_viejo,
+                   MIN({columna_id}) OVER (PARTITION BY {columnas}) AS id_conservado
+            FROM {tabla}
+            WHERE {no_nulas}
+        ) t
+        WHERE id_viejo <> id_conservado
+    """))
+    for tabla_ref, columna_ref in referencias_a(tabla):
+        conn.execute(text(f"""
+            UPDATE {tabla_ref} r SET {columna_ref} = m.id_conservado
+            FROM mapa_duplicados m WHERE r.{columna_ref} = m.id_viejo
+        """))
+    borradas = conn.execute(text(f"""
+        DELETE FROM {tabla} t USING mapa_duplicados m WHERE t.{columna_id} = m.id_viejo
+    """)).rowcount
+    conn.execute(text("DROP TABLE mapa_duplicados"))
+    return borradas
+
+def migrar_indices():
+    """Fusiona duplicados de claves naturales y crea los índices declarados en models.py que falten"""
+    print("🛠️ MIGRACIÓN DE ÍNDICES")
+    print("=" * 60)
+    inicio = time.perf_counter()
+    # Una sola transacción: si un índice no se puede crear no queda nada a medias
+    with engine.begin() as conn:
+        for tabla, columna_id, columnas_clave in CLAVES_NATURALES:
+            borradas = fusionar_duplicados(conn, tabla, columna_id, columnas_clave)
+            print(f"   🔁 {tabla}: {borradas:,} duplicados fusionados")
+        for tabla in models.Base.metadata.sorted_tables:
+            for indice in sorted(tabla.indexes, key=lambda i: i.name):
+                existe = conn.execute(
+                    text("SELECT to_regclass(:nombre) IS NOT NULL"), {'nombre': indice.name}
+                ).scalar()
+                if existe:
+                    continue
+                indice.create(conn)
+                print(f"   ✅ Índice creado: {indice.name}")
+        for tabla in models.Base.metadata.sorted_tables:
+            conn.execute(text(f"ANALYZE {tabla.name}"))
+    print(f"\n🎉 Migración terminada en {time.perf_counter() - inicio:.2f} s")
+
+if __name__ == "__main__":
+    migrar_indices()
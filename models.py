@@ -1,5 +1,5 @@
 import os
-from sqlalchemy import Column, Integer, String, Text, create_engine, ForeignKey, Numeric, Date, Boolean
+from sqlalchemy import Column, Integer, BigInteger, Float, String, Text, create_engine, ForeignKey, Numeric, Date, DateTime, Boolean, Index, func, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from dotenv import load_dotenv
@@ -33,6 +33,9 @@ class Direccion(Base):
     ciudad = Column(String(50), nullable=False)
     region = Column(String(50), nullable=False)
     
+    # Clave natural usada por el cargador
+    __table_args__ = (Index('ux_direccion_calle', 'calle', unique=True),)
+    
     # Relaciones
     tiendas = relationship("Tienda", back_populates="direccion_rel")
 
@@ -62,6 +65,9 @@ class Producto(Base):
     preciofinal = Column(Numeric(10, 2), nullable=True)
     id_tienda = Column(Integer, ForeignKey('tienda.id_tienda'), nullable=True)
     
+    # Clave natural usada por el cargador
+    __table_args__ = (Index('ux_productos_nombre_tienda', 'nombre', 'id_tienda', unique=True),)
+    
     # Relaciones
     tienda = relationship("Tienda", back_populates="productos")
     ventas = relationship("Venta", back_populates="producto")
@@ -75,6 +81,9 @@ class Promocion(Base):
     fecha_inicio = Column(Date, nullable=False)
     fecha_fin = Column(Date, nullable=False)
     
+    # Clave natural usada por el cargador
+    __table_args__ = (Index('ux_promocion_tipo_fechas', 'tipo_promocion', 'fecha_inicio', 'fecha_fin', unique=True),)
+    
     # Relaciones
     productos = relationship("Producto", back_populates="promocion_rel")
     ventas = relationship("Venta", back_populates="promocion")
@@ -90,6 +99,9 @@ class Tiempo(Base):
     trimestre = Column(Integer, nullable=False)
     festivo = Column(Boolean, nullable=False, default=False)
     
+    # Clave natural usada por el cargador
+    __table_args__ = (Index('ux_tiempo_fecha', 'fecha', unique=True),)
+    
     # Relaciones
     ventas = relationship("Venta", back_populates="tiempo")
 
@@ -97,11 +109,11 @@ class Venta(Base):
     __tablename__ = 'ventas'
     
     id_venta = Column(Integer, primary_key=True, autoincrement=True)
-    id_usuario = Column(Integer, ForeignKey('usuarios.id_usuario'), nullable=False)
-    id_producto = Column(Integer, ForeignKey('productos.id_producto'), nullable=False)
-    id_tienda = Column(Integer, ForeignKey('tienda.id_tienda'), nullable=False)
-    id_tiempo = Column(Integer, ForeignKey('tiempo.id_tiempo'), nullable=False)
-    id_promocion = Column(Integer, ForeignKey('promocion.id_promocion'), nullable=True)
+    id_usuario = Column(Integer, ForeignKey('usuarios.id_usuario'), nullable=False, index=True)
+    id_producto = Column(Integer, ForeignKey('productos.id_producto'), nullable=False, index=True)
+    id_tienda = Column(Integer, ForeignKey('tienda.id_tienda'), nullable=False, index=True)
+    id_tiempo = Column(Integer, ForeignKey('tiempo.id_tiempo'), nullable=False, index=True)
+    id_promocion = Column(Integer, ForeignKey('promocion.id_promocion'), nullable=True, index=True)
     cantidad_vendida = Column(Integer, nullable=False)
     precio_unitario = Column(Numeric(10, 2), nullable=False)
     descuento_unitario = Column(Numeric(10, 2), nullable=False)
@@ -117,6 +129,30 @@ class Venta(Base):
     tiempo = relationship("Tiempo", back_populates="ventas")
     promocion = relationship("Promocion", back_populates="ventas")
 
+class CargaArchivo(Base):
+    """Manifiesto de cargas: avance de cada archivo (se actualiza en la misma transacción que sus datos)"""
+    __tablename__ = 'carga_archivo'
+    
+    id_carga = Column(Integer, primary_key=True, autoincrement=True)
+    nombre_archivo = Column(String(255), nullable=False)
+    hash_contenido = Column(String(64), nullable=False, unique=True)
+    tamano = Column(BigInteger, nullable=False)
+    fecha_modificacion = Column(Float, nullable=False)
+    filas_procesadas = Column(Integer, nullable=False, default=0)
+    filas_rechazadas = Column(Integer, nullable=False, default=0)
+    estado = Column(String(20), nullable=False, default='en_progreso')
+    # Filas por partición de la carga paralela: las que se retoman deben partir en los mismos tramos
+    tamano_particion = Column(Integer, nullable=True)
+    fecha_actualizacion = Column(DateTime, nullable=False, server_default=func.now())
+
+class CargaParticion(Base):
+    """Particiones de ventas ya confirmadas por la carga paralela de un archivo (se registran en la transacción de cada partición)"""
+    __tablename__ = 'carga_particion'
+    
+    id_carga = Column(Integer, ForeignKey('carga_archivo.id_carga', ondelete='CASCADE'), primary_key=True)
+    fila_inicio = Column(Integer, primary_key=True)
+    filas = Column(Integer, nullable=False)
+
 # Crear la conexión a PostgreSQL usando variables de entorno
 DB_USER = os.getenv('DB_USER', 'postgres')
 DB_PASSWORD = os.getenv('DB_PASSWORD', 'tu_contraseña')
@@ -129,3 +165,7 @@ engine = create_engine(DATABASE_URL)
 
 # Crear las tablas (si no existen, no hace nada)
 Base.metadata.create_all(engine)
+
+# Columnas agregadas a tablas que ya existían (create_all no modifica tablas existentes)
+with engine.begin() as conn:
+    conn.execute(text("ALTER TABLE carga_archivo ADD COLUMN IF NOT EXISTS tamano_particion INTEGER"))
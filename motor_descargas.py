@@ -0,0 +1,173 @@
+import os
+import time
+import asyncio
+import importlib.util
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+from concurrent.futures import ProcessPoolExecutor
+from http_cliente import (USER_AGENT, TIMEOUT_POR_DEFECTO, ESTADOS_FRENO, REINTENTOS_POR_FRENO,
+                          tomar_cupo, liberar_cupo, reservar_turno, registrar_respuesta, segundos_retry_after)
+
+# ========== CONFIGURACIÓN ==========
+# Descargas en vuelo a la vez entre todos los hosts (cada host además se limita a su concurrencia objetivo en http_cliente)
+MAX_DESCARGAS_SIMULTANEAS = 32
+# Procesos que parsean el HTML mientras el bucle de eventos sigue descargando
+PROCESOS_PARSEO = os.cpu_count() or 1
+# Páginas de una misma búsqueda que se piden por adelantado y tope de páginas por búsqueda
+VENTANA_PAGINAS = 3
+MAX_PAGINAS = 20
+
+def motor_disponible():
+    """Indica si está instalado aiohttp para descargar de forma asíncrona"""
+    return importlib.util.find_spec('aiohttp') is not None
+
+@asynccontextmanager
+async def cupo_host(motor, host):
+    """Espera a que el host tenga menos peticiones en vuelo que su concurrencia objetivo actual y ocupa un cupo"""
+    if host not in motor['cupos_host']:
+        motor['cupos_host'][host] = asyncio.Condition()
+    condicion = motor['cupos_host'][host]
+    async with condicion:
+        await condicion.wait_for(lambda: tomar_cupo(host))
+    try:
+        yield
+    finally:
+        liberar_cupo(host)
+        # El objetivo pudo subir con la última respuesta: se despierta a todos para que lo vuelvan a mirar
+        async with condicion:
+            condicion.notify_all()
+
+async def descargar(motor, url, headers):
+    """Descarga una URL respetando la concurrencia objetivo de su host, su limitador y el límite global; devuelve (estado, html)"""
+    host = urlparse(url).netloc
+    for _ in range(REINTENTOS_POR_FRENO + 1):
+        # Primero el cupo del host: una tienda lenta no acapara los cupos globales mientras espera
+        async with cupo_host(motor, host):
+            espera = reservar_turno(host)
+            if espera > 0:
+                await asyncio.sleep(espera)
+            async with motor['semaforo_global']:
+                inicio = time.perf_counter()
+                try:
+                    async with motor['sesion'].get(url, headers=headers) as respuesta:
+                        latencia = time.perf_counter() - inicio
+                        html = await respuesta.text(errors='replace')
+                except Exception:
+                    registrar_respuesta(host, None, time.perf_counter() - inicio)
+                    raise
+            # La respuesta se registra antes de soltar el cupo, para que quien espera vea el objetivo nuevo
+            registrar_respuesta(host, respuesta.status, latencia, segundos_retry_after(respuesta.headers))
+        if respuesta.status not in ESTADOS_FRENO:
+            break
+    return respuesta.status, html
+
+async def parsear(motor, tarea, html):
+    """Parsea el HTML en el pool de procesos, que se crea al primer uso; con un solo proceso parsea aquí mismo"""
+    argumentos = tarea.get('argumentos', ())
+    if motor['procesos'] <= 1:
+        return tarea['parsear'](html, *argumentos)
+    if motor['ejecutor'] is None:
+        motor['ejecutor'] = ProcessPoolExecutor(max_workers=motor['procesos'])
+    bucle = asyncio.get_running_loop()
+    return await bucle.run_in_executor(motor['ejecutor'], tarea['parsear'], html, *argumentos)
+
+async def procesar_tarea(motor, tarea):
+    """Descarga la página de una tarea y la parsea en el pool de procesos; nunca lanza excepciones"""
+    resultado = {'url': tarea['url'], 'estado': None, 'segundos': None, 'resultado': None, 'error': None}
+    inicio = time.perf_counter()
+    try:
+        estado, html = await descargar(motor, tarea['url'], tarea.get('headers'))
+        resultado['estado'] = estado
+        resultado['segundos'] = time.perf_counter() - inicio
+        if estado >= 400:
+            resultado['error'] = f"HTTP {estado}"
+            return resultado
+        resultado['resultado'] = await parsear(motor, tarea, html)
+    except Exception as e:
+        resultado['error'] = str(e) or type(e).__name__
+        if resultado['segundos'] is None:
+            resultado['segundos'] = time.perf_counter() - inicio
+    return resultado
+
+async def procesar_paginas(motor, busqueda):
+    """Pide las páginas de una búsqueda con hasta 'ventana' en vuelo y las entrega en orden hasta que 'continuar' diga basta"""
+    ventana = busqueda.get('ventana', VENTANA_PAGINAS)
+    max_paginas = busqueda.get('max_paginas', MAX_PAGINAS)
+    en_vuelo = {}
+    siguiente = 1
+    paginas = []
+    inicio = time.perf_counter()
+    try:
+        for numero in range(1, max_paginas + 1):
+            # Mientras se parsea una página, las siguientes de la ventana ya se están descargando
+            while siguiente <= max_paginas and len(en_vuelo) < ventana:
+                en_vuelo[siguiente] = asyncio.ensure_future(procesar_tarea(motor, busqueda['tarea_de_pagina'](siguiente)))
+                siguiente += 1
+            resultado = await en_vuelo.pop(numero)
+            resultado['pagina'] = numero
+            paginas.append(resultado)
+            if not busqueda['continuar'](resultado):
+                break
+    finally:
+        # Las páginas adelantadas que ya no se necesitan se descartan
+        for pendiente in en_vuelo.values():
+            pendiente.cancel()
+        await asyncio.gather(*en_vuelo.values(), return_exceptions=True)
+    return {'paginas': paginas, 'segundos': time.perf_counter() - inicio}
+
+@asynccontextmanager
+async def abrir_motor(max_simultaneas=MAX_DESCARGAS_SIMULTANEAS, procesos=PROCESOS_PARSEO):
+    """Abre la sesión aiohttp y los semáforos que comparten todas las tareas; el pool de parseo se crea si hace falta"""
+    import aiohttp
+    conectar, leer = TIMEOUT_POR_DEFECTO
+    timeout = aiohttp.ClientTimeout(sock_connect=conectar, sock_read=leer)
+    conector = aiohttp.TCPConnector(limit=max_simultaneas, limit_per_host=0)
+    motor = {
+        'ejecutor': None,
+        'procesos': procesos,
+        'semaforo_global': asyncio.Semaphore(max_simultaneas),
+        'cupos_host': {},
+    }
+    try:
+        async with aiohttp.ClientSession(connector=conector, timeout=timeout, headers={'User-Agent': USER_AGENT}) as sesion:
+            motor['sesion'] = sesion
+            yield motor
+    finally:
+        if motor['ejecutor'] is not None:
+            motor['ejecutor'].shutdown()
+
+async def ejecutar_tareas(tareas, max_simultaneas=MAX_DESCARGAS_SIMULTANEAS, procesos=PROCESOS_PARSEO):
+    """Ejecuta todas las tareas a la vez con una sola sesión aiohttp y un pool de procesos de parseo"""
+    # No se levantan más procesos que tareas: con una sola se parsea sin pool
+    async with abrir_motor(max_simultaneas, min(procesos, len(tareas))) as motor:
+        return await asyncio.gather(*(procesar_tarea(motor, tarea) for tarea in tareas))
+
+async def ejecutar_busquedas_paginadas(busquedas, max_simultaneas=MAX_DESCARGAS_SIMULTANEAS, procesos=PROCESOS_PARSEO):
+    """Recorre las páginas de todas las búsquedas a la vez, compartiendo sesión, límites y pool de parseo"""
+    # Nunca hay más páginas en vuelo que la suma de las ventanas (ni que el tope de páginas de cada búsqueda)
+    en_vuelo = sum(min(busqueda.get('ventana', VENTANA_PAGINAS), busqueda.get('max_paginas', MAX_PAGINAS)) for busqueda in busquedas)
+    async with abrir_motor(max_simultaneas, min(procesos, en_vuelo)) as motor:
+        return await asyncio.gather(*(procesar_paginas(motor, busqueda) for busqueda in busquedas))
+
+def descargar_y_parsear(tareas, max_simultaneas=MAX_DESCARGAS_SIMULTANEAS, procesos=PROCESOS_PARSEO):
+    """Descarga y parsea una lista de tareas de forma concurrente y devuelve sus resultados en el mismo orden.
+
+    Cada tarea es un dict con 'url', 'parsear' (función de nivel de módulo que recibe el HTML) y
+    opcionalmente 'headers' y 'argumentos' (argumentos extra para 'parsear'). Cada resultado trae
+    'url', 'estado', 'segundos' (latencia de la descarga), 'resultado' y 'error'.
+    """
+    if not tareas:
+        return []
+    return asyncio.run(ejecutar_tareas(tareas, max_simultaneas, procesos))
+
+def descargar_paginas(busquedas, max_simultaneas=MAX_DESCARGAS_SIMULTANEAS, procesos=PROCESOS_PARSEO):
+    """Recorre varias búsquedas paginadas de forma concurrente y devuelve, por búsqueda, sus páginas y su duración.
+
+    Cada búsqueda es un dict con 'tarea_de_pagina' (número de página desde 1 -> tarea como en
+    descargar_y_parsear), 'continuar' (recibe el resultado de cada página, en orden, y devuelve
+    False para dejar de pedir páginas) y opcionalmente 'ventana' y 'max_paginas'. Cada recorrido
+    devuelto trae 'paginas' (los resultados de las páginas usadas, con 'pagina') y 'segundos'.
+    """
+    if not busquedas:
+        return []
+    return asyncio.run(ejecutar_busquedas_paginadas(busquedas, max_simultaneas, procesos))
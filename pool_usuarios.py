@@ -0,0 +1,137 @@
+import os
+import gzip
+import json
+import random
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from http_cliente import obtener
+
+# ========== CONFIGURACIÓN ==========
+CARPETA = "archivos"
+URL_RANDOMUSER = "https://randomuser.me/api/"
+# Máximo de usuarios que entrega la API por llamada
+TAMANO_PAGINA_RANDOMUSER = 5000
+MAX_DESCARGAS_CONCURRENTES = 4
+TIMEOUT_RANDOMUSER = 30
+
+# ========== DATOS PARA EL GENERADOR SINTÉTICO (sin red) ==========
+NOMBRES_MASCULINOS = ['Juan', 'Pedro', 'Diego', 'Matías', 'Benjamín', 'Vicente', 'Tomás', 'Felipe', 'Martín', 'Sebastián',
+                      'Cristóbal', 'Joaquín', 'Lucas', 'Agustín', 'Nicolás', 'José', 'Luis', 'Carlos', 'Jorge', 'Francisco']
+NOMBRES_FEMENINOS = ['María', 'Sofía', 'Isidora', 'Florencia', 'Catalina', 'Valentina', 'Antonella', 'Josefa', 'Martina', 'Fernanda',
+                     'Camila', 'Javiera', 'Constanza', 'Francisca', 'Daniela', 'Carolina', 'Paula', 'Andrea', 'Gabriela', 'Ana']
+APELLIDOS = ['González', 'Muñoz', 'Rojas', 'Díaz', 'Pérez', 'Soto', 'Contreras', 'Silva', 'Martínez', 'Sepúlveda',
+             'Morales', 'Rodríguez', 'López', 'Fuentes', 'Hernández', 'Torres', 'Araya', 'Flores', 'Espinoza', 'Valenzuela',
+             'Castillo', 'Tapia', 'Reyes', 'Gutiérrez', 'Castro', 'Pizarro', 'Álvarez', 'Vásquez', 'Sánchez', 'Fernández']
+CIUDADES = ['Santiago', 'Valparaíso', 'Concepción', 'La Serena', 'Antofagasta', 'Temuco', 'Rancagua', 'Talca',
+            'Arica', 'Iquique', 'Puerto Montt', 'Chillán', 'Osorno', 'Valdivia', 'Punta Arenas']
+
+def ruta_pool(nacionalidad):
+    """Devuelve la ruta del pool comprimido de una nacionalidad ('todas' si no se filtra)"""
+    return os.path.join(CARPETA, f"pool_usuarios_{nacionalidad or 'todas'}.json.gz")
+
+def cargar_pool(nacionalidad):
+    """Lee el pool guardado de una nacionalidad (lista vacía si no existe)"""
+    ruta = ruta_pool(nacionalidad)
+    if not os.path.exists(ruta):
+        return []
+    with gzip.open(ruta, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+def guardar_pool(nacionalidad, usuarios):
+    """Guarda el pool comprimido reemplazando el archivo de una vez (nunca queda a medio escribir)"""
+    os.makedirs(CARPETA, exist_ok=True)
+    ruta = ruta_pool(nacionalidad)
+    temporal = f"{ruta}.tmp"
+    with gzip.open(temporal, 'wt', encoding='utf-8') as f:
+        json.dump(usuarios, f, ensure_ascii=False)
+    os.replace(temporal, ruta)
+
+def normalizar_usuario(user):
+    """Convierte un resultado de RandomUser al formato del pool"""
+    return {
+        "nombre": user["name"]["first"],
+        "apellido": user["name"]["last"],
+        "email": user["email"],
+        "edad": int(user["dob"]["age"]),
+        "sexo": "Masculino" if user["gender"] == "male" else "Femenino",
+        "ciudad": user["location"]["city"],
+    }
+
+def descargar_pagina(pagina, cantidad, nacionalidad, semilla):
+    """Descarga una página de RandomUser (la semilla hace que páginas distintas no se repitan)"""
+    parametros = {'results': cantidad, 'page': pagina, 'seed': semilla}
+    if nacionalidad:
+        parametros['nat'] = nacionalidad
+    response = obtener(URL_RANDOMUSER, params=parametros, timeout=TIMEOUT_RANDOMUSER)
+    response.raise_for_status()
+    return [normalizar_usuario(user) for user in response.json()["results"]]
+
+def descargar_usuarios(cantidad, nacionalidad, semilla):
+    """Descarga usuarios en páginas de TAMANO_PAGINA_RANDOMUSER con varias llamadas concurrentes"""
+    paginas = -(-cantidad // TAMANO_PAGINA_RANDOMUSER)
+    tamanos = [min(TAMANO_PAGINA_RANDOMUSER, cantidad - i * TAMANO_PAGINA_RANDOMUSER) for i in range(paginas)]
+    descargados = []
+    errores = []
+    with ThreadPoolExecutor(max_workers=MAX_DESCARGAS_CONCURRENTES) as ejecutor:
+        futuros = [ejecutor.submit(descargar_pagina, i + 1, tamano, nacionalidad, semilla) for i, tamano in enumerate(tamanos)]
+        for futuro in futuros:
+            try:
+                descargados.extend(futuro.result())
+            except (requests.RequestException, ValueError, KeyError) as e:
+                errores.append(e)
+    if errores:
+        print(f"⚠️ {len(errores)} de {paginas} páginas de RandomUser fallaron (primer error: {errores[0]})")
+    return descargados
+
+def sin_tildes(texto):
+    """Quita tildes y eñes para armar emails ASCII"""
+    return unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode()
+
+def generar_usuarios_sinteticos(cantidad, semilla=None, inicio=0):
+    """Genera usuarios ficticios sin red; con la misma semilla entrega siempre los mismos"""
+    rng = random.Random(semilla)
+    usuarios = []
+    for i in range(inicio, inicio + cantidad):
+        sexo = rng.choice(["Masculino", "Femenino"])
+        nombre = rng.choice(NOMBRES_MASCULINOS if sexo == "Masculino" else NOMBRES_FEMENINOS)
+        apellido = rng.choice(APELLIDOS)
+        usuarios.append({
+            "nombre": nombre,
+            "apellido": apellido,
+            # El correlativo garantiza emails únicos dentro de la tanda sintética
+            "email": sin_tildes(f"{nombre}.{apellido}.{i}@sintetico.example".lower()),
+            "edad": rng.randint(18, 80),
+            "sexo": sexo,
+            "ciudad": rng.choice(CIUDADES),
+        })
+    return usuarios
+
+def obtener_usuarios(cantidad, nacionalidad=None, semilla=None):
+    """Entrega `cantidad` usuarios distintos desde el pool local, descargando solo lo que falte.
+
+    Lo descargado se agrega al pool (sin emails repetidos) para no volver a pedirlo. Si la red
+    falla, el faltante se completa con el generador sintético.
+    """
+    pool = cargar_pool(nacionalidad)
+    if len(pool) < cantidad:
+        faltantes = cantidad - len(pool)
+        print(f"🌐 Pool local con {len(pool):,} usuarios: descargando {faltantes:,} desde RandomUser...")
+        emails = {u['email'] for u in pool}
+        nuevos = []
+        # Semilla distinta por tanda para no recibir otra vez las mismas páginas
+        for usuario in descargar_usuarios(faltantes, nacionalidad, f"pool-{nacionalidad or 'todas'}-{len(pool)}"):
+            if usuario['email'] not in emails:
+                emails.add(usuario['email'])
+                nuevos.append(usuario)
+        if nuevos:
+            pool.extend(nuevos)
+            guardar_pool(nacionalidad, pool)
+            print(f"💾 {len(nuevos):,} usuarios agregados al pool ({ruta_pool(nacionalidad)})")
+    if len(pool) < cantidad:
+        faltantes = cantidad - len(pool)
+        print(f"🧪 Sin red suficiente: generando {faltantes:,} usuarios sintéticos")
+        return pool + generar_usuarios_sinteticos(faltantes, semilla, inicio=len(pool))
+    if len(pool) == cantidad:
+        return list(pool)
+    return random.Random(semilla).sample(pool, cantidad)
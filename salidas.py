@@ -0,0 +1,225 @@
+import os
+import importlib.util
+import pandas as pd
+
+# ========== CONFIGURACIÓN ==========
+# Formatos de salida disponibles para los archivos generados
+FORMATOS_SALIDA = {
+    '1': 'csv',
+    '2': 'parquet',
+}
+# Sobre esta cantidad de filas el Excel se omite aunque se haya pedido (openpyxl es muy lento en archivos grandes)
+MAX_FILAS_EXCEL = 100000
+# Filas de datos por hoja de Excel: el formato admite 1.048.576 filas y una es el encabezado
+MAX_FILAS_HOJA_EXCEL = 1048576 - 1
+
+def parquet_disponible():
+    """Indica si está instalado pyarrow para escribir y leer Parquet"""
+    return importlib.util.find_spec('pyarrow') is not None
+
+def pedir_formato_salida():
+    """Pregunta el formato de salida (Enter = CSV) y si se quiere además un Excel"""
+    print("\n💾 FORMATO DE SALIDA:")
+    print("1. CSV (UTF-8)")
+    print("2. Parquet (columnar, comprimido)")
+    opcion = input("Selecciona el formato (1-2, Enter = 1): ").strip() or '1'
+    formato = FORMATOS_SALIDA.get(opcion, 'csv')
+    excel = input(f"📊 ¿Generar también Excel? (s = hasta {MAX_FILAS_EXCEL:,} filas, t = todas en varias hojas, n = no): ").strip().lower()
+    if excel in ['t', 'todo', 'todas']:
+        return formato, 'completo'
+    return formato, excel in ['s', 'si', 'sí', 'y', 'yes']
+
+def guardar_parquet(df, ruta):
+    """Escribe un Parquet con codificación por diccionario en las columnas de texto"""
+    columnas_texto = [col for col in df.columns if df[col].dtype == object]
+    # Parquet exige un tipo por columna: las columnas con valores mezclados se guardan como texto
+    mezcladas = [col for col in columnas_texto if pd.api.types.infer_dtype(df[col], skipna=True).startswith('mixed')]
+    if mezcladas:
+        df = df.copy()
+        for col in mezcladas:
+            df[col] = df[col].map(lambda valor: None if pd.isna(valor) else str(valor))
+    df.to_parquet(ruta, index=False, engine='pyarrow', compression='snappy', use_dictionary=columnas_texto)
+
+def guardar_dataframe(df, carpeta, nombre_archivo, formato='csv', excel=False):
+    """Guarda un DataFrame en el formato pedido y, opcionalmente, en Excel; devuelve las rutas escritas"""
+    os.makedirs(carpeta, exist_ok=True)
+    rutas = []
+    if formato == 'parquet' and not parquet_disponible():
+        print("⚠️ pyarrow no está instalado: se guarda en CSV (pip install pyarrow)")
+        formato = 'csv'
+    if formato == 'parquet':
+        ruta = os.path.join(carpeta, f"{nombre_archivo}.parquet")
+        guardar_parquet(df, ruta)
+    else:
+        ruta = os.path.join(carpeta, f"{nombre_archivo}.csv")
+        df.to_csv(ruta, index=False, encoding="utf-8-sig")
+    rutas.append(ruta)
+    if excel:
+        rutas += guardar_excel(df, carpeta, nombre_archivo, sin_limite=excel == 'completo')
+    return rutas
+
+def guardar_excel(df, carpeta, nombre_archivo, sin_limite=False):
+    """Guarda el DataFrame en Excel salvo que supere MAX_FILAS_EXCEL (o siempre con sin_limite); devuelve las rutas escritas"""
+    if len(df) > MAX_FILAS_EXCEL and not sin_limite:
+        print(f"⚠️ Excel omitido: {len(df):,} filas superan el máximo de {MAX_FILAS_EXCEL:,}")
+        return []
+    ruta_excel = os.path.join(carpeta, f"{nombre_archivo}.xlsx")
+    _, hojas = exportar_excel_streaming(df.itertuples(index=False, name=None), list(df.columns), ruta_excel)
+    if hojas > 1:
+        print(f"📑 Excel repartido en {hojas} hojas de hasta {MAX_FILAS_HOJA_EXCEL:,} filas")
+    return [ruta_excel]
+
+def valor_excel(valor):
+    """Convierte los nulos de pandas/NumPy (NaN, NA, NaT) en celdas vacías"""
+    try:
+        return None if pd.isna(valor) else valor
+    except (TypeError, ValueError):
+        return valor
+
+def exportar_excel_streaming(filas, columnas, ruta, filas_por_hoja=MAX_FILAS_HOJA_EXCEL):
+    """Escribe filas de cualquier iterable en un Excel write_only (memoria constante), abriendo otra hoja al llegar al límite"""
+    from openpyxl import Workbook
+    libro = Workbook(write_only=True)
+    hoja = None
+    en_hoja = 0
+    hojas = 0
+    total = 0
+    for fila in filas:
+        if hoja is None or en_hoja >= filas_por_hoja:
+            hojas += 1
+            hoja = libro.create_sheet(f"Sheet{hojas}")
+            hoja.append(columnas)
+            en_hoja = 0
+        hoja.append([valor_excel(valor) for valor in fila])
+        en_hoja += 1
+        total += 1
+    if hoja is None:
+        hojas = 1
+        libro.create_sheet("Sheet1").append(columnas)
+    libro.save(ruta)
+    return total, hojas
+
+# Tipo Parquet según el tipo que pandas infiere para la columna (infer_dtype); lo demás se guarda como texto
+TIPOS_PARQUET = {
+    'integer': 'int64',
+    'floating': 'float64',
+    'mixed-integer-float': 'float64',
+    'decimal': 'float64',
+    'boolean': 'bool',
+    'date': 'date32',
+    'datetime': 'timestamp[us]',
+    'datetime64': 'timestamp[us]',
+}
+
+def esquema_parquet(df, tipos=None):
+    """Arma el esquema Parquet de un bloque; `tipos` fija columnas que en un bloque podrían venir vacías o mezcladas"""
+    import pyarrow as pa
+    campos = []
+    for col in df.columns:
+        inferido = (tipos or {}).get(col) or pd.api.types.infer_dtype(df[col], skipna=True)
+        campos.append(pa.field(str(col), pa.type_for_alias(TIPOS_PARQUET.get(inferido, 'string'))))
+    return pa.schema(campos)
+
+def tabla_parquet(df, esquema):
+    """Convierte un bloque al esquema fijo del archivo, pasando a texto las columnas de texto que no lo sean"""
+    import pyarrow as pa
+    if df.empty:
+        # Un bloque sin filas no trae tipos útiles (pandas lo deja en float64/object): basta la tabla vacía del esquema
+        return esquema.empty_table()
+    df = df.copy()
+    for campo in esquema:
+        columna = df[campo.name]
+        if pa.types.is_string(campo.type) and pd.api.types.infer_dtype(columna, skipna=True) not in ('string', 'empty'):
+            df[campo.name] = columna.map(lambda valor: None if pd.isna(valor) else str(valor))
+    return pa.Table.from_pandas(df, schema=esquema, preserve_index=False)
+
+def escribir_por_bloques(bloques, carpeta, nombre_archivo, formato='csv', tipos=None, vacio=None):
+    """Escribe DataFrames que llegan de a uno (generador) en un único CSV o Parquet sin juntarlos en memoria; devuelve (ruta, filas).
+
+    Si no llega ningún bloque se escribe `vacio` (un DataFrame sin filas con las columnas del archivo),
+    para que la ruta devuelta siempre exista aunque sea solo con el encabezado.
+    """
+    os.makedirs(carpeta, exist_ok=True)
+    if formato == 'parquet' and not parquet_disponible():
+        print("⚠️ pyarrow no está instalado: se guarda en CSV (pip install pyarrow)")
+        formato = 'csv'
+    ruta = os.path.join(carpeta, f"{nombre_archivo}.{formato}")
+    total = 0
+    escritor = None
+    if vacio is not None:
+        bloques = con_bloque_vacio(bloques, vacio)
+    try:
+        for numero, df in enumerate(bloques):
+            if formato == 'parquet':
+                # Un row group por bloque, todos con el esquema del primero
+                if escritor is None:
+                    import pyarrow.parquet as pq
+                    esquema = esquema_parquet(df, tipos)
+                    columnas_texto = [campo.name for campo in esquema if str(campo.type) == 'string']
+                    escritor = pq.ParquetWriter(ruta, esquema, compression='snappy', use_dictionary=columnas_texto)
+                escritor.write_table(tabla_parquet(df, esquema))
+            elif numero == 0:
+                df.to_csv(ruta, index=False, encoding="utf-8-sig")
+            else:
+                # El BOM y el encabezado van solo al comienzo del archivo
+                df.to_csv(ruta, index=False, header=False, mode='a', encoding="utf-8")
+            total += len(df)
+    finally:
+        if escritor is not None:
+            escritor.close()
+    return ruta, total
+
+def con_bloque_vacio(bloques, vacio):
+    """Entrega los bloques tal cual o, si no llega ninguno, solo el bloque vacío"""
+    hubo = False
+    for df in bloques:
+        hubo = True
+        yield df
+    if not hubo:
+        yield vacio
+
+def exportar_excel_desde_archivo(ruta, filas, sin_limite=False, tamano_bloque=50000):
+    """Genera el Excel de un CSV o Parquet ya escrito, leyéndolo por bloques; devuelve las rutas escritas"""
+    if filas > MAX_FILAS_EXCEL and not sin_limite:
+        print(f"⚠️ Excel omitido: {filas:,} filas superan el máximo de {MAX_FILAS_EXCEL:,}")
+        return []
+    ruta_excel = f"{os.path.splitext(ruta)[0]}.xlsx"
+    filas_archivo = (
+        fila
+        for bloque in leer_por_bloques(ruta, tamano_bloque)
+        for fila in bloque.itertuples(index=False, name=None)
+    )
+    _, hojas = exportar_excel_streaming(filas_archivo, leer_columnas(ruta), ruta_excel)
+    if hojas > 1:
+        print(f"📑 Excel repartido en {hojas} hojas de hasta {MAX_FILAS_HOJA_EXCEL:,} filas")
+    return [ruta_excel]
+
+def leer_tabla(ruta):
+    """Lee un CSV o un Parquet completo en un DataFrame según la extensión"""
+    if ruta.endswith('.parquet'):
+        return pd.read_parquet(ruta)
+    return pd.read_csv(ruta)
+
+def leer_columnas(ruta):
+    """Lee solo los nombres de columna de un CSV o un Parquet"""
+    if ruta.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        return list(pq.read_schema(ruta).names)
+    return list(pd.read_csv(ruta, nrows=0, encoding='utf-8-sig').columns)
+
+def leer_por_bloques(ruta, tamano_bloque, saltar=0):
+    """Recorre un CSV o un Parquet en DataFrames de a lo más `tamano_bloque` filas, saltando las primeras `saltar`"""
+    if not ruta.endswith('.parquet'):
+        # La fila 0 es el encabezado: las saltadas no se parsean
+        yield from pd.read_csv(ruta, chunksize=tamano_bloque, skiprows=range(1, saltar + 1))
+        return
+    import pyarrow.parquet as pq
+    archivo = pq.ParquetFile(ruta)
+    leidas = 0
+    for lote in archivo.iter_batches(batch_size=tamano_bloque):
+        if leidas + lote.num_rows <= saltar:
+            leidas += lote.num_rows
+            continue
+        desde = max(0, saltar - leidas)
+        leidas += lote.num_rows
+        yield lote.slice(desde).to_pandas().reset_index(drop=True)
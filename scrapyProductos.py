@@ -10,8 +10,13 @@ from difflib import get_close_matches
 import json
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from sqlalchemy import create_engine
 from dotenv import load_dotenv
+from salidas import (guardar_dataframe, exportar_excel_streaming, pedir_formato_salida,
+                     MAX_FILAS_EXCEL, MAX_FILAS_HOJA_EXCEL)
+from http_cliente import obtener
+from motor_descargas import motor_disponible, descargar_paginas, VENTANA_PAGINAS, MAX_PAGINAS
 
 # Cargar variables de entorno
 load_dotenv('.env')
@@ -39,6 +44,9 @@ TIENDAS_DISPONIBLES = {
     '3': 'https://www.paris.cl',
     '4': 'https://www.falabella.com'
 }
+# Opción del menú que busca en todas las tiendas a la vez (comparación de precios)
+OPCION_TODAS_LAS_TIENDAS = '5'
+TODAS_LAS_TIENDAS = 'todas'
 
 def mostrar_menu_tiendas():
     """Muestra el listado simple de tiendas"""
@@ -48,6 +56,7 @@ def mostrar_menu_tiendas():
     print("2. MercadoLibre") 
     print("3. Paris")
     print("4. Falabella")
+    print("5. Todas las tiendas (comparar precios)")
     print("0. Volver atrás")
     print("=" * 30)
 
@@ -55,7 +64,7 @@ def seleccionar_tienda():
     """Selecciona una tienda del listado"""
     while True:
         mostrar_menu_tiendas()
-        opcion = input("Selecciona una opción (0-4): ").strip()
+        opcion = input("Selecciona una opción (0-5): ").strip()
         
         if opcion == '0':
             print("👋 ¡Hasta luego!")
@@ -64,6 +73,9 @@ def seleccionar_tienda():
         elif opcion in TIENDAS_DISPONIBLES:
             return TIENDAS_DISPONIBLES[opcion]
         
+        elif opcion == OPCION_TODAS_LAS_TIENDAS:
+            return TODAS_LAS_TIENDAS
+        
         else:
             print("❌ Opción no válida")
 
@@ -83,7 +95,7 @@ def detectar_metodo_busqueda(url):
     headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = obtener(url, headers=headers, timeout=10)
         response.raise_for_status()
     except Exception as e:
         print(f"❌ Error al acceder al sitio: {e}")
@@ -511,7 +523,7 @@ def scrapear_productos_busqueda(url_busqueda, parametro_busqueda, termino_busque
         }
         
         # Realizar request con timeout
-        response = requests.get(url_final, headers=headers, timeout=30)
+        response = obtener(url_final, headers=headers, timeout=30)
         response.raise_for_status()
         
         print("✅ Respuesta recibida")
@@ -793,11 +805,12 @@ def obtener_o_crear_tienda_por_url(url_producto):
         return None, None
 
 def scrapear_yapo(termino, cantidad):
-    import re
-    url = f"https://www.yapo.cl/autos-usados?q={termino}"
-    headers = {"User-Agent": "Mozilla/5.0"}
-    response = requests.get(url, headers=headers)
-    soup = BeautifulSoup(response.text, 'html.parser')
+    resultados, = scrapear_concurrente([('yapo', termino, cantidad)])
+    return resultados
+
+def parsear_yapo(html_texto, cantidad):
+    """Extrae los avisos de una página de resultados de Yapo"""
+    soup = BeautifulSoup(html_texto, 'html.parser')
     anuncios = soup.find_all('a', class_='d3-ad-tile__description')
     resultados = []
     for anuncio in anuncios:
@@ -874,366 +887,538 @@ def scrapear_yapo(termino, cantidad):
     return resultados
 
 def scrapear_mercadolibre(termino, cantidad):
-    url = f"https://listado.mercadolibre.cl/{termino}"
-    headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
-    
-    try:
-        response = requests.get(url, headers=headers, timeout=15)
-        html = BeautifulSoup(response.text, 'html.parser')
-        
-        # Múltiples selectores para productos de MercadoLibre
-        selectores_productos = [
-            'div[class*="poly-card"]',
-            'div[class*="ui-search-result"]',
-            'li[class*="ui-search-layout__item"]',
-            'div[class*="andes-card"]',
-            'article[class*="ui-search-result"]'
-        ]
-        
-        productos = []
-        for selector in selectores_productos:
-            productos = html.select(selector)
-            if productos:
-                break
-        
-        resultados = []
-        for producto in productos:
-            if len(resultados) >= cantidad:
-                break
-                
-            try:
-                # Nombre y enlace - múltiples selectores
-                nombre = ''
-                url_producto = ''
-                
-                # Buscar nombre en diferentes elementos
-                nombre_selectors = [
-                    'a[class*="ui-search-item__group__element"]',
-                    'a[class*="ui-search-link"]',
-                    'h2[class*="ui-search-item__title"]',
-                    'span[class*="ui-search-item__title"]',
-                    'a[class*="poly-component__title"]'
-                ]
-                
-                for selector in nombre_selectors:
-                    nombre_elem = producto.select_one(selector)
-                    if nombre_elem:
-                        nombre = nombre_elem.get_text(strip=True)
-                        url_producto = nombre_elem.get('href', '')
+    resultados, = scrapear_concurrente([('mercadolibre', termino, cantidad)])
+    return resultados
+
+def parsear_mercadolibre(html_texto, cantidad):
+    """Extrae los productos de una página de resultados de MercadoLibre"""
+    html = BeautifulSoup(html_texto, 'html.parser')
+
+    # Múltiples selectores para productos de MercadoLibre
+    selectores_productos = [
+        'div[class*="poly-card"]',
+        'div[class*="ui-search-result"]',
+        'li[class*="ui-search-layout__item"]',
+        'div[class*="andes-card"]',
+        'article[class*="ui-search-result"]'
+    ]
+
+    productos = []
+    for selector in selectores_productos:
+        productos = html.select(selector)
+        if productos:
+            break
+
+    resultados = []
+    for producto in productos:
+        if len(resultados) >= cantidad:
+            break
+
+        try:
+            # Nombre y enlace - múltiples selectores
+            nombre = ''
+            url_producto = ''
+
+            # Buscar nombre en diferentes elementos
+            nombre_selectors = [
+                'a[class*="ui-search-item__group__element"]',
+                'a[class*="ui-search-link"]',
+                'h2[class*="ui-search-item__title"]',
+                'span[class*="ui-search-item__title"]',
+                'a[class*="poly-component__title"]'
+            ]
+
+            for selector in nombre_selectors:
+                nombre_elem = producto.select_one(selector)
+                if nombre_elem:
+                    nombre = nombre_elem.get_text(strip=True)
+                    url_producto = nombre_elem.get('href', '')
+                    break
+
+            if not nombre:
+                continue  # Saltar si no hay nombre
+
+            # Marca - extraer del nombre o buscar específicamente
+            marca = nombre.split()[0] if nombre else ''
+
+            # Precio - múltiples selectores
+            precio_decimal = None
+            precio_selectors = [
+                'span[class*="andes-money-amount__fraction"]',
+                'span[class*="price-tag-fraction"]',
+                'span[class*="price-tag-amount"]',
+                'span[class*="ui-search-price-amount__fraction"]'
+            ]
+
+            for selector in precio_selectors:
+                precio_elem = producto.select_one(selector)
+                if precio_elem:
+                    precio_texto = precio_elem.get_text(strip=True)
+                    precio_decimal = limpiar_precio(precio_texto)
+                    if precio_decimal:
                         break
-                
-                if not nombre:
-                    continue  # Saltar si no hay nombre
-                
-                # Marca - extraer del nombre o buscar específicamente
-                marca = nombre.split()[0] if nombre else ''
-                
-                # Precio - múltiples selectores
-                precio_decimal = None
-                precio_selectors = [
-                    'span[class*="andes-money-amount__fraction"]',
-                    'span[class*="price-tag-fraction"]',
-                    'span[class*="price-tag-amount"]',
-                    'span[class*="ui-search-price-amount__fraction"]'
-                ]
-                
-                for selector in precio_selectors:
-                    precio_elem = producto.select_one(selector)
-                    if precio_elem:
-                        precio_texto = precio_elem.get_text(strip=True)
+
+            # Descuento
+            descuento_decimal = None
+            descuento_selectors = [
+                'span[class*="andes-money-amount__discount"]',
+                'span[class*="price-tag__discount"]',
+                'span[class*="ui-search-price-amount__discount"]'
+            ]
+
+            for selector in descuento_selectors:
+                descuento_elem = producto.select_one(selector)
+                if descuento_elem:
+                    descuento_texto = descuento_elem.get_text(strip=True)
+                    descuento_decimal = limpiar_descuento(descuento_texto)
+                    if descuento_decimal:
+                        break
+
+            # Solo agregar si tiene nombre y precio
+            if nombre and precio_decimal:
+                resultados.append({
+                    'nombre': nombre,
+                    'marca': marca,
+                    'precio': precio_decimal,
+                    'descuento': descuento_decimal,
+                    'preciofinal': precio_decimal - (descuento_decimal or 0),
+                    'url_producto': url_producto,
+                    'id_tienda': 2,  # MercadoLibre
+                    'direccion_tienda': 'Santiago, Chile'
+                })
+
+        except Exception as e:
+            continue  # Si hay error con un producto, continuar
+
+    return resultados
+
+def scrapear_paris(termino, cantidad):
+    resultados, = scrapear_concurrente([('paris', termino, cantidad)])
+    return resultados
+
+def parsear_paris(html_texto, cantidad):
+    """Extrae los productos de una página de resultados de Paris"""
+    html = BeautifulSoup(html_texto, 'html.parser')
+
+    # Múltiples selectores para productos de Paris
+    selectores_productos = [
+        'div[role="gridcell"]',
+        'div[class*="product"]',
+        'div[class*="item"]',
+        'article[class*="product"]',
+        'div[class*="card"]'
+    ]
+
+    productos = []
+    for selector in selectores_productos:
+        productos = html.select(selector)
+        if productos:
+            break
+
+    resultados = []
+    for producto in productos:
+        if len(resultados) >= cantidad:
+            break
+
+        try:
+            # Nombre - múltiples selectores
+            nombre = ''
+            nombre_selectors = [
+                'span[class*="ui-line-clamp"]',
+                'h3[class*="product"]',
+                'span[class*="product-name"]',
+                'div[class*="product-title"]',
+                'span[class*="title"]'
+            ]
+
+            for selector in nombre_selectors:
+                nombre_elem = producto.select_one(selector)
+                if nombre_elem:
+                    nombre = nombre_elem.get_text(strip=True)
+                    break
+
+            if not nombre:
+                continue  # Saltar si no hay nombre
+
+            # Marca - extraer del nombre o buscar específicamente
+            marca = nombre.split()[0] if nombre else ''
+
+            # Precio - múltiples selectores
+            precio_decimal = None
+            precio_selectors = [
+                'span[class*="price"]',
+                'span[class*="amount"]',
+                'div[class*="price"]',
+                'span:contains("$")'
+            ]
+
+            for selector in precio_selectors:
+                precio_elem = producto.select_one(selector)
+                if precio_elem:
+                    precio_texto = precio_elem.get_text(strip=True)
+                    if '$' in precio_texto and any(char.isdigit() for char in precio_texto):
                         precio_decimal = limpiar_precio(precio_texto)
                         if precio_decimal:
                             break
-                
-                # Descuento
-                descuento_decimal = None
-                descuento_selectors = [
-                    'span[class*="andes-money-amount__discount"]',
-                    'span[class*="price-tag__discount"]',
-                    'span[class*="ui-search-price-amount__discount"]'
-                ]
-                
-                for selector in descuento_selectors:
-                    descuento_elem = producto.select_one(selector)
-                    if descuento_elem:
-                        descuento_texto = descuento_elem.get_text(strip=True)
-                        descuento_decimal = limpiar_descuento(descuento_texto)
-                        if descuento_decimal:
-                            break
-                
-                # Solo agregar si tiene nombre y precio
-                if nombre and precio_decimal:
-                    resultados.append({
-                        'nombre': nombre,
-                        'marca': marca,
-                        'precio': precio_decimal,
-                        'descuento': descuento_decimal,
-                        'preciofinal': precio_decimal - (descuento_decimal or 0),
-                        'url_producto': url_producto,
-                        'id_tienda': 2,  # MercadoLibre
-                        'direccion_tienda': 'Santiago, Chile'
-                    })
-                    
-            except Exception as e:
-                continue  # Si hay error con un producto, continuar
-        
-        return resultados
-        
-    except Exception as e:
-        print(f"❌ Error al scrapear MercadoLibre: {e}")
-        return []
 
-def scrapear_paris(termino, cantidad):
-    url = f"https://www.paris.cl/search/?q={termino}"
-    headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
-    
-    try:
-        response = requests.get(url, headers=headers, timeout=15)
-        html = BeautifulSoup(response.text, 'html.parser')
-        
-        # Múltiples selectores para productos de Paris
-        selectores_productos = [
-            'div[role="gridcell"]',
-            'div[class*="product"]',
-            'div[class*="item"]',
-            'article[class*="product"]',
-            'div[class*="card"]'
-        ]
-        
-        productos = []
-        for selector in selectores_productos:
-            productos = html.select(selector)
-            if productos:
-                break
-        
-        resultados = []
-        for producto in productos:
-            if len(resultados) >= cantidad:
-                break
-                
-            try:
-                # Nombre - múltiples selectores
-                nombre = ''
-                nombre_selectors = [
-                    'span[class*="ui-line-clamp"]',
-                    'h3[class*="product"]',
-                    'span[class*="product-name"]',
-                    'div[class*="product-title"]',
-                    'span[class*="title"]'
-                ]
-                
-                for selector in nombre_selectors:
-                    nombre_elem = producto.select_one(selector)
-                    if nombre_elem:
-                        nombre = nombre_elem.get_text(strip=True)
-                        break
-                
-                if not nombre:
-                    continue  # Saltar si no hay nombre
-                
-                # Marca - extraer del nombre o buscar específicamente
-                marca = nombre.split()[0] if nombre else ''
-                
-                # Precio - múltiples selectores
-                precio_decimal = None
-                precio_selectors = [
-                    'span[class*="price"]',
-                    'span[class*="amount"]',
-                    'div[class*="price"]',
-                    'span:contains("$")'
-                ]
-                
-                for selector in precio_selectors:
-                    precio_elem = producto.select_one(selector)
-                    if precio_elem:
-                        precio_texto = precio_elem.get_text(strip=True)
-                        if '$' in precio_texto and any(char.isdigit() for char in precio_texto):
-                            precio_decimal = limpiar_precio(precio_texto)
-                            if precio_decimal:
-                                break
-                
-                # Descuento
-                descuento_decimal = None
-                descuento_selectors = [
-                    'div[data-testid="paris-label"]',
-                    'span[class*="discount"]',
-                    'div[class*="badge"]',
-                    'span[class*="offer"]'
-                ]
-                
-                for selector in descuento_selectors:
-                    descuento_elem = producto.select_one(selector)
-                    if descuento_elem:
-                        descuento_texto = descuento_elem.get_text(strip=True)
-                        descuento_decimal = limpiar_descuento(descuento_texto)
-                        if descuento_decimal:
-                            break
-                
-                # URL del producto
-                url_producto = ''
-                enlace_selectors = [
-                    'a[href*="/producto/"]',
-                    'a[href*="/p/"]',
-                    'a[class*="product-link"]'
-                ]
-                
-                for selector in enlace_selectors:
-                    enlace = producto.select_one(selector)
-                    if enlace:
-                        url_producto = enlace.get('href', '')
-                        if url_producto and not url_producto.startswith('http'):
-                            url_producto = 'https://www.paris.cl' + url_producto
+            # Descuento
+            descuento_decimal = None
+            descuento_selectors = [
+                'div[data-testid="paris-label"]',
+                'span[class*="discount"]',
+                'div[class*="badge"]',
+                'span[class*="offer"]'
+            ]
+
+            for selector in descuento_selectors:
+                descuento_elem = producto.select_one(selector)
+                if descuento_elem:
+                    descuento_texto = descuento_elem.get_text(strip=True)
+                    descuento_decimal = limpiar_descuento(descuento_texto)
+                    if descuento_decimal:
                         break
-                
-                # Solo agregar si tiene nombre y precio
-                if nombre and precio_decimal:
-                    resultados.append({
-                        'nombre': nombre,
-                        'marca': marca,
-                        'precio': precio_decimal,
-                        'descuento': descuento_decimal,
-                        'preciofinal': precio_decimal - (descuento_decimal or 0),
-                        'url_producto': url_producto,
-                        'id_tienda': 3,  # Paris
-                        'direccion_tienda': 'Santiago, Chile'
-                    })
-                    
-            except Exception as e:
-                continue  # Si hay error con un producto, continuar
-        
-        return resultados
-        
-    except Exception as e:
-        print(f"❌ Error al scrapear Paris: {e}")
-        return []
+
+            # URL del producto
+            url_producto = ''
+            enlace_selectors = [
+                'a[href*="/producto/"]',
+                'a[href*="/p/"]',
+                'a[class*="product-link"]'
+            ]
+
+            for selector in enlace_selectors:
+                enlace = producto.select_one(selector)
+                if enlace:
+                    url_producto = enlace.get('href', '')
+                    if url_producto and not url_producto.startswith('http'):
+                        url_producto = 'https://www.paris.cl' + url_producto
+                    break
+
+            # Solo agregar si tiene nombre y precio
+            if nombre and precio_decimal:
+                resultados.append({
+                    'nombre': nombre,
+                    'marca': marca,
+                    'precio': precio_decimal,
+                    'descuento': descuento_decimal,
+                    'preciofinal': precio_decimal - (descuento_decimal or 0),
+                    'url_producto': url_producto,
+                    'id_tienda': 3,  # Paris
+                    'direccion_tienda': 'Santiago, Chile'
+                })
+
+        except Exception as e:
+            continue  # Si hay error con un producto, continuar
+
+    return resultados
 
 def scrapear_falabella(termino, cantidad):
-    url = f"https://www.falabella.com/falabella-cl/search?Ntt={termino}"
-    headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
-    
-    try:
-        response = requests.get(url, headers=headers, timeout=15)
-        html = BeautifulSoup(response.text, 'html.parser')
-        
-        # Múltiples selectores para productos de Falabella
-        selectores_productos = [
-            'div[class*="jsx-"]',
-            'div[class*="product"]',
-            'div[class*="item"]',
-            'article[class*="product"]',
-            'div[class*="card"]',
-            'div[class*="search-result"]'
-        ]
-        
-        productos = []
-        for selector in selectores_productos:
-            productos = html.select(selector)
-            if productos:
-                break
-        
-        resultados = []
-        for producto in productos:
-            if len(resultados) >= cantidad:
-                break
-                
-            try:
-                # Nombre - múltiples selectores
-                nombre = ''
-                nombre_selectors = [
-                    'span[class*="copy10"]',
-                    'span[class*="product-name"]',
-                    'h3[class*="product"]',
-                    'span[class*="title"]',
-                    'div[class*="product-title"]'
-                ]
-                
-                for selector in nombre_selectors:
-                    nombre_elem = producto.select_one(selector)
-                    if nombre_elem:
-                        nombre = nombre_elem.get_text(strip=True)
-                        break
-                
-                if not nombre:
-                    continue  # Saltar si no hay nombre
-                
-                # Marca - extraer del nombre
-                marca = nombre.split()[0] if nombre else ''
-                
-                # Precio - múltiples selectores
-                precio_decimal = None
-                precio_selectors = [
-                    'span[class*="copy10"]',
-                    'span[class*="price"]',
-                    'span[class*="amount"]',
-                    'div[class*="price"]',
-                    'span:contains("$")'
-                ]
-                
-                for selector in precio_selectors:
-                    precio_elem = producto.select_one(selector)
-                    if precio_elem:
-                        precio_texto = precio_elem.get_text(strip=True)
-                        if '$' in precio_texto and any(char.isdigit() for char in precio_texto):
-                            precio_decimal = limpiar_precio(precio_texto)
-                            if precio_decimal:
-                                break
-                
-                # Descuento
-                descuento_decimal = None
-                descuento_selectors = [
-                    'span[class*="discount-badge"]',
-                    'span[class*="discount"]',
-                    'div[class*="badge"]',
-                    'span[class*="offer"]',
-                    'div[class*="discount"]'
-                ]
-                
-                for selector in descuento_selectors:
-                    descuento_elem = producto.select_one(selector)
-                    if descuento_elem:
-                        descuento_texto = descuento_elem.get_text(strip=True)
-                        descuento_decimal = limpiar_descuento(descuento_texto)
-                        if descuento_decimal:
+    resultados, = scrapear_concurrente([('falabella', termino, cantidad)])
+    return resultados
+
+def parsear_falabella(html_texto, cantidad):
+    """Extrae los productos de una página de resultados de Falabella"""
+    html = BeautifulSoup(html_texto, 'html.parser')
+
+    # Múltiples selectores para productos de Falabella
+    selectores_productos = [
+        'div[class*="jsx-"]',
+        'div[class*="product"]',
+        'div[class*="item"]',
+        'article[class*="product"]',
+        'div[class*="card"]',
+        'div[class*="search-result"]'
+    ]
+
+    productos = []
+    for selector in selectores_productos:
+        productos = html.select(selector)
+        if productos:
+            break
+
+    resultados = []
+    for producto in productos:
+        if len(resultados) >= cantidad:
+            break
+
+        try:
+            # Nombre - múltiples selectores
+            nombre = ''
+            nombre_selectors = [
+                'span[class*="copy10"]',
+                'span[class*="product-name"]',
+                'h3[class*="product"]',
+                'span[class*="title"]',
+                'div[class*="product-title"]'
+            ]
+
+            for selector in nombre_selectors:
+                nombre_elem = producto.select_one(selector)
+                if nombre_elem:
+                    nombre = nombre_elem.get_text(strip=True)
+                    break
+
+            if not nombre:
+                continue  # Saltar si no hay nombre
+
+            # Marca - extraer del nombre
+            marca = nombre.split()[0] if nombre else ''
+
+            # Precio - múltiples selectores
+            precio_decimal = None
+            precio_selectors = [
+                'span[class*="copy10"]',
+                'span[class*="price"]',
+                'span[class*="amount"]',
+                'div[class*="price"]',
+                'span:contains("$")'
+            ]
+
+            for selector in precio_selectors:
+                precio_elem = producto.select_one(selector)
+                if precio_elem:
+                    precio_texto = precio_elem.get_text(strip=True)
+                    if '$' in precio_texto and any(char.isdigit() for char in precio_texto):
+                        precio_decimal = limpiar_precio(precio_texto)
+                        if precio_decimal:
                             break
-                
-                # URL del producto
-                url_producto = ''
-                enlace_selectors = [
-                    'a[href*="/producto/"]',
-                    'a[href*="/p/"]',
-                    'a[class*="product-link"]',
-                    'a[href*="/falabella-cl/product/"]'
-                ]
-                
-                for selector in enlace_selectors:
-                    enlace = producto.select_one(selector)
-                    if enlace:
-                        url_producto = enlace.get('href', '')
-                        if url_producto and not url_producto.startswith('http'):
-                            url_producto = 'https://www.falabella.com' + url_producto
+
+            # Descuento
+            descuento_decimal = None
+            descuento_selectors = [
+                'span[class*="discount-badge"]',
+                'span[class*="discount"]',
+                'div[class*="badge"]',
+                'span[class*="offer"]',
+                'div[class*="discount"]'
+            ]
+
+            for selector in descuento_selectors:
+                descuento_elem = producto.select_one(selector)
+                if descuento_elem:
+                    descuento_texto = descuento_elem.get_text(strip=True)
+                    descuento_decimal = limpiar_descuento(descuento_texto)
+                    if descuento_decimal:
                         break
-                
-                # Solo agregar si tiene nombre y precio
-                if nombre and precio_decimal:
-                    resultados.append({
-                        'nombre': nombre,
-                        'marca': marca,
-                        'precio': precio_decimal,
-                        'descuento': descuento_decimal,
-                        'preciofinal': precio_decimal - (descuento_decimal or 0),
-                        'url_producto': url_producto,
-                        'id_tienda': 4,  # Falabella
-                        'direccion_tienda': 'Santiago, Chile'
-                    })
-                    
-            except Exception as e:
-                continue  # Si hay error con un producto, continuar
-        
-        return resultados
-        
-    except Exception as e:
-        print(f"❌ Error al scrapear Falabella: {e}")
-        return []
+
+            # URL del producto
+            url_producto = ''
+            enlace_selectors = [
+                'a[href*="/producto/"]',
+                'a[href*="/p/"]',
+                'a[class*="product-link"]',
+                'a[href*="/falabella-cl/product/"]'
+            ]
+
+            for selector in enlace_selectors:
+                enlace = producto.select_one(selector)
+                if enlace:
+                    url_producto = enlace.get('href', '')
+                    if url_producto and not url_producto.startswith('http'):
+                        url_producto = 'https://www.falabella.com' + url_producto
+                    break
+
+            # Solo agregar si tiene nombre y precio
+            if nombre and precio_decimal:
+                resultados.append({
+                    'nombre': nombre,
+                    'marca': marca,
+                    'precio': precio_decimal,
+                    'descuento': descuento_decimal,
+                    'preciofinal': precio_decimal - (descuento_decimal or 0),
+                    'url_producto': url_producto,
+                    'id_tienda': 4,  # Falabella
+                    'direccion_tienda': 'Santiago, Chile'
+                })
+
+        except Exception as e:
+            continue  # Si hay error con un producto, continuar
+
+    return resultados
+
+# Búsqueda de cada tienda: URL de la primera página y de las siguientes ({numero} desde 2, {desde} = primer
+# producto de la página), productos por página, encabezados y función que extrae los productos del HTML
+BUSQUEDAS_TIENDAS = {
+    'yapo': {
+        'nombre': 'Yapo',
+        'url': "https://www.yapo.cl/autos-usados?q={termino}",
+        'url_pagina': "https://www.yapo.cl/autos-usados?q={termino}&o={numero}",
+        'por_pagina': 50,
+        'headers': {"User-Agent": "Mozilla/5.0"},
+        'parsear': parsear_yapo,
+    },
+    'mercadolibre': {
+        'nombre': 'MercadoLibre',
+        'url': "https://listado.mercadolibre.cl/{termino}",
+        'url_pagina': "https://listado.mercadolibre.cl/{termino}_Desde_{desde}",
+        'por_pagina': 50,
+        'headers': {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"},
+        'parsear': parsear_mercadolibre,
+    },
+    'paris': {
+        'nombre': 'Paris',
+        'url': "https://www.paris.cl/search/?q={termino}",
+        'url_pagina': "https://www.paris.cl/search/?q={termino}&page={numero}",
+        'por_pagina': 40,
+        'headers': {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"},
+        'parsear': parsear_paris,
+    },
+    'falabella': {
+        'nombre': 'Falabella',
+        'url': "https://www.falabella.com/falabella-cl/search?Ntt={termino}",
+        'url_pagina': "https://www.falabella.com/falabella-cl/search?Ntt={termino}&page={numero}",
+        'por_pagina': 48,
+        'headers': {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"},
+        'parsear': parsear_falabella,
+    },
+}
+
+def url_pagina(tienda, termino, numero):
+    """Arma la URL de la página `numero` (desde 1) de los resultados de una búsqueda"""
+    busqueda = BUSQUEDAS_TIENDAS[tienda]
+    if numero == 1:
+        return busqueda['url'].format(termino=termino)
+    desde = (numero - 1) * busqueda['por_pagina'] + 1
+    return busqueda['url_pagina'].format(termino=termino, numero=numero, desde=desde)
+
+def ventana_paginas(tienda, cantidad):
+    """Páginas a pedir por adelantado: las que se estima que hacen falta, sin pasar de VENTANA_PAGINAS"""
+    por_pagina = BUSQUEDAS_TIENDAS[tienda]['por_pagina']
+    return max(1, min(VENTANA_PAGINAS, -(-cantidad // por_pagina)))
+
+def agregar_unicos(resultados, vistos, productos, cantidad):
+    """Agrega a `resultados` los productos aún no vistos (por URL, o nombre y precio) hasta llegar a `cantidad`; devuelve cuántos agregó"""
+    agregados = 0
+    for producto in productos or []:
+        if len(resultados) >= cantidad:
+            break
+        clave = producto.get('url_producto') or (producto.get('nombre'), producto.get('precio'))
+        if clave in vistos:
+            continue
+        vistos.add(clave)
+        resultados.append(producto)
+        agregados += 1
+    return agregados
+
+def scrapear_paginas_secuencial(tienda, termino, cantidad):
+    """Recorre las páginas de una búsqueda de a una con la sesión HTTP compartida (sin aiohttp).
+
+    Devuelve (resultados, recorrido), con el recorrido en la misma forma que los del motor asíncrono.
+    """
+    busqueda = BUSQUEDAS_TIENDAS[tienda]
+    resultados, vistos, paginas = [], set(), []
+    inicio = time.perf_counter()
+    for numero in range(1, MAX_PAGINAS + 1):
+        pagina = {'pagina': numero, 'segundos': None, 'error': None}
+        paginas.append(pagina)
+        inicio_pagina = time.perf_counter()
+        try:
+            response = obtener(url_pagina(tienda, termino, numero), headers=busqueda['headers'], timeout=15)
+            pagina['segundos'] = time.perf_counter() - inicio_pagina
+            productos = busqueda['parsear'](response.text, cantidad)
+        except Exception as e:
+            pagina['error'] = str(e)
+            print(f"❌ Error al scrapear {busqueda['nombre']} (página {numero}): {e}")
+            break
+        # Una página sin productos nuevos es el final de los resultados (o una página repetida)
+        if agregar_unicos(resultados, vistos, productos, cantidad) == 0 or len(resultados) >= cantidad:
+            break
+    return resultados, {'paginas': paginas, 'segundos': time.perf_counter() - inicio}
+
+def busqueda_paginada(tienda, termino, cantidad, resultados):
+    """Arma la búsqueda paginada para el motor asíncrono: va juntando en `resultados` los productos únicos de cada página"""
+    busqueda = BUSQUEDAS_TIENDAS[tienda]
+    vistos = set()
+
+    def tarea_de_pagina(numero):
+        return {
+            'url': url_pagina(tienda, termino, numero),
+            'headers': busqueda['headers'],
+            'parsear': busqueda['parsear'],
+            'argumentos': (cantidad,),
+        }
+
+    def continuar(pagina):
+        if pagina['error']:
+            print(f"❌ Error al scrapear {busqueda['nombre']} (página {pagina['pagina']}): {pagina['error']}")
+            return False
+        # Se deja de pedir páginas al completar la cantidad o cuando una página no trae productos nuevos
+        nuevos = agregar_unicos(resultados, vistos, pagina['resultado'], cantidad)
+        return nuevos > 0 and len(resultados) < cantidad
+
+    return {
+        'tarea_de_pagina': tarea_de_pagina,
+        'continuar': continuar,
+        'ventana': ventana_paginas(tienda, cantidad),
+        'max_paginas': MAX_PAGINAS,
+    }
+
+def resumir_recorrido(productos, recorrido):
+    """Resume el recorrido de una búsqueda: productos, páginas, duración, latencia media por página y primer error"""
+    latencias = [pagina['segundos'] for pagina in recorrido['paginas'] if pagina['segundos'] is not None]
+    return {
+        'productos': len(productos),
+        'paginas': len(recorrido['paginas']),
+        'segundos': recorrido['segundos'],
+        'latencia': sum(latencias) / len(latencias) if latencias else None,
+        'error': next((pagina['error'] for pagina in recorrido['paginas'] if pagina['error']), None),
+    }
+
+def scrapear_concurrente_con_resumen(busquedas):
+    """Scrapea varias búsquedas (tienda, término, cantidad) a la vez y devuelve (resultados, resúmenes), en el mismo orden.
+
+    Cada búsqueda pagina hasta juntar `cantidad` productos únicos, adelantando hasta VENTANA_PAGINAS
+    páginas con el motor asíncrono. Sin aiohttp instalado, cada búsqueda corre en su propio hilo y
+    pide sus páginas de a una.
+    """
+    if not busquedas:
+        return [], []
+    if not motor_disponible():
+        print("⚠️ aiohttp no está instalado: las páginas se piden una por una (pip install aiohttp)")
+        with ThreadPoolExecutor(max_workers=len(busquedas)) as ejecutor:
+            pares = list(ejecutor.map(lambda busqueda: scrapear_paginas_secuencial(*busqueda), busquedas))
+        resultados = [productos for productos, _ in pares]
+        recorridos = [recorrido for _, recorrido in pares]
+    else:
+        resultados = [[] for _ in busquedas]
+        recorridos = descargar_paginas([
+            busqueda_paginada(tienda, termino, cantidad, acumulados)
+            for (tienda, termino, cantidad), acumulados in zip(busquedas, resultados)
+        ])
+    return resultados, [resumir_recorrido(productos, recorrido) for productos, recorrido in zip(resultados, recorridos)]
+
+def scrapear_concurrente(busquedas):
+    """Scrapea varias búsquedas (tienda, término, cantidad) a la vez y devuelve sus resultados en el mismo orden"""
+    resultados, _ = scrapear_concurrente_con_resumen(busquedas)
+    return resultados
+
+def mostrar_resumen_tiendas(tiendas, resumenes, segundos_total):
+    """Imprime productos, páginas, duración y latencia por tienda, y el tiempo total de la búsqueda"""
+    print("\n📊 RESUMEN POR TIENDA")
+    print("-" * 72)
+    print(f"{'Tienda':<14} {'Productos':>9} {'Páginas':>8} {'Tiempo s':>9} {'Latencia ms':>12}  Estado")
+    print("-" * 72)
+    for tienda, resumen in zip(tiendas, resumenes):
+        latencia = f"{resumen['latencia'] * 1000:,.0f}" if resumen['latencia'] is not None else '-'
+        estado = f"❌ {resumen['error']}" if resumen['error'] else '✅'
+        print(f"{BUSQUEDAS_TIENDAS[tienda]['nombre']:<14} {resumen['productos']:>9,} {resumen['paginas']:>8} "
+              f"{resumen['segundos']:>9.2f} {latencia:>12}  {estado}")
+    print("-" * 72)
+    suma = sum(resumen['segundos'] for resumen in resumenes)
+    print(f"⏱️ Tiempo total: {segundos_total:.2f} s (una tienda tras otra habrían sido ~{suma:.2f} s)")
+
+def scrapear_todas_las_tiendas(termino, cantidad):
+    """Busca el mismo término en todas las tiendas a la vez y junta los productos con una columna 'tienda'"""
+    tiendas = list(BUSQUEDAS_TIENDAS)
+    inicio = time.perf_counter()
+    por_tienda, resumenes = scrapear_concurrente_con_resumen([(tienda, termino, cantidad) for tienda in tiendas])
+    segundos_total = time.perf_counter() - inicio
+    resultados = []
+    for tienda, productos in zip(tiendas, por_tienda):
+        nombre = BUSQUEDAS_TIENDAS[tienda]['nombre']
+        resultados.extend({'tienda': nombre, **producto} for producto in productos)
+    mostrar_resumen_tiendas(tiendas, resumenes, segundos_total)
+    return resultados
 
 # ========== FUNCIONES AUXILIARES ==========
 
@@ -1282,19 +1467,36 @@ def detectar_tienda(url):
 
 # ========== GUARDADO DE RESULTADOS ==========
 
-def guardar_resultados(resultados, columnas, nombre_archivo):
+# Columnas del archivo de resultados (la búsqueda en todas las tiendas antepone 'tienda')
+COLUMNAS_RESULTADOS = [
+    'nombre', 'marca', 'precio', 'descuento', 'preciofinal', 'url_producto',
+    'vendedor', 'urgente', 'anio', 'combustible', 'transmision', 'kilometraje',
+    'descripcion', 'id_tienda', 'nombre_tienda', 'direccion_tienda', 'url_tienda'
+]
+
+def guardar_resultados(resultados, columnas, nombre_archivo, formato='csv', excel=False):
     carpeta = 'archivos'
     os.makedirs(carpeta, exist_ok=True)
-    ruta_csv = os.path.join(carpeta, nombre_archivo + '.csv')
-    ruta_excel = os.path.join(carpeta, nombre_archivo + '.xlsx')
-    with open(ruta_csv, 'w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.DictWriter(f, fieldnames=columnas)
-        writer.writeheader()
-        for row in resultados:
-            writer.writerow(row)
-    df = pd.DataFrame(resultados)
-    df.to_excel(ruta_excel, index=False)
-    print(f"Archivos '{ruta_csv}' y '{ruta_excel}' generados correctamente.")
+    if formato == 'csv':
+        ruta_csv = os.path.join(carpeta, nombre_archivo + '.csv')
+        with open(ruta_csv, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.DictWriter(f, fieldnames=columnas)
+            writer.writeheader()
+            for row in resultados:
+                writer.writerow(row)
+        rutas = [ruta_csv]
+    else:
+        rutas = guardar_dataframe(pd.DataFrame(resultados, columns=columnas), carpeta, nombre_archivo, formato)
+    if excel and len(resultados) > MAX_FILAS_EXCEL and excel != 'completo':
+        print(f"⚠️ Excel omitido: {len(resultados):,} filas superan el máximo de {MAX_FILAS_EXCEL:,}")
+    elif excel:
+        # Las filas van directo del scraping al Excel, sin armar un DataFrame
+        ruta_excel = os.path.join(carpeta, nombre_archivo + '.xlsx')
+        _, hojas = exportar_excel_streaming((tuple(row.get(col) for col in columnas) for row in resultados), columnas, ruta_excel)
+        if hojas > 1:
+            print(f"📑 Excel repartido en {hojas} hojas de hasta {MAX_FILAS_HOJA_EXCEL:,} filas")
+        rutas.append(ruta_excel)
+    print(f"Archivos {', '.join(repr(ruta) for ruta in rutas)} generados correctamente.")
 
 # ========== INTERFAZ PRINCIPAL ==========
 
@@ -1303,7 +1505,10 @@ def main():
     print("🗷  SCRAPER MULTITIENDAS")
     print("==================================================")
     url = seleccionar_tienda()
-    print(f"\n✅ URL seleccionada: {url}")
+    if url == TODAS_LAS_TIENDAS:
+        print(f"\n✅ Búsqueda en todas las tiendas: {', '.join(b['nombre'] for b in BUSQUEDAS_TIENDAS.values())}")
+    else:
+        print(f"\n✅ URL seleccionada: {url}")
     termino = input("\n🔍 ¿Qué quieres buscar?: ").strip()
     if not termino:
         print("❌ Término de búsqueda no válido.")
@@ -1320,33 +1525,27 @@ def main():
     if not nombre_archivo:
         print("❌ Nombre de archivo no válido.")
         return
+    formato, excel = pedir_formato_salida()
     print(f"\n🔄 Iniciando scraping...")
     print(f"   URL: {url}")
     print(f"   Búsqueda: '{termino}'")
     print(f"   Cantidad: {cantidad} productos")
     print(f"   Archivo: {nombre_archivo}")
     print("-" * 50)
-    tienda = detectar_tienda(url)
+    tienda = TODAS_LAS_TIENDAS if url == TODAS_LAS_TIENDAS else detectar_tienda(url)
     resultados = []
     try:
-        if tienda == 'yapo':
-            resultados = scrapear_yapo(termino, cantidad)
-        elif tienda == 'mercadolibre':
-            resultados = scrapear_mercadolibre(termino, cantidad)
-        elif tienda == 'paris':
-            resultados = scrapear_paris(termino, cantidad)
-        elif tienda == 'falabella':
-            resultados = scrapear_falabella(termino, cantidad)
+        if tienda == TODAS_LAS_TIENDAS:
+            resultados = scrapear_todas_las_tiendas(termino, cantidad)
+            columnas = ['tienda'] + COLUMNAS_RESULTADOS
+        elif tienda in BUSQUEDAS_TIENDAS:
+            resultados, = scrapear_concurrente([(tienda, termino, cantidad)])
+            columnas = COLUMNAS_RESULTADOS
         else:
             print(f"❌ Tienda no soportada para la URL: {url}")
             return
         if resultados:
-            columnas = [
-                'nombre', 'marca', 'precio', 'descuento', 'preciofinal', 'url_producto',
-                'vendedor', 'urgente', 'anio', 'combustible', 'transmision', 'kilometraje',
-                'descripcion', 'id_tienda', 'nombre_tienda', 'direccion_tienda', 'url_tienda'
-            ]
-            guardar_resultados(resultados, columnas, nombre_archivo)
+            guardar_resultados(resultados, columnas, nombre_archivo, formato, excel)
             print(f"\n✅ Scraping completado exitosamente!")
             print(f"📊 Productos encontrados: {len(resultados)}")
         else:
@@ -1,17 +1,23 @@
 # SCRAPER INTEGRADO - GENERADOR DE DATOS COMPLETOS
-import requests
 import pandas as pd
+import numpy as np
 import os
-import random
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from bs4 import BeautifulSoup
 import re
+import unicodedata
 from urllib.parse import urlparse, urljoin
 import time
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from sqlalchemy import create_engine
 from dotenv import load_dotenv
 from scrapyProductos import scrapear_yapo, scrapear_mercadolibre, scrapear_paris, scrapear_falabella
+from intervalos_promocion import construir_indice_promociones, elegir_activas
+from pool_usuarios import obtener_usuarios
+from calendario import filas_calendario
+from http_cliente import obtener
+from salidas import guardar_dataframe, pedir_formato_salida, escribir_por_bloques, exportar_excel_desde_archivo
 
 # Cargar variables de entorno
 load_dotenv('.env')
@@ -51,6 +57,35 @@ RANGOS_ETARIOS = {
     '56+': {'min_edad': 56, 'max_edad': 80, 'preferencias': ['libros', 'hogar', 'deportes']}
 }
 
+# Columnas de las ventas simuladas (mismos nombres que la tabla ventas)
+COLUMNAS_VENTAS_SIMULADAS = ["id_venta", "id_usuario", "id_producto", "id_tienda", "id_tiempo", "id_promocion",
+                             "cantidad_vendida", "precio_unitario", "descuento_unitario", "precio_final_unitario",
+                             "total_bruto", "total_descuento", "total_neto"]
+# Filas de ventas por bloque al escribir el archivo completo (acota la memoria usada)
+FILAS_POR_BLOQUE_SALIDA = 250000
+# Con semilla, las fechas (vigencia de promociones y calendario de ventas) se cuentan desde este día y no desde hoy:
+# así la misma semilla y los mismos productos dan el mismo archivo cualquier día que se ejecute
+FECHA_REFERENCIA_SEMILLA = date(2025, 1, 1)
+
+# Peso de cada preferencia según su lugar en la lista del rango (1ª, 2ª, 3ª); el resto de las categorías pesa PESO_SIN_PREFERENCIA.
+# Un rango puede definir su propia lista con la clave 'pesos'.
+PESOS_PREFERENCIAS = [3.0, 2.0, 1.5]
+PESO_SIN_PREFERENCIA = 1.0
+
+# Palabras clave para asignar una categoría a un producto a partir de su nombre
+CATEGORIAS_PRODUCTO = {
+    'tecnologia': ['celular', 'smartphone', 'notebook', 'laptop', 'tablet', 'computador', 'monitor', 'audifono',
+                   'televisor', 'smart tv', 'consola', 'playstation', 'xbox', 'nintendo', 'camara', 'iphone',
+                   'samsung', 'xiaomi', 'parlante', 'teclado', 'mouse', 'impresora', 'reloj inteligente'],
+    'ropa': ['polera', 'camisa', 'pantalon', 'jeans', 'chaqueta', 'parka', 'vestido', 'falda', 'poleron',
+             'zapato', 'zapatilla', 'calcetin', 'abrigo', 'blusa', 'short', 'bota'],
+    'deportes': ['bicicleta', 'balon', 'pelota', 'pesas', 'mancuerna', 'trotadora', 'yoga', 'raqueta',
+                 'deportiva', 'camping', 'carpa', 'running', 'futbol', 'gimnasio'],
+    'hogar': ['sofa', 'silla', 'mesa', 'cama', 'colchon', 'refrigerador', 'lavadora', 'microondas', 'cocina',
+              'lampara', 'sabana', 'toalla', 'aspiradora', 'horno', 'mueble', 'velador', 'estante'],
+    'libros': ['libro', 'novela', 'comic', 'manga', 'enciclopedia', 'diccionario', 'cuento', 'biografia'],
+}
+
 def mostrar_menu_tiendas():
     """Muestra el listado de tiendas disponibles"""
     print("\n🏪 TIENDAS DISPONIBLES:")
@@ -76,31 +111,19 @@ def seleccionar_tienda():
         else:
             print("❌ Opción no válida")
 
-def generar_usuarios_con_edad(cantidad):
-    """Genera usuarios con edad y sexo usando RandomUser API"""
+def generar_usuarios_con_edad(cantidad, semilla=None):
+    """Genera usuarios con edad y sexo desde el pool local de RandomUser (descarga solo lo que falte)"""
     print(f"👥 Generando {cantidad} usuarios...")
     
-    url = f"https://randomuser.me/api/?results={cantidad}&nat=cl"
-    response = requests.get(url)
-    
-    if response.status_code != 200:
-        print("❌ Error al conectar con RandomUser API")
-        return []
-    
-    data = response.json()["results"]
     usuarios = []
-    
-    for user in data:
-        edad = str(user["dob"]["age"])
-        sexo = "Masculino" if user["gender"] == "male" else "Femenino"
-        
+    for user in obtener_usuarios(cantidad, 'cl', semilla):
         usuarios.append({
             "id_usuario": len(usuarios) + 1,
-            "nombre": user["name"]["first"],
-            "apellido": user["name"]["last"],
+            "nombre": user["nombre"],
+            "apellido": user["apellido"],
             "email": user["email"],
-            "edad": edad,
-            "sexo": sexo
+            "edad": str(user["edad"]),
+            "sexo": user["sexo"]
         })
     
     print(f"✅ {len(usuarios)} usuarios generados exitosamente")
@@ -111,7 +134,7 @@ def extraer_direccion_tienda(url_tienda):
     headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
     
     try:
-        response = requests.get(url_tienda, headers=headers, timeout=10)
+        response = obtener(url_tienda, headers=headers, timeout=10)
         soup = BeautifulSoup(response.text, 'html.parser')
         
         # Buscar información de contacto/dirección
@@ -147,7 +170,7 @@ def scrapear_productos_con_promociones(url_tienda, termino_busqueda, cantidad):
     
     # Detectar método de búsqueda
     try:
-        response = requests.get(url_tienda, headers=headers, timeout=10)
+        response = obtener(url_tienda, headers=headers, timeout=10)
         soup = BeautifulSoup(response.text, 'html.parser')
         
         # Buscar formulario de búsqueda
@@ -170,7 +193,7 @@ def scrapear_productos_con_promociones(url_tienda, termino_busqueda, cantidad):
             url_busqueda = f"{url_tienda}?{parametro}={termino_busqueda}"
         
         # Realizar búsqueda
-        response = requests.get(url_busqueda, headers=headers, timeout=15)
+        response = obtener(url_busqueda, headers=headers, timeout=15)
         soup = BeautifulSoup(response.text, 'html.parser')
         
         productos = []
@@ -242,6 +265,47 @@ def extraer_marca(nombre_producto):
     
     return "Sin marca"
 
+def categorizar_producto(nombre_producto):
+    """Asigna una categoría al producto según palabras clave de su nombre ('otros' si ninguna coincide)"""
+    nombre = unicodedata.normalize('NFKD', (nombre_producto or '').lower()).encode('ascii', 'ignore').decode()
+    for categoria, palabras in CATEGORIAS_PRODUCTO.items():
+        if any(palabra in nombre for palabra in palabras):
+            return categoria
+    return 'otros'
+
+def construir_tabla_alias(pesos):
+    """Construye la tabla alias de Walker (método de Vose): luego cada muestra cuesta O(1)"""
+    n = len(pesos)
+    total = float(sum(pesos))
+    escalados = [peso * n / total for peso in pesos]
+    probabilidad = [1.0] * n
+    alias = list(range(n))
+    pequenos = [i for i, valor in enumerate(escalados) if valor < 1.0]
+    grandes = [i for i, valor in enumerate(escalados) if valor >= 1.0]
+    while pequenos and grandes:
+        pequeno = pequenos.pop()
+        grande = grandes.pop()
+        probabilidad[pequeno] = escalados[pequeno]
+        alias[pequeno] = grande
+        escalados[grande] -= 1.0 - escalados[pequeno]
+        (pequenos if escalados[grande] < 1.0 else grandes).append(grande)
+    # Lo que queda en cualquiera de las listas tiene probabilidad 1 (errores de redondeo)
+    return np.array(probabilidad), np.array(alias, dtype=np.int64)
+
+def muestrear_alias(tabla, cantidad, rng):
+    """Saca `cantidad` índices de una tabla alias con dos sorteos uniformes por muestra"""
+    probabilidad, alias = tabla
+    columnas = rng.integers(0, len(probabilidad), size=cantidad)
+    return np.where(rng.random(cantidad) < probabilidad[columnas], columnas, alias[columnas])
+
+def pesos_por_rango(categorias, rango):
+    """Calcula el peso de cada producto para un rango etario según el orden de sus preferencias"""
+    pesos_rango = rango.get('pesos', PESOS_PREFERENCIAS)
+    peso_categoria = {}
+    for posicion, categoria in enumerate(rango['preferencias']):
+        peso_categoria.setdefault(categoria, pesos_rango[posicion] if posicion < len(pesos_rango) else PESO_SIN_PREFERENCIA)
+    return [peso_categoria.get(categoria, PESO_SIN_PREFERENCIA) for categoria in categorias]
+
 def limpiar_precio(precio_texto):
     """Limpia y convierte el precio a número"""
     if not precio_texto:
@@ -283,9 +347,11 @@ def limpiar_descuento(descuento_texto):
     
     return 0
 
-def generar_promociones(productos):
+def generar_promociones(productos, rng=None, fecha_referencia=None):
     """Genera promociones basadas en los productos con descuentos"""
     print("🎯 Generando promociones...")
+    rng = rng if rng is not None else np.random.default_rng()
+    fecha_referencia = fecha_referencia or datetime.now().date()
     
     promociones = []
     tipos_promocion = ["Descuento por porcentaje", "Oferta especial", "Precio rebajado", "Cyber Monday", "Black Friday"]
@@ -293,20 +359,20 @@ def generar_promociones(productos):
     for i, producto in enumerate(productos):
         if producto['promocion'] > 0:
             # Generar fechas de promoción (últimos 3 meses)
-            fecha_inicio = datetime.now() - timedelta(days=random.randint(30, 90))
-            fecha_fin = fecha_inicio + timedelta(days=random.randint(7, 30))
+            fecha_inicio = fecha_referencia - timedelta(days=int(rng.integers(30, 91)))
+            fecha_fin = fecha_inicio + timedelta(days=int(rng.integers(7, 31)))
             
             promociones.append({
                 "id_promocion": len(promociones) + 1,
-                "tipo_promocion": random.choice(tipos_promocion),
-                "fecha_inicio": fecha_inicio.date(),
-                "fecha_fin": fecha_fin.date()
+                "tipo_promocion": tipos_promocion[rng.integers(len(tipos_promocion))],
+                "fecha_inicio": fecha_inicio,
+                "fecha_fin": fecha_fin
             })
     
     print(f"✅ {len(promociones)} promociones generadas")
     return promociones
 
-def generar_tiempo(promociones):
+def generar_tiempo(promociones, fecha_referencia=None):
     """Genera registros de tiempo basados en las fechas de promociones"""
     print("⏰ Generando registros de tiempo...")
     
@@ -317,159 +383,317 @@ def generar_tiempo(promociones):
         fechas_unicas.add(promocion['fecha_inicio'])
         fechas_unicas.add(promocion['fecha_fin'])
     
-    # Agregar fechas adicionales (últimos 6 meses)
-    fecha_actual = datetime.now()
+    # Agregar fechas adicionales (6 meses hasta la fecha de referencia, hoy si no se indica)
+    fecha_actual = fecha_referencia or datetime.now().date()
     for i in range(180):
-        fecha = fecha_actual - timedelta(days=i)
-        fechas_unicas.add(fecha.date())
-    
-    tiempo_registros = []
-    festivos_chile = [
-        datetime(2024, 1, 1).date(),  # Año Nuevo
-        datetime(2024, 5, 1).date(),  # Día del Trabajo
-        datetime(2024, 9, 18).date(), # Fiestas Patrias
-        datetime(2024, 12, 25).date() # Navidad
-    ]
+        fechas_unicas.add(fecha_actual - timedelta(days=i))
     
-    for i, fecha in enumerate(sorted(fechas_unicas)):
-        tiempo_registros.append({
-            "id_tiempo": i + 1,
-            "fecha": fecha,
-            "dia": fecha.day,
-            "mes": fecha.month,
-            "año": fecha.year,
-            "trimestre": (fecha.month - 1) // 3 + 1,
-            "festivo": fecha in festivos_chile
-        })
+    # Clave AAAAMMDD y feriados del calendario: los mismos registros que instala calendario.py
+    tiempo_registros = filas_calendario(fechas_unicas).to_dict('records')
     
     print(f"✅ {len(tiempo_registros)} registros de tiempo generados")
     return tiempo_registros
 
-def simular_ventas_realistas(usuarios, productos, promociones, tiempo_registros):
-    """Simula ventas realistas basadas en rangos etarios"""
+def preparar_simulacion(usuarios, productos, promociones, tiempo_registros):
+    """Arma una sola vez los arreglos, tablas alias e índice de promociones que usa la simulación de ventas"""
+    edades = np.array([int(u['edad']) for u in usuarios], dtype=np.int64)
+    rango_usuario = np.full(len(usuarios), list(RANGOS_ETARIOS).index('26-35'))  # Default
+    for i, config in reversed(list(enumerate(RANGOS_ETARIOS.values()))):
+        rango_usuario[(config['min_edad'] <= edades) & (edades <= config['max_edad'])] = i
+    categorias = [p.get('categoria') or categorizar_producto(p.get('nombre')) for p in productos]
+    return {
+        'ids_usuario': np.array([u['id_usuario'] for u in usuarios]),
+        'rango_usuario': rango_usuario,
+        'ids_producto': np.array([p['id_producto'] for p in productos]),
+        'ids_tienda': np.array([p['id_tienda'] for p in productos]),
+        # Precio 0 o vacío: se sortea un precio por venta, igual que antes
+        'precios': np.array([p['precio'] or np.nan for p in productos], dtype=float),
+        'promo_producto': np.array([p['promocion'] if p['promocion'] is not None else -1 for p in productos]),
+        'ids_tiempo': np.array([t['id_tiempo'] for t in tiempo_registros]),
+        'fechas': np.array([t['fecha'] for t in tiempo_registros], dtype='datetime64[D]'),
+        # Producto según las preferencias del rango etario: una tabla alias por rango
+        'tablas_alias': [construir_tabla_alias(pesos_por_rango(categorias, config)) for config in RANGOS_ETARIOS.values()],
+        'indice_promociones': construir_indice_promociones(promociones),
+    }
+
+def simular_bloque_ventas(contexto, desde, hasta, primer_id, rng):
+    """Simula las ventas de los usuarios [desde, hasta) numerando id_venta desde primer_id"""
+    # Número de compras por usuario (1-5) y una fila por compra
+    num_compras = rng.integers(1, 6, size=hasta - desde)
+    usuario_venta = np.repeat(np.arange(desde, hasta), num_compras)
+    total = len(usuario_venta)
+    
+    rango_venta = contexto['rango_usuario'][usuario_venta]
+    producto_venta = np.empty(total, dtype=np.int64)
+    for i, tabla in enumerate(contexto['tablas_alias']):
+        ventas_rango = np.flatnonzero(rango_venta == i)
+        if len(ventas_rango):
+            producto_venta[ventas_rango] = muestrear_alias(tabla, len(ventas_rango), rng)
+    fecha_venta = rng.integers(0, len(contexto['ids_tiempo']), size=total)
+    cantidad = rng.integers(1, 4, size=total)
+    
+    # Promoción vigente en la fecha de la venta (solo para productos con promoción)
+    promo_producto = contexto['promo_producto']
+    elegida = elegir_activas(contexto['indice_promociones'], contexto['fechas'][fecha_venta], rng.random(total))
+    id_promocion = np.where(promo_producto[producto_venta] >= 0, elegida, -1)
+    
+    # Precios y totales
+    precio_unitario = contexto['precios'][producto_venta]
+    sin_precio = np.isnan(precio_unitario)
+    precio_unitario[sin_precio] = rng.integers(10000, 100001, size=int(sin_precio.sum()))
+    descuento_unitario = np.maximum(promo_producto[producto_venta], 0)
+    precio_final_unitario = precio_unitario - descuento_unitario
+    
+    return pd.DataFrame({
+        "id_venta": np.arange(primer_id, primer_id + total),
+        "id_usuario": contexto['ids_usuario'][usuario_venta],
+        "id_producto": contexto['ids_producto'][producto_venta],
+        "id_tienda": contexto['ids_tienda'][producto_venta],
+        "id_tiempo": contexto['ids_tiempo'][fecha_venta],
+        "id_promocion": pd.arrays.IntegerArray(np.maximum(id_promocion, 0), id_promocion < 0),
+        "cantidad_vendida": cantidad,
+        "precio_unitario": precio_unitario,
+        "descuento_unitario": descuento_unitario,
+        "precio_final_unitario": precio_final_unitario,
+        "total_bruto": precio_unitario * cantidad,
+        "total_descuento": descuento_unitario * cantidad,
+        "total_neto": precio_final_unitario * cantidad
+    }, columns=COLUMNAS_VENTAS_SIMULADAS)
+
+def simular_ventas_realistas(usuarios, productos, promociones, tiempo_registros, rng=None):
+    """Simula ventas realistas basadas en rangos etarios (vectorizado con NumPy, devuelve un DataFrame)"""
     print("💰 Simulando ventas realistas...")
-    
-    ventas = []
-    
-    for usuario in usuarios:
-        edad = int(usuario['edad'])
-        
-        # Determinar rango etario
-        rango_etario = None
-        for rango, config in RANGOS_ETARIOS.items():
-            if config['min_edad'] <= edad <= config['max_edad']:
-                rango_etario = config
-                break
-        
-        if not rango_etario:
-            rango_etario = RANGOS_ETARIOS['26-35']  # Default
-        
-        # Número de compras por usuario (1-5)
-        num_compras = random.randint(1, 5)
-        
-        for _ in range(num_compras):
-            # Seleccionar producto (con preferencias por rango etario)
-            producto = random.choice(productos)
-            
-            # Seleccionar fecha de venta
-            fecha_venta = random.choice(tiempo_registros)
-            
-            # Determinar si aplica promoción
-            promocion_aplicada = None
-            if producto['promocion'] is not None: # Check if it's not None
-                promociones_disponibles = [p for p in promociones if 
-                                         p['fecha_inicio'] <= fecha_venta['fecha'] <= p['fecha_fin']]
-                if promociones_disponibles:
-                    promocion_aplicada = random.choice(promociones_disponibles)
-            
-            # Cantidad vendida (1-3)
-            cantidad = random.randint(1, 3)
-            
-            # Precios
-            precio_unitario = producto['precio'] or random.randint(10000, 100000)
-            descuento_unitario = producto['promocion'] or 0
-            precio_final_unitario = precio_unitario - descuento_unitario
-            
-            # Totales
-            total_bruto = precio_unitario * cantidad
-            total_descuento = descuento_unitario * cantidad
-            total_neto = precio_final_unitario * cantidad
-            
-            ventas.append({
-                "id_venta": len(ventas) + 1,
-                "id_usuario": usuario['id_usuario'],
-                "id_producto": producto['id_producto'],
-                "id_tienda": producto['id_tienda'],
-                "id_tiempo": fecha_venta['id_tiempo'],
-                "id_promocion": promocion_aplicada['id_promocion'] if promocion_aplicada else None,
-                "cantidad_vendida": cantidad,
-                "precio_unitario": precio_unitario,
-                "descuento_unitario": descuento_unitario,
-                "precio_final_unitario": precio_final_unitario,
-                "total_bruto": total_bruto,
-                "total_descuento": total_descuento,
-                "total_neto": total_neto
-            })
-    
+    rng = rng if rng is not None else np.random.default_rng()
+    if not productos or not tiempo_registros:
+        print("⚠️ Sin productos o fechas: no se simulan ventas")
+        return pd.DataFrame(columns=COLUMNAS_VENTAS_SIMULADAS)
+    contexto = preparar_simulacion(usuarios, productos, promociones, tiempo_registros)
+    ventas = simular_bloque_ventas(contexto, 0, len(usuarios), 1, rng)
     print(f"✅ {len(ventas)} ventas simuladas")
     return ventas
 
-def generar_archivo_completo(usuarios, productos, promociones, tiempo_registros, ventas, tienda_info, nombre_archivo):
-    """Genera un archivo CSV y Excel con todos los datos integrados, sin IDs, solo datos descriptivos y de referencia"""
-    print("📊 Generando archivo completo...")
-    datos_completos = []
-    for venta in ventas:
-        usuario = next((u for u in usuarios if u['id_usuario'] == venta['id_usuario']), {})
-        producto = next((p for p in productos if p['id_producto'] == venta['id_producto']), {})
-        promocion = next((p for p in promociones if p['id_promocion'] == venta['id_promocion']), {}) if venta['id_promocion'] else {}
-        tiempo = next((t for t in tiempo_registros if t['id_tiempo'] == venta['id_tiempo']), {})
-        registro = {
-            # Usuario
-            'nombre_usuario': usuario.get('nombre'),
-            'apellido_usuario': usuario.get('apellido'),
-            'email_usuario': usuario.get('email'),
-            'edad_usuario': usuario.get('edad'),
-            'sexo_usuario': usuario.get('sexo'),
-            # Tienda
-            'nombre_tienda': tienda_info.get('nombre'),
-            'direccion_tienda': tienda_info.get('direccion'),
-            'url_tienda': tienda_info.get('url'),
-            # Producto
-            'nombre_producto': producto.get('nombre'),
-            'marca_producto': producto.get('marca'),
-            'precio_producto': producto.get('precio'),
-            'url_producto': producto.get('url_producto'),
-            # Promoción
-            'tipo_promocion': promocion.get('tipo_promocion'),
-            'fecha_inicio_promocion': promocion.get('fecha_inicio'),
-            'fecha_fin_promocion': promocion.get('fecha_fin'),
-            # Tiempo
-            'fecha_venta': tiempo.get('fecha'),
-            'dia_venta': tiempo.get('dia'),
-            'mes_venta': tiempo.get('mes'),
-            'año_venta': tiempo.get('año'),
-            'trimestre_venta': tiempo.get('trimestre'),
-            'festivo_venta': tiempo.get('festivo'),
-            # Venta
-            'cantidad_vendida': venta.get('cantidad_vendida'),
-            'precio_unitario': venta.get('precio_unitario'),
-            'descuento_unitario': venta.get('descuento_unitario'),
-            'precio_final_unitario': venta.get('precio_final_unitario'),
-            'total_bruto': venta.get('total_bruto'),
-            'total_descuento': venta.get('total_descuento'),
-            'total_neto': venta.get('total_neto')
-        }
-        datos_completos.append(registro)
-    df = pd.DataFrame(datos_completos)
-    csv_filename = os.path.join(CARPETA, f"{nombre_archivo}.csv")
-    excel_filename = os.path.join(CARPETA, f"{nombre_archivo}.xlsx")
-    df.to_csv(csv_filename, index=False, encoding="utf-8-sig")
-    df.to_excel(excel_filename, index=False)
+def generar_bloques_ventas(usuarios, productos, promociones, tiempo_registros, rng=None, filas_por_bloque=FILAS_POR_BLOQUE_SALIDA):
+    """Entrega las ventas simuladas de a bloques de ~filas_por_bloque filas (un bloque de usuarios a la vez)"""
+    rng = rng if rng is not None else np.random.default_rng()
+    if not productos or not tiempo_registros:
+        print("⚠️ Sin productos o fechas: no se simulan ventas")
+        return
+    contexto = preparar_simulacion(usuarios, productos, promociones, tiempo_registros)
+    # Cada usuario compra 3 veces en promedio
+    usuarios_por_bloque = max(1, filas_por_bloque // 3)
+    siguiente_id = 1
+    for desde in range(0, len(usuarios), usuarios_por_bloque):
+        bloque = simular_bloque_ventas(contexto, desde, min(desde + usuarios_por_bloque, len(usuarios)), siguiente_id, rng)
+        siguiente_id += len(bloque)
+        yield bloque
+
+# Columnas del archivo completo: (columna de salida, dimensión, campo de la dimensión)
+COLUMNAS_DIMENSIONES = [
+    # Usuario
+    ('nombre_usuario', 'usuario', 'nombre'),
+    ('apellido_usuario', 'usuario', 'apellido'),
+    ('email_usuario', 'usuario', 'email'),
+    ('edad_usuario', 'usuario', 'edad'),
+    ('sexo_usuario', 'usuario', 'sexo'),
+    # Tienda
+    ('nombre_tienda', 'tienda', 'nombre'),
+    ('direccion_tienda', 'tienda', 'direccion'),
+    ('url_tienda', 'tienda', 'url'),
+    # Producto
+    ('nombre_producto', 'producto', 'nombre'),
+    ('marca_producto', 'producto', 'marca'),
+    ('precio_producto', 'producto', 'precio'),
+    ('url_producto', 'producto', 'url_producto'),
+    # Promoción
+    ('tipo_promocion', 'promocion', 'tipo_promocion'),
+    ('fecha_inicio_promocion', 'promocion', 'fecha_inicio'),
+    ('fecha_fin_promocion', 'promocion', 'fecha_fin'),
+    # Tiempo
+    ('fecha_venta', 'tiempo', 'fecha'),
+    ('dia_venta', 'tiempo', 'dia'),
+    ('mes_venta', 'tiempo', 'mes'),
+    ('año_venta', 'tiempo', 'año'),
+    ('trimestre_venta', 'tiempo', 'trimestre'),
+    ('festivo_venta', 'tiempo', 'festivo'),
+]
+
+# Métricas de la venta que pasan tal cual al archivo completo
+COLUMNAS_METRICAS_VENTA = [
+    'cantidad_vendida', 'precio_unitario', 'descuento_unitario', 'precio_final_unitario',
+    'total_bruto', 'total_descuento', 'total_neto',
+]
+
+def indexar_por_id(registros, columna_id):
+    """Arma un DataFrame indexado por id (si un id se repite gana la primera aparición)"""
+    df = pd.DataFrame(list(registros))
+    if df.empty:
+        return pd.DataFrame(index=pd.Index([], name=columna_id))
+    return df.drop_duplicates(columna_id).set_index(columna_id)
+
+def indexar_dimensiones(usuarios, productos, promociones, tiempo_registros):
+    """Indexa cada dimensión por su id una sola vez: (tabla, columna de la venta con el id)"""
+    return {
+        'usuario': (indexar_por_id(usuarios, 'id_usuario'), 'id_usuario'),
+        'producto': (indexar_por_id(productos, 'id_producto'), 'id_producto'),
+        'promocion': (indexar_por_id(promociones, 'id_promocion'), 'id_promocion'),
+        'tiempo': (indexar_por_id(tiempo_registros, 'id_tiempo'), 'id_tiempo'),
+    }
+
+def tipos_archivo_completo(dimensiones):
+    """Tipo de cada columna descriptiva según su dimensión completa, para que todos los bloques de un Parquet coincidan"""
+    tipos = {}
+    for columna, dimension, campo in COLUMNAS_DIMENSIONES:
+        if dimension == 'tienda':
+            tipos[columna] = 'string'
+            continue
+        tabla, _ = dimensiones[dimension]
+        tipos[columna] = pd.api.types.infer_dtype(tabla[campo], skipna=True) if campo in tabla.columns else 'empty'
+    return tipos
+
+def armar_archivo_completo(dimensiones, ventas, tienda_info):
+    """Arma el DataFrame del archivo completo: una fila por venta con los datos descriptivos de cada dimensión"""
+    df_ventas = pd.DataFrame(ventas)
+    columnas = {}
+    for columna, dimension, campo in COLUMNAS_DIMENSIONES:
+        if dimension == 'tienda':
+            columnas[columna] = [tienda_info.get(campo)] * len(df_ventas)
+            continue
+        # Cada dimensión se resuelve por id con una búsqueda en índice (hash), no recorriendo la lista por venta
+        tabla, columna_id = dimensiones[dimension]
+        if columna_id not in df_ventas or campo not in tabla.columns:
+            columnas[columna] = [None] * len(df_ventas)
+        else:
+            columnas[columna] = df_ventas[columna_id].map(tabla[campo]).to_numpy()
+    for columna in COLUMNAS_METRICAS_VENTA:
+        columnas[columna] = df_ventas[columna].to_numpy() if columna in df_ventas else [None] * len(df_ventas)
+    return pd.DataFrame(columnas, columns=[c for c, _, _ in COLUMNAS_DIMENSIONES] + COLUMNAS_METRICAS_VENTA)
+
+def escribir_archivo_completo(usuarios, productos, promociones, tiempo_registros, bloques_ventas, tienda_info, nombre_archivo, formato='csv'):
+    """Escribe el archivo completo bloque a bloque a medida que llegan las ventas; devuelve (ruta, filas)"""
+    dimensiones = indexar_dimensiones(usuarios, productos, promociones, tiempo_registros)
+    bloques = (armar_archivo_completo(dimensiones, ventas, tienda_info) for ventas in bloques_ventas)
+    # Sin ventas (sin productos o sin fechas) el archivo queda solo con el encabezado
+    vacio = armar_archivo_completo(dimensiones, [], tienda_info)
+    return escribir_por_bloques(bloques, CARPETA, nombre_archivo, formato, tipos_archivo_completo(dimensiones), vacio)
+
+def generar_archivo_completo(usuarios, productos, promociones, tiempo_registros, tienda_info, nombre_archivo, formato='csv', excel=False, rng=None):
+    """Simula las ventas y genera un archivo CSV o Parquet (y Excel si se pide) con todos los datos integrados, sin IDs.
+
+    Las ventas se generan y escriben de a FILAS_POR_BLOQUE_SALIDA filas: la memoria no crece con el total.
+    """
+    print("💰 Simulando ventas y generando archivo completo por bloques...")
+    bloques_ventas = generar_bloques_ventas(usuarios, productos, promociones, tiempo_registros, rng)
+    ruta, total = escribir_archivo_completo(
+        usuarios, productos, promociones, tiempo_registros, bloques_ventas, tienda_info, nombre_archivo, formato
+    )
+    if total == 0:
+        print("⚠️ No se simularon ventas (¿sin productos o sin fechas?): el archivo queda solo con el encabezado")
+    rutas = [ruta]
+    if excel:
+        rutas += exportar_excel_desde_archivo(ruta, total, sin_limite=excel == 'completo')
     print(f"✅ Archivos generados exitosamente:")
-    print(f"   📄 CSV: {csv_filename}")
-    print(f"   📊 Excel: {excel_filename}")
-    print(f"   📊 Total de registros: {len(datos_completos)}")
-    return df
+    for ruta in rutas:
+        print(f"   📄 {ruta}")
+    print(f"   📊 Total de registros: {total}")
+    return total
+
+# Esquema estrella: columnas de cada archivo con los mismos nombres y claves sustitutas que models.py
+COLUMNAS_ESTRELLA = {
+    'usuarios': ['id_usuario', 'nombre', 'apellido', 'email', 'edad', 'sexo'],
+    'tienda': ['id_tienda', 'nombre', 'direccion', 'url'],
+    'promocion': ['id_promocion', 'tipo_promocion', 'fecha_inicio', 'fecha_fin'],
+    'productos': ['id_producto', 'nombre', 'marca', 'precio', 'url_producto', 'promocion', 'preciofinal', 'id_tienda'],
+    'tiempo': ['id_tiempo', 'fecha', 'dia', 'mes', 'año', 'trimestre', 'festivo'],
+    'ventas': ['id_venta', 'id_usuario', 'id_producto', 'id_tienda', 'id_tiempo', 'id_promocion'] + COLUMNAS_METRICAS_VENTA,
+}
+
+def generar_esquema_estrella(usuarios, productos, promociones, tiempo_registros, ventas, tienda_info, nombre_archivo, formato='csv'):
+    """Genera un archivo por dimensión y uno de ventas con solo IDs y montos, en la carpeta <nombre>_estrella"""
+    print("⭐ Generando esquema estrella...")
+    carpeta = os.path.join(CARPETA, f"{nombre_archivo}_estrella")
+    tablas = {
+        'usuarios': pd.DataFrame(usuarios, columns=COLUMNAS_ESTRELLA['usuarios']),
+        'tienda': pd.DataFrame([tienda_info], columns=COLUMNAS_ESTRELLA['tienda']),
+        'promocion': pd.DataFrame(promociones, columns=COLUMNAS_ESTRELLA['promocion']),
+        'productos': pd.DataFrame(productos, columns=COLUMNAS_ESTRELLA['productos']),
+        'tiempo': pd.DataFrame(tiempo_registros, columns=COLUMNAS_ESTRELLA['tiempo']),
+        'ventas': pd.DataFrame(ventas, columns=COLUMNAS_ESTRELLA['ventas']),
+    }
+    # IDs opcionales como enteros con nulos (sin ".0" en el CSV)
+    tablas['productos']['promocion'] = tablas['productos']['promocion'].astype('Int64')
+    tablas['ventas']['id_promocion'] = tablas['ventas']['id_promocion'].astype('Int64')
+    print(f"✅ Archivos generados exitosamente en {carpeta}:")
+    for tabla, df in tablas.items():
+        ruta, = guardar_dataframe(df, carpeta, tabla, formato)
+        print(f"   📄 {ruta}: {len(df):,} registros")
+    return tablas
+
+def pedir_tipo_exportacion():
+    """Pregunta si se genera el archivo completo (desnormalizado) o el esquema estrella (Enter = completo)"""
+    print("\n🗂️ TIPO DE EXPORTACIÓN:")
+    print("1. Archivo completo (una fila por venta con todos los datos)")
+    print("2. Esquema estrella (un archivo por tabla, con IDs)")
+    return 'estrella' if input("Selecciona el tipo (1-2, Enter = 1): ").strip() == '2' else 'completo'
+
+def generar_parte_archivo(tarea):
+    """Simula y escribe una parte del archivo completo en un proceso: un shard de usuarios con su propio RNG"""
+    numero, semilla_hija, usuarios, productos, promociones, tiempo_registros, tienda_info, nombre_archivo, formato = tarea
+    rng = np.random.default_rng(semilla_hija)
+    bloques_ventas = generar_bloques_ventas(usuarios, productos, promociones, tiempo_registros, rng)
+    return escribir_archivo_completo(
+        usuarios, productos, promociones, tiempo_registros, bloques_ventas, tienda_info, f"{nombre_archivo}_parte_{numero:03d}", formato
+    )
+
+def generar_archivo_en_paralelo(usuarios, productos, promociones, tiempo_registros, tienda_info, nombre_archivo, semilla, trabajadores, formato='csv', excel=False):
+    """Genera el archivo completo en partes: usuarios repartidos en shards, un proceso y un RNG independiente por shard.
+
+    Con la misma semilla, la misma cantidad de procesos y los mismos datos de entrada, las partes son idénticas byte a byte.
+    """
+    secuencia = np.random.SeedSequence(semilla)
+    print(f"🎲 Semilla: {secuencia.entropy} ({trabajadores} procesos)")
+    # Shards contiguos y un flujo aleatorio hijo por shard: el resultado no depende del orden de ejecución
+    limites = np.linspace(0, len(usuarios), trabajadores + 1).astype(int)
+    tareas = [
+        (numero + 1, semilla_hija, usuarios[limites[numero]:limites[numero + 1]], productos, promociones,
+         tiempo_registros, tienda_info, nombre_archivo, formato)
+        for numero, semilla_hija in enumerate(secuencia.spawn(trabajadores))
+    ]
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=trabajadores) as ejecutor:
+        partes = list(ejecutor.map(generar_parte_archivo, tareas))
+    segundos = time.perf_counter() - inicio
+    total = sum(filas for _, filas in partes)
+    # El Excel de cada parte se arma al final, leyendo su archivo ya escrito
+    rutas_excel = []
+    if excel:
+        for ruta, filas in partes:
+            rutas_excel += exportar_excel_desde_archivo(ruta, filas, sin_limite=excel == 'completo')
+    print(f"✅ Archivos generados exitosamente:")
+    for ruta, filas in partes:
+        print(f"   📄 {ruta}: {filas:,} registros")
+    for ruta in rutas_excel:
+        print(f"   📄 {ruta}")
+    print(f"   📊 Total de registros: {total:,} ({total / max(segundos, 1e-9):,.0f} filas/s)")
+    return partes
+
+def pedir_trabajadores_generacion():
+    """Pide la cantidad de procesos para generar las ventas (Enter = 1, sin paralelismo)"""
+    respuesta = input(f"⚙️ Procesos para generar las ventas (1-{os.cpu_count() or 1}, Enter = 1): ").strip()
+    if respuesta.isdigit() and int(respuesta) > 0:
+        return int(respuesta)
+    return 1
+
+def pedir_semilla():
+    """Pide la semilla de la simulación (Enter = aleatoria)"""
+    respuesta = input("🎲 Semilla para la simulación (Enter = aleatoria): ").strip()
+    return int(respuesta) if respuesta.isdigit() else None
+
+def fecha_de_referencia(semilla):
+    """Día desde el que se cuentan las fechas generadas: fijo con semilla (salida reproducible), hoy sin ella"""
+    if semilla is None:
+        return datetime.now().date()
+    print(f"📅 Con semilla, las fechas se generan desde el {FECHA_REFERENCIA_SEMILLA.isoformat()}")
+    return FECHA_REFERENCIA_SEMILLA
 
 def main():
     """Función principal del scraper integrado"""
@@ -527,10 +751,17 @@ def main():
     if not nombre_archivo:
         nombre_archivo = f"datos_completos_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
     
+    tipo_exportacion = pedir_tipo_exportacion()
+    formato, excel = pedir_formato_salida()
+    # El esquema estrella comparte los IDs de las dimensiones: se genera en un solo proceso
+    trabajadores = pedir_trabajadores_generacion() if tipo_exportacion == 'completo' else 1
+    semilla = pedir_semilla()
+    fecha_referencia = fecha_de_referencia(semilla)
+    
     print("\n🔄 Iniciando proceso de generación de datos...")
     
     # 1. Generar usuarios
-    usuarios = generar_usuarios_con_edad(cantidad_usuarios)
+    usuarios = generar_usuarios_con_edad(cantidad_usuarios, semilla)
     
     # 2. Scraping de productos
     productos_raw = []
@@ -560,7 +791,7 @@ def main():
         promo_id = None
         # Si el producto tiene descuento real, crear promoción
         if prod.get('descuento') and prod.get('descuento') > 0:
-            fecha_inicio = datetime.now().date()
+            fecha_inicio = fecha_referencia
             fecha_fin = fecha_inicio + timedelta(days=30)
             promociones.append({
                 "id_promocion": promo_id_counter,
@@ -583,24 +814,39 @@ def main():
         })
     
     # 3. Generar tiempo
-    tiempo_registros = generar_tiempo(promociones)
-    
-    # 4. Simular ventas
-    ventas = simular_ventas_realistas(usuarios, productos, promociones, tiempo_registros)
+    tiempo_registros = generar_tiempo(promociones, fecha_referencia)
     
-    # 5. Generar archivo completo
-    df_final = generar_archivo_completo(
-        usuarios, productos, promociones, tiempo_registros, ventas, tienda_info, nombre_archivo
-    )
+    if trabajadores > 1:
+        # 4-5. Simular ventas y generar el archivo completo en partes, un proceso por shard de usuarios
+        partes = generar_archivo_en_paralelo(
+            usuarios, productos, promociones, tiempo_registros, tienda_info, nombre_archivo, semilla, trabajadores, formato,
+            excel
+        )
+        total_ventas = sum(filas for _, filas in partes)
+    elif tipo_exportacion == 'estrella':
+        # 4. Simular ventas
+        ventas = simular_ventas_realistas(usuarios, productos, promociones, tiempo_registros, np.random.default_rng(semilla))
+        
+        # 5. Generar esquema estrella
+        generar_esquema_estrella(
+            usuarios, productos, promociones, tiempo_registros, ventas, tienda_info, nombre_archivo, formato
+        )
+        total_ventas = len(ventas)
+    else:
+        # 4-5. Simular ventas y escribir el archivo completo por bloques
+        total_ventas = generar_archivo_completo(
+            usuarios, productos, promociones, tiempo_registros, tienda_info, nombre_archivo, formato, excel,
+            np.random.default_rng(semilla)
+        )
     
     print("\n🎉 ¡Proceso completado exitosamente!")
-    print(f"📊 Se generaron {len(df_final)} registros completos")
+    print(f"📊 Se generaron {total_ventas} registros completos")
     print(f"👥 {len(usuarios)} usuarios")
     print(f"🏪 {tienda_info['nombre']} (ID: {tienda_info['id_tienda']})")
     print(f"🛍️ {len(productos)} productos")
     print(f"🎯 {len(promociones)} promociones")
     print(f"⏰ {len(tiempo_registros)} registros de tiempo")
-    print(f"💰 {len(ventas)} ventas simuladas")
+    print(f"💰 {total_ventas} ventas simuladas")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,6 +1,7 @@
-import requests
 import pandas as pd
 import os
+from pool_usuarios import obtener_usuarios
+from salidas import guardar_dataframe, pedir_formato_salida
 
 # Solicitar cantidad de usuarios
 users = input("Ingrese cantidad de usuarios a generar: ")
@@ -10,25 +11,14 @@ if not users.isdigit() or int(users) <= 0:
     print("Por favor, ingrese un número válido mayor que 0.")
     exit()
 
-# Construir la URL de la API
-url = f"https://randomuser.me/api/?results={users}"
-response = requests.get(url)
-
-# Validar respuesta de la API
-if response.status_code != 200:
-    print("Error al conectar con RandomUser API:", response.status_code)
-    exit()
-
-# Procesar los datos
-data = response.json()["results"]
-
+# Obtener usuarios desde el pool local (solo se descarga de RandomUser lo que falte)
 usuarios = []
-for user in data:
+for user in obtener_usuarios(int(users)):
     usuarios.append({
-        "nombre": user["name"]["first"],
-        "apellido": user["name"]["last"],
+        "nombre": user["nombre"],
+        "apellido": user["apellido"],
         "email": user["email"],
-        "direccion": user["location"]["city"],
+        "direccion": user["ciudad"],
     })
 
 # Crear DataFrame
@@ -43,14 +33,10 @@ if not os.path.exists(carpeta_archivos):
 # Solicitar nombre del archivo
 nombre_archivo = input("Ingrese el nombre del archivo (sin extensión): ")
 
-# Guardar CSV en la carpeta archivos
-csv_filename = os.path.join(carpeta_archivos, f"{nombre_archivo}.csv")
-df.to_csv(csv_filename, index=False, encoding="utf-8-sig")
-
-# Guardar Excel en la carpeta archivos
-excel_filename = os.path.join(carpeta_archivos, f"{nombre_archivo}.xlsx")
-df.to_excel(excel_filename, index=False)
+# Guardar en la carpeta archivos (CSV o Parquet, Excel opcional)
+formato, excel = pedir_formato_salida()
+rutas = guardar_dataframe(df, carpeta_archivos, nombre_archivo, formato, excel)
 
 print(f"✅ Archivos guardados en la carpeta '{carpeta_archivos}':")
-print(f"   - {csv_filename}")
-print(f"   - {excel_filename}")
+for ruta in rutas:
+    print(f"   - {ruta}")